@@ -0,0 +1,74 @@
+"""add debtor identity index
+
+Revision ID: 20261018_01_add_debtor_identity_index
+Revises: 20260314_06_add_case_engine_core
+Create Date: 2026-10-18 10:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_01_add_debtor_identity_index"
+down_revision = "20260314_06_add_case_engine_core"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "debtor_identities",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("tenant_id", sa.Integer(), nullable=True),
+        sa.Column("case_id", sa.Integer(), nullable=False),
+        sa.Column("inn", sa.String(length=12), nullable=True),
+        sa.Column("ogrn", sa.String(length=15), nullable=True),
+        sa.Column("name_key", sa.String(length=500), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+        sa.ForeignKeyConstraint(["case_id"], ["cases.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_debtor_identities_id"), "debtor_identities", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_debtor_identities_tenant_id"),
+        "debtor_identities",
+        ["tenant_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_debtor_identities_case_id"),
+        "debtor_identities",
+        ["case_id"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_debtor_identities_tenant_inn",
+        "debtor_identities",
+        ["tenant_id", "inn"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_debtor_identities_tenant_ogrn",
+        "debtor_identities",
+        ["tenant_id", "ogrn"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_debtor_identities_tenant_name_key",
+        "debtor_identities",
+        ["tenant_id", "name_key"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_debtor_identities_tenant_name_key", table_name="debtor_identities")
+    op.drop_index("ix_debtor_identities_tenant_ogrn", table_name="debtor_identities")
+    op.drop_index("ix_debtor_identities_tenant_inn", table_name="debtor_identities")
+    op.drop_index(op.f("ix_debtor_identities_case_id"), table_name="debtor_identities")
+    op.drop_index(op.f("ix_debtor_identities_tenant_id"), table_name="debtor_identities")
+    op.drop_index(op.f("ix_debtor_identities_id"), table_name="debtor_identities")
+    op.drop_table("debtor_identities")
@@ -0,0 +1,38 @@
+"""add portfolio keyset indexes
+
+Revision ID: 20261018_02_add_portfolio_keyset_indexes
+Revises: 20261018_01_add_debtor_identity_index
+Create Date: 2026-10-18 11:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20261018_02_add_portfolio_keyset_indexes"
+down_revision = "20261018_01_add_debtor_identity_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_cases_tenant_id_id", "cases", ["tenant_id", "id"], unique=False)
+    op.create_index(
+        "ix_cases_tenant_due_date_id",
+        "cases",
+        ["tenant_id", "due_date", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_cases_tenant_principal_amount_id",
+        "cases",
+        ["tenant_id", "principal_amount", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cases_tenant_principal_amount_id", table_name="cases")
+    op.drop_index("ix_cases_tenant_due_date_id", table_name="cases")
+    op.drop_index("ix_cases_tenant_id_id", table_name="cases")
@@ -0,0 +1,95 @@
+"""add control room summary
+
+Revision ID: 20261018_03_add_control_room_summary
+Revises: 20261018_02_add_portfolio_keyset_indexes
+Create Date: 2026-10-18 12:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_03_add_control_room_summary"
+down_revision = "20261018_02_add_portfolio_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "control_room_summaries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("tenant_id", sa.Integer(), nullable=False),
+        sa.Column("is_archived", sa.Boolean(), nullable=False),
+        sa.Column("total_cases", sa.Integer(), nullable=False),
+        sa.Column("draft_cases", sa.Integer(), nullable=False),
+        sa.Column("overdue_cases", sa.Integer(), nullable=False),
+        sa.Column("pretrial_cases", sa.Integer(), nullable=False),
+        sa.Column("court_cases", sa.Integer(), nullable=False),
+        sa.Column("fssp_cases", sa.Integer(), nullable=False),
+        sa.Column("closed_cases", sa.Integer(), nullable=False),
+        sa.Column("blocked_cases", sa.Integer(), nullable=False),
+        sa.Column("overdue_now_cases", sa.Integer(), nullable=False),
+        sa.Column("total_principal_amount", sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column("overdue_as_of", sa.Date(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("tenant_id", "is_archived", name="uq_control_room_summaries_tenant_archived"),
+    )
+    op.create_index(op.f("ix_control_room_summaries_id"), "control_room_summaries", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_control_room_summaries_tenant_id"),
+        "control_room_summaries",
+        ["tenant_id"],
+        unique=False,
+    )
+
+    op.create_table(
+        "control_room_case_stats",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("tenant_id", sa.Integer(), nullable=True),
+        sa.Column("case_id", sa.Integer(), nullable=False),
+        sa.Column("is_archived", sa.Boolean(), nullable=False),
+        sa.Column("status_bucket", sa.String(length=32), nullable=False),
+        sa.Column("is_blocked", sa.Boolean(), nullable=False),
+        sa.Column("principal_amount", sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column("due_date", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+        sa.ForeignKeyConstraint(["case_id"], ["cases.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_control_room_case_stats_id"), "control_room_case_stats", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_control_room_case_stats_tenant_id"),
+        "control_room_case_stats",
+        ["tenant_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_control_room_case_stats_case_id"),
+        "control_room_case_stats",
+        ["case_id"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_control_room_case_stats_tenant_archived_due",
+        "control_room_case_stats",
+        ["tenant_id", "is_archived", "due_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_control_room_case_stats_tenant_archived_due", table_name="control_room_case_stats")
+    op.drop_index(op.f("ix_control_room_case_stats_case_id"), table_name="control_room_case_stats")
+    op.drop_index(op.f("ix_control_room_case_stats_tenant_id"), table_name="control_room_case_stats")
+    op.drop_index(op.f("ix_control_room_case_stats_id"), table_name="control_room_case_stats")
+    op.drop_table("control_room_case_stats")
+
+    op.drop_index(op.f("ix_control_room_summaries_tenant_id"), table_name="control_room_summaries")
+    op.drop_index(op.f("ix_control_room_summaries_id"), table_name="control_room_summaries")
+    op.drop_table("control_room_summaries")
@@ -0,0 +1,58 @@
+"""add control room priority
+
+Revision ID: 20261018_04_add_control_room_priority
+Revises: 20261018_03_add_control_room_summary
+Create Date: 2026-10-18 13:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_04_add_control_room_priority"
+down_revision = "20261018_03_add_control_room_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("control_room_case_stats") as batch_op:
+        batch_op.add_column(sa.Column("priority_score", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("priority_band", sa.String(length=16), nullable=True))
+        batch_op.add_column(
+            sa.Column("priority_ready_now", sa.Boolean(), nullable=False, server_default=sa.false())
+        )
+        batch_op.add_column(
+            sa.Column("priority_waiting", sa.Boolean(), nullable=False, server_default=sa.false())
+        )
+        batch_op.add_column(
+            sa.Column("priority_blocked", sa.Boolean(), nullable=False, server_default=sa.false())
+        )
+        batch_op.add_column(
+            sa.Column("priority_stale", sa.Boolean(), nullable=False, server_default=sa.true())
+        )
+        batch_op.add_column(sa.Column("priority_expires_at", sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column("priority_computed_at", sa.DateTime(), nullable=True))
+
+    op.create_index(
+        "ix_control_room_case_stats_tenant_priority",
+        "control_room_case_stats",
+        ["tenant_id", "is_archived", "priority_score"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_control_room_case_stats_tenant_priority", table_name="control_room_case_stats")
+
+    with op.batch_alter_table("control_room_case_stats") as batch_op:
+        batch_op.drop_column("priority_computed_at")
+        batch_op.drop_column("priority_expires_at")
+        batch_op.drop_column("priority_stale")
+        batch_op.drop_column("priority_blocked")
+        batch_op.drop_column("priority_waiting")
+        batch_op.drop_column("priority_ready_now")
+        batch_op.drop_column("priority_band")
+        batch_op.drop_column("priority_score")
@@ -0,0 +1,100 @@
+"""add job queue worker leases
+
+Revision ID: 20261018_05_add_job_queue_worker_leases
+Revises: 20261018_04_add_control_room_priority
+Create Date: 2026-10-18 14:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_05_add_job_queue_worker_leases"
+down_revision = "20261018_04_add_control_room_priority"
+branch_labels = None
+depends_on = None
+
+
+def _table_names() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    tables = _table_names()
+
+    # Таблицы очереди раньше создавались только через create_all.
+    if "job_queue_jobs" not in tables:
+        op.create_table(
+            "job_queue_jobs",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("tenant_id", sa.Integer(), nullable=False),
+            sa.Column("job_type", sa.String(length=100), nullable=False),
+            sa.Column("status", sa.String(length=50), nullable=False),
+            sa.Column("priority", sa.Integer(), nullable=False),
+            sa.Column("worker_id", sa.String(length=100), nullable=True),
+            sa.Column("payload_json", sa.String(), nullable=True),
+            sa.Column("scheduled_at", sa.DateTime(), nullable=True),
+            sa.Column("started_at", sa.DateTime(), nullable=True),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+            sa.Column("retry_count", sa.Integer(), nullable=True),
+            sa.Column("max_retries", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_job_queue_jobs_tenant_id"), "job_queue_jobs", ["tenant_id"], unique=False)
+        op.create_index(op.f("ix_job_queue_jobs_job_type"), "job_queue_jobs", ["job_type"], unique=False)
+        op.create_index(op.f("ix_job_queue_jobs_status"), "job_queue_jobs", ["status"], unique=False)
+    else:
+        with op.batch_alter_table("job_queue_jobs") as batch_op:
+            batch_op.add_column(sa.Column("worker_id", sa.String(length=100), nullable=True))
+
+    op.create_index(op.f("ix_job_queue_jobs_worker_id"), "job_queue_jobs", ["worker_id"], unique=False)
+    op.create_index(
+        "ix_job_queue_jobs_claim",
+        "job_queue_jobs",
+        ["status", "priority", "id"],
+        unique=False,
+    )
+
+    if "job_queue_attempts" not in tables:
+        op.create_table(
+            "job_queue_attempts",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("job_id", sa.Integer(), nullable=False),
+            sa.Column("worker_id", sa.String(length=100), nullable=False),
+            sa.Column("status", sa.String(length=50), nullable=False),
+            sa.Column("error_message", sa.String(), nullable=True),
+            sa.Column("started_at", sa.DateTime(), nullable=True),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_job_queue_attempts_job_id"), "job_queue_attempts", ["job_id"], unique=False)
+
+    if "worker_leases" not in tables:
+        op.create_table(
+            "worker_leases",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("worker_id", sa.String(length=100), nullable=False),
+            sa.Column("lease_until", sa.DateTime(), nullable=True),
+            sa.Column("last_heartbeat", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_worker_leases_worker_id"), "worker_leases", ["worker_id"], unique=False)
+
+
+def downgrade() -> None:
+    # До этой ревизии таблиц очереди в истории миграций не было — откатываем их целиком.
+    op.drop_index(op.f("ix_worker_leases_worker_id"), table_name="worker_leases")
+    op.drop_table("worker_leases")
+
+    op.drop_index(op.f("ix_job_queue_attempts_job_id"), table_name="job_queue_attempts")
+    op.drop_table("job_queue_attempts")
+
+    op.drop_index("ix_job_queue_jobs_claim", table_name="job_queue_jobs")
+    op.drop_index(op.f("ix_job_queue_jobs_worker_id"), table_name="job_queue_jobs")
+    op.drop_index(op.f("ix_job_queue_jobs_status"), table_name="job_queue_jobs")
+    op.drop_index(op.f("ix_job_queue_jobs_job_type"), table_name="job_queue_jobs")
+    op.drop_index(op.f("ix_job_queue_jobs_tenant_id"), table_name="job_queue_jobs")
+    op.drop_table("job_queue_jobs")
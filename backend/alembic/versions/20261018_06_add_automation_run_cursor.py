@@ -0,0 +1,36 @@
+"""add automation run cursor
+
+Revision ID: 20261018_06_add_automation_run_cursor
+Revises: 20261018_05_add_job_queue_worker_leases
+Create Date: 2026-10-18 16:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_06_add_automation_run_cursor"
+down_revision = "20261018_05_add_job_queue_worker_leases"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("automation_runs") as batch_op:
+        batch_op.add_column(sa.Column("cursor_item_id", sa.Integer(), nullable=True))
+
+    op.create_index(
+        "ix_automation_run_items_run_status_id",
+        "automation_run_items",
+        ["run_id", "status", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_automation_run_items_run_status_id", table_name="automation_run_items")
+
+    with op.batch_alter_table("automation_runs") as batch_op:
+        batch_op.drop_column("cursor_item_id")
@@ -0,0 +1,36 @@
+"""add timeline event indexes
+
+Revision ID: 20261018_07_add_timeline_event_indexes
+Revises: 20261018_06_add_automation_run_cursor
+Create Date: 2026-10-18 17:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20261018_07_add_timeline_event_indexes"
+down_revision = "20261018_06_add_automation_run_cursor"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_timeline_events_case_id_id",
+        "timeline_events",
+        ["case_id", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_timeline_events_case_type_id",
+        "timeline_events",
+        ["case_id", "event_type", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_timeline_events_case_type_id", table_name="timeline_events")
+    op.drop_index("ix_timeline_events_case_id_id", table_name="timeline_events")
@@ -0,0 +1,41 @@
+"""add case projection section versions
+
+Revision ID: 20261018_08_add_case_projection_versions
+Revises: 20261018_07_add_timeline_event_indexes
+Create Date: 2026-10-18 18:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_08_add_case_projection_versions"
+down_revision = "20261018_07_add_timeline_event_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Существующие проекции остаются без версий и будут пересобраны sweep'ом.
+    with op.batch_alter_table("case_projections") as batch_op:
+        batch_op.add_column(
+            sa.Column("section_versions", sa.JSON(), nullable=False, server_default="{}")
+        )
+        batch_op.add_column(sa.Column("projection_version", sa.String(length=255), nullable=True))
+
+    op.create_index(
+        "ix_case_projections_projection_version",
+        "case_projections",
+        ["projection_version"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_case_projections_projection_version", table_name="case_projections")
+
+    with op.batch_alter_table("case_projections") as batch_op:
+        batch_op.drop_column("projection_version")
+        batch_op.drop_column("section_versions")
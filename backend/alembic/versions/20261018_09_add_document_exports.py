@@ -0,0 +1,61 @@
+"""add document exports
+
+Revision ID: 20261018_09_add_document_exports
+Revises: 20261018_08_add_case_projection_versions
+Create Date: 2026-10-18 19:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_09_add_document_exports"
+down_revision = "20261018_08_add_case_projection_versions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_exports",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("tenant_id", sa.Integer(), nullable=False),
+        sa.Column("document_code", sa.String(length=100), nullable=False),
+        sa.Column("format", sa.String(length=20), nullable=False, server_default="pdf"),
+        sa.Column("status", sa.String(length=50), nullable=False, server_default="pending"),
+        sa.Column("view_id", sa.Integer(), nullable=True),
+        sa.Column("job_id", sa.Integer(), nullable=True),
+        sa.Column("total_items", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rendered_items", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("skipped_items", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed_items", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("case_ids_json", sa.String(), nullable=True),
+        sa.Column("manifest_json", sa.String(), nullable=True),
+        sa.Column("archive_path", sa.String(length=1000), nullable=True),
+        sa.Column("archive_size", sa.Integer(), nullable=True),
+        sa.Column("error_message", sa.String(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_document_exports_id", "document_exports", ["id"], unique=False)
+    op.create_index("ix_document_exports_tenant_id", "document_exports", ["tenant_id"], unique=False)
+    op.create_index("ix_document_exports_status", "document_exports", ["status"], unique=False)
+    op.create_index("ix_document_exports_job_id", "document_exports", ["job_id"], unique=False)
+
+    with op.batch_alter_table("job_queue_jobs") as batch_op:
+        batch_op.add_column(sa.Column("progress_json", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("job_queue_jobs") as batch_op:
+        batch_op.drop_column("progress_json")
+
+    op.drop_index("ix_document_exports_job_id", table_name="document_exports")
+    op.drop_index("ix_document_exports_status", table_name="document_exports")
+    op.drop_index("ix_document_exports_tenant_id", table_name="document_exports")
+    op.drop_index("ix_document_exports_id", table_name="document_exports")
+    op.drop_table("document_exports")
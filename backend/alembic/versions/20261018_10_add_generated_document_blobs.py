@@ -0,0 +1,31 @@
+"""add generated document blobs
+
+Revision ID: 20261018_10_add_generated_document_blobs
+Revises: 20261018_09_add_document_exports
+Create Date: 2026-10-18 21:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_10_add_generated_document_blobs"
+down_revision = "20261018_09_add_document_exports"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("generated_documents") as batch_op:
+        batch_op.add_column(sa.Column("content_hash", sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column("content_size", sa.Integer(), nullable=True))
+        batch_op.create_index("ix_generated_documents_content_hash", ["content_hash"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("generated_documents") as batch_op:
+        batch_op.drop_index("ix_generated_documents_content_hash")
+        batch_op.drop_column("content_size")
+        batch_op.drop_column("content_hash")
@@ -0,0 +1,36 @@
+"""add control room priority schedule indexes
+
+Revision ID: 20261018_11_add_control_room_priority_schedule_indexes
+Revises: 20261018_10_add_generated_document_blobs
+Create Date: 2026-10-18 22:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20261018_11_add_control_room_priority_schedule_indexes"
+down_revision = "20261018_10_add_generated_document_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_control_room_case_stats_tenant_priority_stale",
+        "control_room_case_stats",
+        ["tenant_id", "priority_stale"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_control_room_case_stats_tenant_priority_expires",
+        "control_room_case_stats",
+        ["tenant_id", "priority_expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_control_room_case_stats_tenant_priority_expires", table_name="control_room_case_stats")
+    op.drop_index("ix_control_room_case_stats_tenant_priority_stale", table_name="control_room_case_stats")
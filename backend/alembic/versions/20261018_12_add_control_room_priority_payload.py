@@ -0,0 +1,31 @@
+"""add control room priority payload
+
+Revision ID: 20261018_12_add_control_room_priority_payload
+Revises: 20261018_11_add_control_room_priority_schedule_indexes
+Create Date: 2026-10-18 22:30:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_12_add_control_room_priority_payload"
+down_revision = "20261018_11_add_control_room_priority_schedule_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("control_room_case_stats") as batch_op:
+        batch_op.add_column(sa.Column("priority_payload", sa.JSON(), nullable=True))
+
+    # Без сохранённых причин приоритет надо пересчитать.
+    stats = sa.table("control_room_case_stats", sa.column("priority_stale", sa.Boolean()))
+    op.execute(stats.update().values(priority_stale=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("control_room_case_stats") as batch_op:
+        batch_op.drop_column("priority_payload")
@@ -0,0 +1,42 @@
+"""add control room routing facts
+
+Revision ID: 20261018_13_add_control_room_routing_facts
+Revises: 20261018_12_add_control_room_priority_payload
+Create Date: 2026-10-18 23:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_13_add_control_room_routing_facts"
+down_revision = "20261018_12_add_control_room_priority_payload"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("control_room_case_stats") as batch_op:
+        batch_op.add_column(sa.Column("routing_status", sa.String(length=16), nullable=True))
+        batch_op.add_column(sa.Column("waiting_eligible_at", sa.DateTime(), nullable=True))
+
+    op.create_index(
+        "ix_control_room_case_stats_tenant_routing",
+        "control_room_case_stats",
+        ["tenant_id", "is_archived", "routing_status"],
+        unique=False,
+    )
+
+    # Маршрут заполняет задача пересчёта приоритетов.
+    stats = sa.table("control_room_case_stats", sa.column("priority_stale", sa.Boolean()))
+    op.execute(stats.update().values(priority_stale=True))
+
+
+def downgrade() -> None:
+    op.drop_index("ix_control_room_case_stats_tenant_routing", table_name="control_room_case_stats")
+
+    with op.batch_alter_table("control_room_case_stats") as batch_op:
+        batch_op.drop_column("waiting_eligible_at")
+        batch_op.drop_column("routing_status")
@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from backend.app.database import get_db
+from backend.app.database import get_db, get_read_db
 from backend.app.services.control_room_service import (
     get_case_control_room_card,
     get_control_room_dashboard,
@@ -12,6 +12,10 @@ from backend.app.services.control_room_service import (
     get_control_room_summary,
     get_control_room_waiting_preview,
 )
+from backend.app.services.control_room_summary_service import (
+    reconcile_control_room_summary,
+    roll_over_overdue,
+)
 from backend.app.services.focus_queue_service import get_control_room_focus_queues
 from backend.app.services.tenant_query_service import resolve_current_tenant_id
 
@@ -28,7 +32,7 @@ def _get_current_tenant_id(
 @router.get("/control-room/summary")
 def control_room_summary(
     include_archived: bool = Query(default=False),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(_get_current_tenant_id),
 ):
     return get_control_room_summary(
@@ -38,11 +42,36 @@ def control_room_summary(
     )
 
 
+@router.post("/control-room/summary/reconcile")
+def control_room_summary_reconcile(
+    repair: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(_get_current_tenant_id),
+):
+    result = reconcile_control_room_summary(
+        db,
+        tenant_id=tenant_id,
+        repair=repair,
+    )
+    db.commit()
+    return result
+
+
+@router.post("/control-room/summary/roll-over")
+def control_room_summary_roll_over(
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(_get_current_tenant_id),
+):
+    result = roll_over_overdue(db, tenant_id=tenant_id)
+    db.commit()
+    return result
+
+
 @router.get("/control-room/priority-cases")
 def control_room_priority_cases(
     include_archived: bool = Query(default=False),
     limit: int = Query(default=10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(_get_current_tenant_id),
 ):
     return get_control_room_priority_cases(
@@ -56,7 +85,7 @@ def control_room_priority_cases(
 @router.get("/control-room/waiting-preview")
 def control_room_waiting_preview(
     limit: int = Query(default=10, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(_get_current_tenant_id),
 ):
     return get_control_room_waiting_preview(
@@ -69,7 +98,7 @@ def control_room_waiting_preview(
 @router.get("/control-room/execution-console")
 def control_room_execution_console(
     limit: int = Query(default=20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(_get_current_tenant_id),
 ):
     return get_control_room_execution_console(
@@ -83,7 +112,7 @@ def control_room_execution_console(
 def control_room_focus_queues(
     include_archived: bool = Query(default=False),
     per_queue_limit: int = Query(default=5, ge=1, le=20),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(_get_current_tenant_id),
 ):
     return get_control_room_focus_queues(
@@ -97,7 +126,7 @@ def control_room_focus_queues(
 @router.get("/control-room/dashboard")
 def control_room_dashboard(
     include_archived: bool = Query(default=False),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(_get_current_tenant_id),
 ):
     return get_control_room_dashboard(
@@ -110,7 +139,7 @@ def control_room_dashboard(
 @router.get("/cases/{case_id}/control-room-card")
 def case_control_room_card(
     case_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(_get_current_tenant_id),
 ):
     _ = tenant_id
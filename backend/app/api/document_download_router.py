@@ -1,17 +1,20 @@
 from __future__ import annotations
 
-from io import BytesIO
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
 from backend.app.database import get_db
-from backend.app.services.document_catalog_service import enrich_document_definitions
-from backend.app.services.document_export_service import (
-    export_document_docx,
-    export_document_pdf,
+from backend.app.schemas.document_engine import DocumentExportCreate
+from backend.app.services.document_bulk_export_service import (
+    create_document_export,
+    get_document_export_or_404,
+    serialize_document_export,
 )
+from backend.app.services.document_catalog_service import enrich_document_definitions
+from backend.app.services.document_export_service import export_document_cached
 from backend.app.services.document_stage_service import get_available_documents
 from backend.app.services.tenant_query_service import (
     load_case_for_tenant_or_404,
@@ -48,26 +51,79 @@ def _ensure_document_ready(document_meta: dict) -> None:
     raise HTTPException(status_code=422, detail=detail)
 
 
-@router.get("/cases/{case_id}/documents/{document_code}.docx")
-def download_document_docx(
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {item.strip() for item in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def attachment_content_disposition(filename: str) -> str:
+    # Как в starlette FileResponse: небезопасные символы уходят в filename* (RFC 5987).
+    quoted = quote(filename, safe="")
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _document_download_response(
+    db: Session,
+    *,
+    tenant_id: int,
     case_id: int,
     document_code: str,
-    db: Session = Depends(get_db),
-    tenant_id: int = Depends(_get_current_tenant_id),
-):
+    export_format: str,
+    if_none_match: str | None,
+) -> Response:
     _ = load_case_for_tenant_or_404(db, case_id, tenant_id, include_archived=True)
     document_meta = _get_document_meta_or_404(db, case_id, document_code)
     _ensure_document_ready(document_meta)
 
     try:
-        exported = export_document_docx(db, case_id=case_id, document_code=document_code)
+        exported = export_document_cached(
+            db,
+            tenant_id=tenant_id,
+            case_id=case_id,
+            document_code=document_code,
+            export_format=export_format,
+        )
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc))
 
-    return StreamingResponse(
-        BytesIO(exported.content),
+    headers = {
+        "ETag": exported.etag,
+        # Браузер хранит копию, но перепроверяет её по ETag при каждом скачивании.
+        "Cache-Control": "private, no-cache",
+    }
+    if etag_matches(if_none_match, exported.etag):
+        return Response(status_code=304, headers=headers)
+
+    # Отдаём уже прочитанные байты: файл кэша может быть вытеснен до отправки ответа.
+    return Response(
+        content=exported.content,
         media_type=exported.media_type,
-        headers={"Content-Disposition": f'attachment; filename="{exported.filename}"'},
+        headers={
+            **headers,
+            "Content-Disposition": attachment_content_disposition(exported.filename),
+        },
+    )
+
+
+@router.get("/cases/{case_id}/documents/{document_code}.docx")
+def download_document_docx(
+    case_id: int,
+    document_code: str,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(_get_current_tenant_id),
+):
+    return _document_download_response(
+        db,
+        tenant_id=tenant_id,
+        case_id=case_id,
+        document_code=document_code,
+        export_format="docx",
+        if_none_match=if_none_match,
     )
 
 
@@ -75,20 +131,62 @@ def download_document_docx(
 def download_document_pdf(
     case_id: int,
     document_code: str,
+    if_none_match: str | None = Header(default=None),
     db: Session = Depends(get_db),
     tenant_id: int = Depends(_get_current_tenant_id),
 ):
-    _ = load_case_for_tenant_or_404(db, case_id, tenant_id, include_archived=True)
-    document_meta = _get_document_meta_or_404(db, case_id, document_code)
-    _ensure_document_ready(document_meta)
+    return _document_download_response(
+        db,
+        tenant_id=tenant_id,
+        case_id=case_id,
+        document_code=document_code,
+        export_format="pdf",
+        if_none_match=if_none_match,
+    )
 
-    try:
-        exported = export_document_pdf(db, case_id=case_id, document_code=document_code)
-    except ValueError as exc:
-        raise HTTPException(status_code=422, detail=str(exc))
 
-    return StreamingResponse(
-        BytesIO(exported.content),
-        media_type=exported.media_type,
-        headers={"Content-Disposition": f'attachment; filename="{exported.filename}"'},
-    )
\ No newline at end of file
+@router.post("/document-exports")
+def create_document_export_endpoint(
+    payload: DocumentExportCreate,
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(_get_current_tenant_id),
+):
+    result = create_document_export(
+        db,
+        tenant_id=tenant_id,
+        document_code=payload.document_code,
+        export_format=payload.format,
+        case_ids=payload.case_ids,
+        view_id=payload.view_id,
+        limit=payload.limit,
+    )
+    db.commit()
+    return result
+
+
+@router.get("/document-exports/{export_id}")
+def document_export_detail(
+    export_id: int,
+    include_manifest: bool = False,
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(_get_current_tenant_id),
+):
+    export = get_document_export_or_404(db, export_id=export_id, tenant_id=tenant_id)
+    return {"export": serialize_document_export(export, include_manifest=include_manifest)}
+
+
+@router.get("/document-exports/{export_id}/download")
+def download_document_export(
+    export_id: int,
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(_get_current_tenant_id),
+):
+    export = get_document_export_or_404(db, export_id=export_id, tenant_id=tenant_id)
+    if export.status != "completed" or not export.archive_path:
+        raise HTTPException(status_code=409, detail=f"Export is not ready: {export.status}")
+
+    return FileResponse(
+        export.archive_path,
+        media_type="application/zip",
+        filename=f"export_{export.id}_{export.document_code}.zip",
+    )
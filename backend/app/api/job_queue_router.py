@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from backend.app.database import get_db
+from backend.app.models import JobQueueJob
+from backend.app.services.job_queue_service import serialize_job
+from backend.app.services.tenant_query_service import resolve_current_tenant_id
+
+router = APIRouter(tags=["job-queue"])
+
+
+def _get_current_tenant_id(
+    db: Session = Depends(get_db),
+    tenant_id: int | None = Query(default=None, alias="tenant_id"),
+) -> int:
+    return resolve_current_tenant_id(db, tenant_id)
+
+
+@router.get("/job-queue/jobs/{job_id}")
+def job_queue_job_detail(
+    job_id: int,
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(_get_current_tenant_id),
+):
+    job = (
+        db.query(JobQueueJob)
+        .filter(
+            JobQueueJob.id == job_id,
+            JobQueueJob.tenant_id == tenant_id,
+        )
+        .first()
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return serialize_job(db, job)
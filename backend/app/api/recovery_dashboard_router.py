@@ -5,7 +5,7 @@ from typing import Any
 from fastapi import APIRouter, Body, Depends, Query
 from sqlalchemy.orm import Session
 
-from backend.app.database import get_db
+from backend.app.database import get_db, get_read_db
 from backend.app.services.debtor_dashboard_service import (
     get_debtor_cases,
     get_debtor_dashboard,
@@ -31,7 +31,7 @@ def _get_current_tenant_id(
 @router.get("/debtors/{debtor_id}/dashboard")
 def debtor_dashboard_endpoint(
     debtor_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(_get_current_tenant_id),
 ):
     return get_debtor_dashboard(
@@ -44,7 +44,7 @@ def debtor_dashboard_endpoint(
 @router.get("/debtors/{debtor_id}/cases")
 def debtor_cases_endpoint(
     debtor_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(_get_current_tenant_id),
 ):
     return get_debtor_cases(
@@ -57,7 +57,7 @@ def debtor_cases_endpoint(
 @router.get("/cases/{case_id}/recovery")
 def get_recovery_endpoint(
     case_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(_get_current_tenant_id),
 ):
     return get_recovery(
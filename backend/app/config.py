@@ -1,12 +1,66 @@
 from __future__ import annotations
 
 import os
+import tempfile
 
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./backend/debtrix.db")
+# Пустое значение — дашборды читают из основной базы.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL", "")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in {"1", "true", "yes", "on"}
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
 
 APP_ENV = os.getenv("APP_ENV", "local")
 APP_DEBUG = os.getenv("APP_DEBUG", "true").lower() in {"1", "true", "yes", "on"}
 
 DEFAULT_TENANT_NAME = os.getenv("DEFAULT_TENANT_NAME", "Default Tenant")
-DEFAULT_TENANT_SLUG = os.getenv("DEFAULT_TENANT_SLUG", "default")
\ No newline at end of file
+DEFAULT_TENANT_SLUG = os.getenv("DEFAULT_TENANT_SLUG", "default")
+TENANT_CACHE_TTL_SECONDS = float(os.getenv("TENANT_CACHE_TTL_SECONDS", "300"))
+WORKER_THREADS = int(os.getenv("WORKER_THREADS", "4"))
+WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", "1"))
+WORKER_LEASE_SECONDS = int(os.getenv("WORKER_LEASE_SECONDS", "30"))
+WORKER_HEARTBEAT_SECONDS = int(os.getenv("WORKER_HEARTBEAT_SECONDS", "10"))
+JOB_RETRY_BASE_SECONDS = int(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+JOB_RETRY_MAX_SECONDS = int(os.getenv("JOB_RETRY_MAX_SECONDS", "1800"))
+
+JOB_QUEUE_NOTIFY_CHANNEL = os.getenv("JOB_QUEUE_NOTIFY_CHANNEL", "debtrix_job_queue")
+WORKER_WAKEUP_FILE = os.getenv(
+    "WORKER_WAKEUP_FILE",
+    os.path.join(tempfile.gettempdir(), "debtrix-job-queue.wakeup"),
+)
+WORKER_IDLE_MIN_SECONDS = float(os.getenv("WORKER_IDLE_MIN_SECONDS", "0.05"))
+WORKER_IDLE_MAX_SECONDS = float(os.getenv("WORKER_IDLE_MAX_SECONDS", "30"))
+
+AUTOMATION_RUN_CHUNK_SIZE = int(os.getenv("AUTOMATION_RUN_CHUNK_SIZE", "100"))
+BATCH_JOB_PARTITION_SIZE = int(os.getenv("BATCH_JOB_PARTITION_SIZE", "50"))
+
+DOCUMENT_EXPORT_DIR = os.getenv("DOCUMENT_EXPORT_DIR", "./backend/storage/document_exports")
+DOCUMENT_EXPORT_PROCESSES = int(os.getenv("DOCUMENT_EXPORT_PROCESSES", str(os.cpu_count() or 1)))
+DOCUMENT_EXPORT_CHUNK_SIZE = int(os.getenv("DOCUMENT_EXPORT_CHUNK_SIZE", "50"))
+DOCUMENT_EXPORT_MAX_CASES = int(os.getenv("DOCUMENT_EXPORT_MAX_CASES", "5000"))
+
+DOCUMENT_CACHE_DIR = os.getenv("DOCUMENT_CACHE_DIR", "./backend/storage/document_cache")
+DOCUMENT_CACHE_MAX_BYTES_PER_TENANT = int(
+    os.getenv("DOCUMENT_CACHE_MAX_BYTES_PER_TENANT", str(256 * 1024 * 1024))
+)
+
+DOCUMENT_BLOB_STORE = os.getenv("DOCUMENT_BLOB_STORE", "local")
+DOCUMENT_BLOB_DIR = os.getenv("DOCUMENT_BLOB_DIR", "./backend/storage/blobs")
+DOCUMENT_BLOB_CHUNK_SIZE = int(os.getenv("DOCUMENT_BLOB_CHUNK_SIZE", str(64 * 1024)))
+DOCUMENT_BLOB_S3_BUCKET = os.getenv("DOCUMENT_BLOB_S3_BUCKET", "")
+DOCUMENT_BLOB_S3_ENDPOINT_URL = os.getenv("DOCUMENT_BLOB_S3_ENDPOINT_URL")
+DOCUMENT_BLOB_S3_PREFIX = os.getenv("DOCUMENT_BLOB_S3_PREFIX", "blobs")
+
+DOCUMENT_TEMPLATE_CACHE_SIZE = int(os.getenv("DOCUMENT_TEMPLATE_CACHE_SIZE", "512"))
+DOCUMENT_TEMPLATE_BATCH_MAX_CASES = int(os.getenv("DOCUMENT_TEMPLATE_BATCH_MAX_CASES", "5000"))
+
+PROJECTION_SWEEP_BATCH_SIZE = int(os.getenv("PROJECTION_SWEEP_BATCH_SIZE", "200"))
+
+STREAM_YIELD_PER = int(os.getenv("STREAM_YIELD_PER", "500"))
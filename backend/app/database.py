@@ -1,27 +1,124 @@
 from __future__ import annotations
 
-import os
+import threading
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./debtrix.db")
-
-connect_args = {}
-if DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
-
-engine = create_engine(
+from backend.app.config import (
+    DATABASE_READ_URL,
     DATABASE_URL,
-    connect_args=connect_args,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_STATEMENT_TIMEOUT_MS,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_MMAP_SIZE,
 )
 
+
+def _is_sqlite_memory(url) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def _install_sqlite_pragmas(engine: Engine, *, memory: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            # WAL: читатели не блокируют запись воркера и наоборот.
+            if not memory:
+                cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT_MS)}")
+            if SQLITE_MMAP_SIZE > 0:
+                cursor.execute(f"PRAGMA mmap_size={int(SQLITE_MMAP_SIZE)}")
+        finally:
+            cursor.close()
+
+
+def _engine_options(url) -> dict[str, Any]:
+    options: dict[str, Any] = {"pool_pre_ping": DB_POOL_PRE_PING}
+    backend = url.get_backend_name()
+
+    if backend == "sqlite":
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+        if _is_sqlite_memory(url):
+            # In-memory база живёт в одном соединении — пул SQLAlchemy выбирает сам.
+            return options
+    elif backend == "postgresql":
+        connect_args: dict[str, Any] = {}
+        if DB_STATEMENT_TIMEOUT_MS > 0:
+            connect_args["options"] = f"-c statement_timeout={int(DB_STATEMENT_TIMEOUT_MS)}"
+        options["connect_args"] = connect_args
+
+    options.update(
+        poolclass=QueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+    )
+    return options
+
+
+_pool_events: dict[str, dict[str, int]] = {}
+_pool_events_lock = threading.Lock()
+
+
+def _install_pool_counters(engine: Engine, name: str) -> None:
+    counters = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0}
+    _pool_events[name] = counters
+
+    def _bump(key: str):
+        def _listener(*_args) -> None:
+            with _pool_events_lock:
+                counters[key] += 1
+
+        return _listener
+
+    event.listen(engine, "connect", _bump("connects"))
+    event.listen(engine, "checkout", _bump("checkouts"))
+    event.listen(engine, "checkin", _bump("checkins"))
+    event.listen(engine, "invalidate", _bump("invalidations"))
+
+
+def create_db_engine(database_url: str, *, name: str = "primary") -> Engine:
+    url = make_url(database_url)
+    engine = create_engine(url, **_engine_options(url))
+
+    if url.get_backend_name() == "sqlite":
+        _install_sqlite_pragmas(engine, memory=_is_sqlite_memory(url))
+
+    _install_pool_counters(engine, name)
+    return engine
+
+
+engine = create_db_engine(DATABASE_URL)
+
+# Реплика для дашбордов; без DATABASE_READ_URL это тот же engine.
+read_engine = create_db_engine(DATABASE_READ_URL, name="replica") if DATABASE_READ_URL else engine
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
 )
 
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine,
+)
+
 Base = declarative_base()
 
 
@@ -30,4 +127,48 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        # Сессия только читает: незакоммиченного состояния быть не должно.
+        db.rollback()
+        db.close()
+
+
+def _pool_status(engine: Engine, name: str) -> dict[str, Any]:
+    pool = engine.pool
+    status: dict[str, Any] = {
+        "name": name,
+        "dialect": engine.dialect.name,
+        "pool_class": type(pool).__name__,
+    }
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=DB_MAX_OVERFLOW,
+        )
+    with _pool_events_lock:
+        status.update(_pool_events.get(name, {}))
+    return status
+
+
+def get_pool_metrics() -> dict[str, Any]:
+    pools = [_pool_status(engine, "primary")]
+    if read_engine is not engine:
+        pools.append(_pool_status(read_engine, "replica"))
+    return {"pools": pools}
+
+
+def dispose_engines() -> None:
+    # После fork дочерний процесс не должен переиспользовать сокеты родителя.
+    engine.dispose(close=False)
+    if read_engine is not engine:
+        read_engine.dispose(close=False)
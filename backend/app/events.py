@@ -5,8 +5,10 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, Optional
 
+from sqlalchemy import event as sa_event, insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, SessionTransaction
 
 from backend.app.models import TimelineEvent
 
@@ -75,22 +77,181 @@ def emit_event(db: Session, event: CaseEvent) -> TimelineEvent:
     return row
 
 
+def _conflict_insert(dialect_name: str):
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    return None
+
+
+def _insert_ignoring_duplicates(db: Session, rows: list[dict[str, Any]], *, returning: bool = False):
+    dialect_insert = _conflict_insert(db.get_bind().dialect.name)
+    statement = (
+        dialect_insert(TimelineEvent.__table__)
+        .values(rows)
+        .on_conflict_do_nothing(
+            index_elements=[TimelineEvent.case_id, TimelineEvent.dedup_key],
+            index_where=TimelineEvent.dedup_key.is_not(None),
+        )
+    )
+    if returning:
+        statement = statement.returning(TimelineEvent.id)
+    return db.connection().execute(statement)
+
+
+def _event_row(event: CaseEvent, dedup_key: Optional[str]) -> Dict[str, Any]:
+    return {
+        "case_id": event.case_id,
+        "event_type": event.type.value,
+        "title": event.title,
+        "details": _payload_to_details(event.details, event.payload),
+        "created_at": event.created_at or datetime.utcnow(),
+        "dedup_key": dedup_key,
+    }
+
+
 def emit_event_once(db: Session, event: CaseEvent, dedup_key: str) -> Optional[TimelineEvent]:
-    created_at = event.created_at or datetime.utcnow()
-    details = _payload_to_details(event.details, event.payload)
+    row = _event_row(event, dedup_key)
+
+    if _conflict_insert(db.get_bind().dialect.name) is not None:
+        # ON CONFLICT DO NOTHING вместо SAVEPOINT + перехвата IntegrityError.
+        inserted_id = _insert_ignoring_duplicates(db, [row], returning=True).scalar()
+        if inserted_id is None:
+            return None
+        return db.get(TimelineEvent, inserted_id)
 
     try:
         with db.begin_nested():
-            row = TimelineEvent(
-                case_id=event.case_id,
-                event_type=event.type.value,
-                title=event.title,
-                details=details,
-                created_at=created_at,
-                dedup_key=dedup_key,
-            )
-            db.add(row)
+            timeline_event = TimelineEvent(**row)
+            db.add(timeline_event)
             db.flush()
-            return row
+            return timeline_event
     except IntegrityError:
-        return None
\ No newline at end of file
+        return None
+
+
+# ---------------------------
+# Буфер событий на unit of work
+# ---------------------------
+
+EVENT_BUFFER_KEY = "timeline_event_buffer"
+EVENT_WRITTEN_KEY = "timeline_event_written"
+EVENT_BUFFER_CHUNK_SIZE = 500
+
+
+def _current_transaction(db: Session) -> Optional[SessionTransaction]:
+    return db.get_nested_transaction() or db.get_transaction()
+
+
+def _is_within(transaction: Optional[SessionTransaction], ancestor: SessionTransaction) -> bool:
+    while transaction is not None:
+        if transaction is ancestor:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+def _on_before_commit(session: Session) -> None:
+    # before_commit приходит и на release savepoint — пишем только на корневом commit.
+    if session.get_nested_transaction() is None:
+        flush_event_buffer(session)
+
+
+def _on_after_commit(session: Session) -> None:
+    session.info[EVENT_WRITTEN_KEY].clear()
+
+
+def _on_after_soft_rollback(session: Session, previous_transaction: SessionTransaction) -> None:
+    buffered = session.info[EVENT_BUFFER_KEY]
+    written = session.info[EVENT_WRITTEN_KEY]
+
+    if previous_transaction.parent is None:
+        buffered.clear()
+        written.clear()
+        return
+
+    # События, добавленные внутри откатанного savepoint, выбрасываем.
+    # Записанные в нём, но добавленные раньше, снова ставим в буфер.
+    requeued: list[tuple[Optional[SessionTransaction], Dict[str, Any]]] = []
+    kept_written = []
+    for written_in, (added_in, row) in written:
+        if not _is_within(written_in, previous_transaction):
+            kept_written.append((written_in, (added_in, row)))
+        elif not _is_within(added_in, previous_transaction):
+            requeued.append((added_in, row))
+
+    buffered[:] = requeued + [
+        (added_in, row)
+        for added_in, row in buffered
+        if not _is_within(added_in, previous_transaction)
+    ]
+    written[:] = kept_written
+
+
+def _ensure_event_buffer(db: Session) -> list:
+    buffered = db.info.get(EVENT_BUFFER_KEY)
+    if buffered is not None:
+        return buffered
+
+    buffered = db.info[EVENT_BUFFER_KEY] = []
+    db.info[EVENT_WRITTEN_KEY] = []
+    sa_event.listen(db, "before_commit", _on_before_commit)
+    sa_event.listen(db, "after_commit", _on_after_commit)
+    sa_event.listen(db, "after_soft_rollback", _on_after_soft_rollback)
+    return buffered
+
+
+def buffer_event(db: Session, event: CaseEvent, dedup_key: Optional[str] = None) -> None:
+    # Событие уйдёт в БД одним INSERT вместе с остальными при commit или явном
+    # flush_event_buffer. Обычный flush буфер не трогает: иначе каждый savepoint
+    # (begin_nested делает flush) снова давал бы по INSERT на событие.
+    buffered = _ensure_event_buffer(db)
+    if db.get_transaction() is None:
+        # Без транзакции rollback не пришёл бы в after_soft_rollback.
+        db.begin()
+    buffered.append(
+        (_current_transaction(db), _event_row(event, dedup_key or event.dedup_key))
+    )
+
+
+def flush_event_buffer(db: Session) -> int:
+    buffered = db.info.get(EVENT_BUFFER_KEY)
+    if not buffered:
+        return 0
+
+    entries = list(buffered)
+    buffered.clear()
+
+    seen_keys: set[tuple[int, str]] = set()
+    rows: list[Dict[str, Any]] = []
+    for _, row in entries:
+        if row["dedup_key"]:
+            key = (row["case_id"], row["dedup_key"])
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+        rows.append(row)
+
+    inserted = 0
+    if _conflict_insert(db.get_bind().dialect.name) is not None:
+        for offset in range(0, len(rows), EVENT_BUFFER_CHUNK_SIZE):
+            result = _insert_ignoring_duplicates(db, rows[offset:offset + EVENT_BUFFER_CHUNK_SIZE])
+            inserted += max(result.rowcount or 0, 0)
+    else:
+        plain_rows = [row for row in rows if not row["dedup_key"]]
+        if plain_rows:
+            db.connection().execute(insert(TimelineEvent.__table__), plain_rows)
+            inserted += len(plain_rows)
+        for row in rows:
+            if row["dedup_key"]:
+                try:
+                    with db.connection().begin_nested():
+                        db.connection().execute(insert(TimelineEvent.__table__), [row])
+                    inserted += 1
+                except IntegrityError:
+                    pass
+
+    written_in = _current_transaction(db)
+    db.info[EVENT_WRITTEN_KEY].extend((written_in, entry) for entry in entries)
+    return inserted
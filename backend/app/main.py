@@ -3,18 +3,24 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from fastapi import Body, Depends, FastAPI, HTTPException, Query
+from fastapi import Body, Depends, FastAPI, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from backend.app.api.batch_action_router import router as batch_action_router
 from backend.app.api.case_command_router import router as case_command_router
 from backend.app.api.control_room_router import router as control_room_router
 from backend.app.api.creditor_profile_router import router as creditor_profile_router
-from backend.app.api.document_download_router import router as document_download_router
+from backend.app.api.document_download_router import (
+    attachment_content_disposition,
+    etag_matches,
+    router as document_download_router,
+)
 from backend.app.api.execution_log_router import router as execution_router
+from backend.app.api.job_queue_router import router as job_queue_router
 from backend.app.api.workspace_router import router as workspace_router
-from backend.app.database import get_db
+from backend.app.database import SessionLocal, get_db, get_pool_metrics, get_read_db
 from backend.app.schema_bootstrap import ensure_schema
 
 from backend.app.models import (
@@ -24,7 +30,6 @@ from backend.app.models import (
     DebtorProfile,
     PlaybookDefinition,
     PlaybookStep,
-    TimelineEvent,
 )
 
 from backend.app.schemas.automation import (
@@ -41,6 +46,7 @@ from backend.app.schemas.debtor import (
 )
 from backend.app.schemas.document_engine import (
     DocumentGenerateRequest,
+    DocumentTemplateBatchRender,
     DocumentTemplateCreate,
 )
 from backend.app.schemas.playbook import PlaybookResponse
@@ -56,9 +62,12 @@ from backend.app.schemas.snapshot import SnapshotResponse
 
 from backend.app.services.action_service import get_available_actions
 from backend.app.services.automation_engine_service import (
+    cancel_automation_run,
     execute_automation_run,
     get_automation_run_detail,
+    get_automation_run_summary,
     get_waiting_bucket,
+    iter_automation_run_items,
     list_automation_runs,
     start_automation_run_for_cases,
 )
@@ -75,19 +84,24 @@ from backend.app.services.batch_execution_service import (
 from backend.app.services.batch_job_service import (
     create_batch_job,
     create_batch_job_from_portfolio_view,
+    dispatch_batch_job,
     execute_batch_job,
-    get_batch_job_or_404,
+    get_batch_job,
+    iter_batch_job_items,
     list_batch_job_items,
     list_batch_jobs,
+    prepare_batch_job_items_stream,
     rebuild_batch_job_summary,
 )
 from backend.app.services.case_dashboard_service import build_case_dashboard
 from backend.app.services.case_service import (
     apply_action_write,
     create_case_write,
-    get_projection_data_or_rebuild,
+    get_projection_data,
+    sweep_case_projections,
     sync_and_persist_case,
 )
+from backend.app.services.debtor_identity_service import rebuild_debtor_identity_index
 from backend.app.services.debtor_service import (
     normalize_and_validate_inn_ogrn,
     resolve_inn_ogrn_with_fallback,
@@ -95,11 +109,17 @@ from backend.app.services.debtor_service import (
 from backend.app.services.document_engine_service import (
     create_document_template,
     generate_document_for_case,
+    get_generated_document_or_404,
+    iter_document_template_batch,
     list_document_templates,
     list_generated_documents,
+    open_generated_document_stream,
+    prepare_document_template_batch,
 )
 from backend.app.services.document_readiness_service import get_document_readiness
+from backend.app.services.document_render_service import warmup_document_renderers
 from backend.app.services.document_stage_service import get_available_documents
+from backend.app.services.eligibility_service import invalidate_eligibility_cache
 from backend.app.services.esia_session_service import (
     authorize_esia_session,
     start_esia_session_for_action,
@@ -114,12 +134,16 @@ from backend.app.services.integration_service import get_case_integrations_statu
 from backend.app.services.organization_lookup_service import (
     lookup_organization_by_identifiers,
 )
+from backend.app.services.job_queue_service import enqueue_job
 from backend.app.services.outbound_gateway_service import dispatch_external_action
 from backend.app.services.playbook_engine_service import evaluate_case_playbook
 from backend.app.services.playbook_registry_service import list_default_playbooks
+from backend.app.services.ndjson_stream_service import ndjson_response
 from backend.app.services.portfolio_query_service import (
+    iter_portfolio_rows,
     portfolio_buckets,
     portfolio_summary,
+    prepare_portfolio_stream,
     query_portfolio,
 )
 from backend.app.services.portfolio_routing_service import build_portfolio_routing
@@ -137,7 +161,16 @@ from backend.app.services.tenant_query_service import (
     load_case_for_tenant_or_404,
     resolve_current_tenant_id,
 )
-from backend.app.services.tenant_service import bootstrap_tenants_for_existing_data
+from backend.app.services.tenant_service import (
+    bootstrap_tenants_for_existing_data,
+    ensure_default_tenant,
+)
+from backend.app.services.timeline_service import (
+    iter_case_timeline,
+    list_case_timeline,
+    prepare_case_timeline_stream,
+    summarize_case_timeline,
+)
 from backend.app.services.waiting_bucket_service import list_waiting_buckets
 
 from backend.app.api.recovery_dashboard_router import router as recovery_dashboard_router
@@ -165,12 +198,23 @@ app.include_router(control_room_router)
 app.include_router(workspace_router)
 app.include_router(case_command_router)
 app.include_router(recovery_dashboard_router)
+app.include_router(job_queue_router)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     ensure_schema()
 
+    # Тенант по умолчанию создаётся здесь, чтобы запросы только читали его из кэша.
+    db = SessionLocal()
+    try:
+        ensure_default_tenant(db)
+        db.commit()
+    finally:
+        db.close()
+
+    warmup_document_renderers()
+
 
 def get_current_tenant_id(
     db: Session = Depends(get_db),
@@ -179,6 +223,24 @@ def get_current_tenant_id(
     return resolve_current_tenant_id(db, tenant_id)
 
 
+def _enqueue_background_job(
+    db: Session,
+    *,
+    tenant_id: int,
+    job_type: str,
+    payload: dict,
+) -> dict:
+    job = enqueue_job(db, tenant_id=tenant_id, job_type=job_type, payload=payload)
+    db.commit()
+    return {
+        "ok": True,
+        "queued": True,
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+    }
+
+
 def _normalize_soft_policy_payload(payload: dict) -> dict[str, int]:
     policy = {
         "payment_due_notice_delay_days": int(payload.get("payment_due_notice_delay_days", 0)),
@@ -219,6 +281,11 @@ def health():
     return {"ok": True}
 
 
+@app.get("/health/db")
+def health_db():
+    return {"ok": True, **get_pool_metrics()}
+
+
 @app.post("/admin/bootstrap-tenants")
 def admin_bootstrap_tenants(db: Session = Depends(get_db)):
     result = bootstrap_tenants_for_existing_data(db)
@@ -226,6 +293,33 @@ def admin_bootstrap_tenants(db: Session = Depends(get_db)):
     return result
 
 
+@app.post("/admin/rebuild-projections")
+def admin_rebuild_projections(
+    background: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(get_current_tenant_id),
+):
+    if background:
+        return _enqueue_background_job(
+            db,
+            tenant_id=tenant_id,
+            job_type="case_projection_sweep",
+            payload={},
+        )
+
+    return sweep_case_projections(db, tenant_id=tenant_id)
+
+
+@app.post("/admin/rebuild-debtor-identities")
+def admin_rebuild_debtor_identities(
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(get_current_tenant_id),
+):
+    result = rebuild_debtor_identity_index(db, tenant_id=tenant_id)
+    db.commit()
+    return result
+
+
 # ---------------------------
 # CASES
 # ---------------------------
@@ -268,7 +362,7 @@ def get_case_detail(
     tenant_id: int = Depends(get_current_tenant_id),
 ):
     _ = load_case_for_tenant_or_404(db, case_id, tenant_id, include_archived=True)
-    return get_projection_data_or_rebuild(db, case_id)
+    return get_projection_data(db, case_id)
 
 
 @app.get("/cases/{case_id}/snapshot", response_model=SnapshotResponse)
@@ -278,7 +372,7 @@ def get_case_snapshot(
     tenant_id: int = Depends(get_current_tenant_id),
 ):
     case = load_case_for_tenant_or_404(db, case_id, tenant_id, include_archived=True)
-    data = get_projection_data_or_rebuild(db, case.id)
+    data = get_projection_data(db, case.id)
 
     projection = (
         db.query(CaseProjection)
@@ -323,32 +417,41 @@ def apply_action(
 @app.get("/cases/{case_id}/timeline")
 def get_timeline(
     case_id: int,
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: Optional[int] = Query(default=None),
+    event_type: Optional[list[str]] = Query(default=None),
+    since: Optional[datetime] = Query(default=None),
+    summary: bool = Query(default=False),
+    stream: bool = Query(default=False),
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
     case = load_case_for_tenant_or_404(db, case_id, tenant_id, include_archived=True)
 
-    events = (
-        db.query(TimelineEvent)
-        .filter(TimelineEvent.case_id == case.id)
-        .order_by(TimelineEvent.id.desc())
-        .all()
-    )
+    if summary:
+        return summarize_case_timeline(db, case_id=case.id, event_types=event_type, since=since)
+
+    if stream:
+        header = prepare_case_timeline_stream(case_id=case.id, cursor=cursor, event_types=event_type)
+        return ndjson_response(
+            header,
+            lambda stream_db: iter_case_timeline(
+                stream_db,
+                case_id=case.id,
+                cursor=cursor,
+                event_types=event_type,
+                since=since,
+            ),
+        )
 
-    return {
-        "case_id": case.id,
-        "items": [
-            {
-                "id": item.id,
-                "event_type": item.event_type,
-                "title": item.title,
-                "details": item.details,
-                "created_at": item.created_at.isoformat() if item.created_at else None,
-                "dedup_key": getattr(item, "dedup_key", None),
-            }
-            for item in events
-        ],
-    }
+    return list_case_timeline(
+        db,
+        case_id=case.id,
+        limit=limit,
+        cursor=cursor,
+        event_types=event_type,
+        since=since,
+    )
 
 
 @app.get("/cases/{case_id}/participants")
@@ -475,7 +578,7 @@ def update_case_soft_policy(
     case.updated_at = datetime.utcnow()
     db.add(case)
 
-    sync_and_persist_case(db, case)
+    sync_and_persist_case(db, case, changes=("contract_data",))
     db.commit()
     db.refresh(case)
 
@@ -512,7 +615,7 @@ def debtor_identify(
     case.updated_at = datetime.utcnow()
     db.add(case)
 
-    sync_and_persist_case(db, case)
+    sync_and_persist_case(db, case, changes=("contract_data",))
     db.commit()
     db.refresh(case)
 
@@ -589,7 +692,7 @@ def debtor_refresh(
         "provider_payload": org.get("raw") or {},
     }
 
-    sync_and_persist_case(db, case)
+    sync_and_persist_case(db, case, changes=("contract_data", "debtor_profile"))
     db.commit()
     db.refresh(profile)
     return profile
@@ -646,12 +749,21 @@ def case_integrations_status(
 @app.post("/cases/{case_id}/integrations/fns/sync")
 def case_fns_sync(
     case_id: int,
+    background: bool = Query(default=False),
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
     case = load_case_for_tenant_or_404(db, case_id, tenant_id, include_archived=True)
+    if background:
+        return _enqueue_background_job(
+            db,
+            tenant_id=tenant_id,
+            job_type="fns_case_sync",
+            payload={"case_id": case.id},
+        )
+
     result = run_fns_case_sync(db, case=case, tenant_id=tenant_id)
-    sync_and_persist_case(db, case)
+    sync_and_persist_case(db, case, changes=("contract_data", "debtor_profile"))
     db.commit()
     return result
 
@@ -732,9 +844,18 @@ def esia_session_authorize(
 @app.post("/external-actions/{action_id}/dispatch")
 def external_action_dispatch(
     action_id: int,
+    background: bool = Query(default=False),
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
+    if background:
+        return _enqueue_background_job(
+            db,
+            tenant_id=tenant_id,
+            job_type="external_action_dispatch",
+            payload={"action_id": action_id},
+        )
+
     result = dispatch_external_action(
         db,
         action_id=action_id,
@@ -786,9 +907,16 @@ def automation_runs_list(
 @app.get("/automation/runs/{run_id}")
 def automation_run_detail(
     run_id: int,
+    stream: bool = Query(default=False),
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
+    if stream:
+        return ndjson_response(
+            get_automation_run_summary(db, run_id=run_id, tenant_id=tenant_id),
+            lambda stream_db: iter_automation_run_items(stream_db, run_id=run_id, tenant_id=tenant_id),
+        )
+
     return get_automation_run_detail(db, run_id=run_id, tenant_id=tenant_id)
 
 
@@ -813,9 +941,18 @@ def automation_run_start(
 def automation_run_execute(
     run_id: int,
     payload: AutomationRunExecuteRequest = Body(default=AutomationRunExecuteRequest()),
+    background: bool = Query(default=False),
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
+    if background:
+        return _enqueue_background_job(
+            db,
+            tenant_id=tenant_id,
+            job_type="automation_run_execute",
+            payload={"run_id": run_id, "force": payload.force},
+        )
+
     result = execute_automation_run(
         db,
         run_id=run_id,
@@ -826,6 +963,17 @@ def automation_run_execute(
     return result
 
 
+@app.post("/automation/runs/{run_id}/cancel")
+def automation_run_cancel(
+    run_id: int,
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(get_current_tenant_id),
+):
+    result = cancel_automation_run(db, run_id=run_id, tenant_id=tenant_id)
+    db.commit()
+    return result
+
+
 @app.get("/automation/waiting-bucket")
 def automation_waiting_bucket(
     db: Session = Depends(get_db),
@@ -873,31 +1021,11 @@ def batch_job_detail_endpoint(
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
-    job = get_batch_job_or_404(
+    return get_batch_job(
         db,
         batch_job_id=batch_job_id,
         tenant_id=tenant_id,
     )
-    return {
-        "job": {
-            "id": job.id,
-            "tenant_id": job.tenant_id,
-            "job_type": job.job_type,
-            "title": job.title,
-            "description": job.description,
-            "status": job.status,
-            "rule_id": job.rule_id,
-            "selection_snapshot": job.selection_snapshot or {},
-            "execution_params": job.execution_params or {},
-            "summary": job.summary or {},
-            "result": job.result or {},
-            "error_message": job.error_message,
-            "started_at": job.started_at.isoformat() if job.started_at else None,
-            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
-            "created_at": job.created_at.isoformat() if job.created_at else None,
-            "updated_at": job.updated_at.isoformat() if job.updated_at else None,
-        }
-    }
 
 
 @app.get("/batch-jobs/{batch_job_id}/items")
@@ -905,9 +1033,29 @@ def batch_job_items(
     batch_job_id: int,
     status: Optional[str] = Query(default=None),
     bucket_code: Optional[str] = Query(default=None),
+    stream: bool = Query(default=False),
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
+    if stream:
+        header = prepare_batch_job_items_stream(
+            db,
+            batch_job_id=batch_job_id,
+            tenant_id=tenant_id,
+            status=status,
+            bucket_code=bucket_code,
+        )
+        return ndjson_response(
+            header,
+            lambda stream_db: iter_batch_job_items(
+                stream_db,
+                batch_job_id=batch_job_id,
+                tenant_id=tenant_id,
+                status=status,
+                bucket_code=bucket_code,
+            ),
+        )
+
     return list_batch_job_items(
         db,
         batch_job_id=batch_job_id,
@@ -921,9 +1069,29 @@ def batch_job_items(
 def batch_job_execute_endpoint(
     batch_job_id: int,
     payload: BatchJobExecuteRequest = Body(default=BatchJobExecuteRequest()),
+    background: bool = Query(default=False),
+    parallel: bool = Query(default=False),
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
+    if parallel:
+        result = dispatch_batch_job(
+            db,
+            batch_job_id=batch_job_id,
+            tenant_id=tenant_id,
+            force=payload.force,
+        )
+        db.commit()
+        return result
+
+    if background:
+        return _enqueue_background_job(
+            db,
+            tenant_id=tenant_id,
+            job_type="batch_job_execute",
+            payload={"batch_job_id": batch_job_id, "force": payload.force},
+        )
+
     result = execute_batch_job(
         db,
         batch_job_id=batch_job_id,
@@ -988,9 +1156,47 @@ def batch_job_detail_scaffold(
     )
 
 
+def _portfolio_view_detail(db: Session, *, view_id: int, tenant_id: int) -> dict:
+    item = get_portfolio_view_or_404(db, view_id=view_id, tenant_id=tenant_id)
+    return {
+        "view": {
+            "id": item.id,
+            "tenant_id": item.tenant_id,
+            "name": item.name,
+            "description": item.description,
+            "is_default": item.is_default,
+            "is_shared": item.is_shared,
+            "filters": item.filters or {},
+            "sorting": item.sorting or {},
+            "columns": item.columns or {},
+            "meta": item.meta or {},
+            "created_at": item.created_at.isoformat() if item.created_at else None,
+            "updated_at": item.updated_at.isoformat() if item.updated_at else None,
+        }
+    }
+
+
+def _portfolio_routing(db: Session, *, tenant_id: int, include_archived: bool):
+    query = db.query(Case).order_by(Case.id.desc())
+    query = filter_cases_by_tenant(
+        query,
+        tenant_id,
+        include_archived=include_archived,
+    )
+    cases = query.all()
+
+    # Эндпоинт читает с реплики: waiting buckets не сохраняем, это делает пересчёт приоритетов.
+    return build_portfolio_routing(
+        db,
+        tenant_id=tenant_id,
+        cases=cases,
+        persist_waiting_buckets=False,
+    )
+
+
 @app.get("/portfolio/waiting-items")
 def portfolio_waiting_items(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
     return get_portfolio_waiting_bucket(db, tenant_id=tenant_id)
@@ -1002,9 +1208,33 @@ def portfolio_waiting_items(
 @app.post("/portfolio/query")
 def portfolio_query_endpoint(
     payload: PortfolioQueryRequest,
-    db: Session = Depends(get_db),
+    stream: bool = Query(default=False),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
+    if stream:
+        filters = payload.filters.model_dump()
+        header = prepare_portfolio_stream(
+            db,
+            tenant_id=tenant_id,
+            filters=filters,
+            order_by=payload.order_by,
+            offset=payload.offset,
+            cursor=payload.cursor,
+            include_total=payload.include_total,
+        )
+        return ndjson_response(
+            header,
+            lambda stream_db: iter_portfolio_rows(
+                stream_db,
+                tenant_id=tenant_id,
+                filters=filters,
+                order_by=payload.order_by,
+                offset=payload.offset,
+                cursor=payload.cursor,
+            ),
+        )
+
     return query_portfolio(
         db,
         tenant_id=tenant_id,
@@ -1012,13 +1242,15 @@ def portfolio_query_endpoint(
         limit=payload.limit,
         offset=payload.offset,
         order_by=payload.order_by,
+        cursor=payload.cursor,
+        include_total=payload.include_total,
     )
 
 
 @app.post("/portfolio/summary")
 def portfolio_summary_endpoint(
     payload: PortfolioQueryRequest,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
     return portfolio_summary(
@@ -1032,7 +1264,7 @@ def portfolio_summary_endpoint(
 @app.post("/portfolio/buckets")
 def portfolio_buckets_endpoint(
     payload: PortfolioQueryRequest,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
     return portfolio_buckets(
@@ -1045,7 +1277,7 @@ def portfolio_buckets_endpoint(
 
 @app.get("/portfolio/views")
 def portfolio_views_list(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
     return list_portfolio_views(db, tenant_id=tenant_id)
@@ -1069,26 +1301,14 @@ def portfolio_view_create_endpoint(
 @app.get("/portfolio/views/{view_id}")
 def portfolio_view_detail(
     view_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
-    item = get_portfolio_view_or_404(db, view_id=view_id, tenant_id=tenant_id)
-    return {
-        "view": {
-            "id": item.id,
-            "tenant_id": item.tenant_id,
-            "name": item.name,
-            "description": item.description,
-            "is_default": item.is_default,
-            "is_shared": item.is_shared,
-            "filters": item.filters or {},
-            "sorting": item.sorting or {},
-            "columns": item.columns or {},
-            "meta": item.meta or {},
-            "created_at": item.created_at.isoformat() if item.created_at else None,
-            "updated_at": item.updated_at.isoformat() if item.updated_at else None,
-        }
-    }
+    return _portfolio_view_detail(
+        db,
+        view_id=view_id,
+        tenant_id=tenant_id,
+    )
 
 
 @app.patch("/portfolio/views/{view_id}")
@@ -1143,21 +1363,13 @@ def portfolio_view_create_batch_job(
 @app.get("/portfolio/routing", response_model=PortfolioRoutingResponse)
 def portfolio_routing(
     include_archived: bool = Query(default=False),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
-    query = db.query(Case).order_by(Case.id.desc())
-    query = filter_cases_by_tenant(
-        query,
-        tenant_id,
-        include_archived=include_archived,
-    )
-    cases = query.all()
-
-    return build_portfolio_routing(
+    return _portfolio_routing(
         db,
         tenant_id=tenant_id,
-        cases=cases,
+        include_archived=include_archived,
     )
 
 
@@ -1167,7 +1379,7 @@ def portfolio_waiting_buckets(
     bucket_code: str | None = Query(default=None),
     step_code: str | None = Query(default=None),
     limit: int = Query(default=200, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
     return list_waiting_buckets(
@@ -1200,7 +1412,7 @@ def case_playbook(
         tenant_id,
         include_archived=True,
     )
-    return evaluate_case_playbook(db, case)
+    return evaluate_case_playbook(db, case, tenant_id=tenant_id)
 
 
 @app.post("/admin/bootstrap-playbooks")
@@ -1254,6 +1466,7 @@ def admin_bootstrap_playbooks(db: Session = Depends(get_db)):
             created_steps += 1
 
     db.commit()
+    invalidate_eligibility_cache()
 
     return {
         "ok": True,
@@ -1293,13 +1506,47 @@ def list_document_templates_endpoint(
     )
 
 
+@app.post("/document-templates/{template_id}/render-batch")
+def render_document_template_batch_endpoint(
+    template_id: int,
+    payload: DocumentTemplateBatchRender,
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(get_current_tenant_id),
+):
+    header, compiled, case_ids = prepare_document_template_batch(
+        db,
+        tenant_id=tenant_id,
+        template_id=template_id,
+        case_ids=payload.case_ids,
+    )
+    return ndjson_response(
+        header,
+        lambda stream_db: iter_document_template_batch(
+            stream_db,
+            tenant_id=tenant_id,
+            compiled=compiled,
+            case_ids=case_ids,
+        ),
+    )
+
+
 @app.post("/cases/{case_id}/generated-documents")
 def generate_document_for_case_endpoint(
     case_id: int,
     payload: DocumentGenerateRequest,
+    background: bool = Query(default=False),
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant_id),
 ):
+    if background:
+        _ = load_case_for_tenant_or_404(db, case_id, tenant_id, include_archived=True)
+        return _enqueue_background_job(
+            db,
+            tenant_id=tenant_id,
+            job_type="document_generate",
+            payload={"case_id": case_id, "document": payload.model_dump(mode="json")},
+        )
+
     result = generate_document_for_case(
         db,
         tenant_id=tenant_id,
@@ -1323,6 +1570,31 @@ def list_generated_documents_endpoint(
     )
 
 
+@app.get("/generated-documents/{document_id}/content")
+def generated_document_content_endpoint(
+    document_id: int,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(get_current_tenant_id),
+):
+    item = get_generated_document_or_404(
+        db,
+        tenant_id=tenant_id,
+        document_id=document_id,
+    )
+    headers = {}
+    if item.content_hash:
+        headers["ETag"] = f'"{item.content_hash}"'
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    media_type = "text/plain; charset=utf-8" if item.format == "txt" else "application/octet-stream"
+    headers["Content-Disposition"] = attachment_content_disposition(
+        f"{item.code}_case_{item.case_id}.{item.format}"
+    )
+    return StreamingResponse(open_generated_document_stream(item), media_type=media_type, headers=headers)
+
+
 # ---------------------------
 # META
 # ---------------------------
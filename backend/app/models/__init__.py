@@ -9,7 +9,11 @@ from backend.app.models.case_participant import CaseParticipant
 from backend.app.models.case_playbook import CasePlaybook
 from backend.app.models.case_projection import CaseProjection
 from backend.app.models.case_waiting_bucket import CaseWaitingBucket
+from backend.app.models.control_room_case_stat import ControlRoomCaseStat
+from backend.app.models.control_room_summary import ControlRoomSummary
+from backend.app.models.debtor_identity import DebtorIdentity
 from backend.app.models.debtor_profile import DebtorProfile
+from backend.app.models.document_export import DocumentExport
 from backend.app.models.document_template import DocumentTemplate
 from backend.app.models.esia_session import EsiaSession
 from backend.app.models.external_action import ExternalAction
@@ -43,7 +47,11 @@ __all__ = [
     "CasePlaybook",
     "CaseProjection",
     "CaseWaitingBucket",
+    "ControlRoomCaseStat",
+    "ControlRoomSummary",
+    "DebtorIdentity",
     "DebtorProfile",
+    "DocumentExport",
     "DocumentTemplate",
     "EsiaSession",
     "ExternalAction",
@@ -30,6 +30,9 @@ class AutomationRun(Base):
     waiting_items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     not_applicable_items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
+    # Последний обработанный AutomationRunItem.id — с него продолжается прерванный run.
+    cursor_item_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
     requested_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
     correlation_id: Mapped[str | None] = mapped_column(String(100), nullable=True, index=True)
 
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String, UniqueConstraint
+from sqlalchemy import DateTime, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.app.database import Base
@@ -16,6 +16,7 @@ class AutomationRunItem(Base):
             "case_id",
             name="uq_automation_run_items_run_case",
         ),
+        Index("ix_automation_run_items_run_status_id", "run_id", "status", "id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
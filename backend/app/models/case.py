@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy import JSON, Boolean, Date, DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import JSON, Boolean, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.app.database import Base
@@ -40,4 +40,9 @@ class Case(Base):
     eligible_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, index=True)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, index=True)
\ No newline at end of file
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
+Index("ix_cases_tenant_id_id", Case.tenant_id, Case.id)
+Index("ix_cases_tenant_due_date_id", Case.tenant_id, Case.due_date, Case.id)
+Index("ix_cases_tenant_principal_amount_id", Case.tenant_id, Case.principal_amount, Case.id)
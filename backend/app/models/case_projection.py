@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import JSON, DateTime, ForeignKey, Integer
+from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.app.database import Base
@@ -16,4 +16,7 @@ class CaseProjection(Base):
     case_id: Mapped[int] = mapped_column(ForeignKey("cases.id"), nullable=False, unique=True, index=True)
 
     data: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    # Версии секций data: по ним видно, какие части собраны старым кодом.
+    section_versions: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    projection_version: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, index=True)
\ No newline at end of file
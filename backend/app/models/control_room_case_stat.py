@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import JSON, Boolean, Date, DateTime, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.database import Base
+
+
+class ControlRoomCaseStat(Base):
+    __tablename__ = "control_room_case_stats"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    tenant_id: Mapped[int | None] = mapped_column(ForeignKey("tenants.id"), nullable=True, index=True)
+    case_id: Mapped[int] = mapped_column(ForeignKey("cases.id"), nullable=False, unique=True, index=True)
+
+    # Вклад дела в агрегаты control_room_summaries на момент последней синхронизации.
+    is_archived: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    status_bucket: Mapped[str] = mapped_column(String(32), nullable=False, default="draft")
+    is_blocked: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    principal_amount: Mapped[float] = mapped_column(Numeric(15, 2), nullable=False, default=0)
+    due_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+
+    # Предрасчитанный приоритет для control room; пересчитывается, когда устарел.
+    priority_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    priority_band: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    priority_ready_now: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    priority_waiting: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    priority_blocked: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    priority_stale: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    priority_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    priority_computed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Маршрут дела на момент расчёта приоритета: из него строятся сводки и очереди дашборда.
+    routing_status: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    waiting_eligible_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Причины и подсказки того же расчёта, чтобы чтение не пересобирало дашборд дела.
+    priority_payload: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+Index(
+    "ix_control_room_case_stats_tenant_archived_due",
+    ControlRoomCaseStat.tenant_id,
+    ControlRoomCaseStat.is_archived,
+    ControlRoomCaseStat.due_date,
+)
+
+
+Index(
+    "ix_control_room_case_stats_tenant_priority",
+    ControlRoomCaseStat.tenant_id,
+    ControlRoomCaseStat.is_archived,
+    ControlRoomCaseStat.priority_score,
+)
+
+
+Index(
+    "ix_control_room_case_stats_tenant_routing",
+    ControlRoomCaseStat.tenant_id,
+    ControlRoomCaseStat.is_archived,
+    ControlRoomCaseStat.routing_status,
+)
+
+
+Index(
+    "ix_control_room_case_stats_tenant_priority_stale",
+    ControlRoomCaseStat.tenant_id,
+    ControlRoomCaseStat.priority_stale,
+)
+
+
+Index(
+    "ix_control_room_case_stats_tenant_priority_expires",
+    ControlRoomCaseStat.tenant_id,
+    ControlRoomCaseStat.priority_expires_at,
+)
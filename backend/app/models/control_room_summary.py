@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, Numeric, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.database import Base
+
+
+class ControlRoomSummary(Base):
+    __tablename__ = "control_room_summaries"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "is_archived", name="uq_control_room_summaries_tenant_archived"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("tenants.id"), nullable=False, index=True)
+    is_archived: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    total_cases: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    draft_cases: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    overdue_cases: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    pretrial_cases: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    court_cases: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    fssp_cases: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    closed_cases: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    blocked_cases: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    overdue_now_cases: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    total_principal_amount: Mapped[float] = mapped_column(Numeric(18, 2), nullable=False, default=0)
+
+    overdue_as_of: Mapped[date] = mapped_column(Date, nullable=False, default=date.today)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
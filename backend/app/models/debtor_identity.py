@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.database import Base
+
+
+class DebtorIdentity(Base):
+    __tablename__ = "debtor_identities"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    tenant_id: Mapped[int | None] = mapped_column(ForeignKey("tenants.id"), nullable=True, index=True)
+    case_id: Mapped[int] = mapped_column(ForeignKey("cases.id"), nullable=False, unique=True, index=True)
+
+    inn: Mapped[str | None] = mapped_column(String(12), nullable=True)
+    ogrn: Mapped[str | None] = mapped_column(String(15), nullable=True)
+    name_key: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+Index("ix_debtor_identities_tenant_inn", DebtorIdentity.tenant_id, DebtorIdentity.inn)
+Index("ix_debtor_identities_tenant_ogrn", DebtorIdentity.tenant_id, DebtorIdentity.ogrn)
+Index("ix_debtor_identities_tenant_name_key", DebtorIdentity.tenant_id, DebtorIdentity.name_key)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.database import Base
+
+
+class DocumentExport(Base):
+    __tablename__ = "document_exports"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    tenant_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+
+    document_code: Mapped[str] = mapped_column(String(100), nullable=False)
+    format: Mapped[str] = mapped_column(String(20), nullable=False, default="pdf")
+    status: Mapped[str] = mapped_column(String(50), nullable=False, default="pending", index=True)
+
+    view_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    job_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+
+    total_items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rendered_items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    skipped_items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed_items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    case_ids_json: Mapped[str | None] = mapped_column(String, nullable=True)
+    manifest_json: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    archive_path: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    archive_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    error_message: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
@@ -26,6 +26,8 @@ class GeneratedDocument(Base):
 
     file_path: Mapped[str | None] = mapped_column(String(1000), nullable=True)
     storage_provider: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    content_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     rendered_content: Mapped[str | None] = mapped_column(Text, nullable=True)
     context_snapshot: Mapped[dict] = mapped_column(JSON, default=dict)
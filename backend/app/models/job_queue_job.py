@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String
+from sqlalchemy import DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.app.database import Base
@@ -26,7 +26,12 @@ class JobQueueJob(Base):
 
     priority: Mapped[int] = mapped_column(Integer, nullable=False, default=100)
 
+    # Воркер, который сейчас держит задачу; его WorkerLease продлевает владение.
+    worker_id: Mapped[str | None] = mapped_column(String(100), nullable=True, index=True)
+
     payload_json: Mapped[str | None] = mapped_column(String)
+    # Прогресс долгих задач (done/total и т.п.), пишет сам обработчик.
+    progress_json: Mapped[str | None] = mapped_column(String, nullable=True)
 
     scheduled_at: Mapped[datetime | None] = mapped_column(DateTime)
     started_at: Mapped[datetime | None] = mapped_column(DateTime)
@@ -38,4 +43,6 @@ class JobQueueJob(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         default=datetime.utcnow,
-    )
\ No newline at end of file
+    )
+
+Index("ix_job_queue_jobs_claim", JobQueueJob.status, JobQueueJob.priority, JobQueueJob.id)
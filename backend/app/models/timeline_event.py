@@ -29,4 +29,11 @@ Index(
     TimelineEvent.dedup_key,
     unique=True,
     sqlite_where=TimelineEvent.dedup_key.is_not(None),
-)
\ No newline at end of file
+)
+Index("ix_timeline_events_case_id_id", TimelineEvent.case_id, TimelineEvent.id)
+Index(
+    "ix_timeline_events_case_type_id",
+    TimelineEvent.case_id,
+    TimelineEvent.event_type,
+    TimelineEvent.id,
+)
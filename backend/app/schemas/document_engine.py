@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 
 class DocumentTemplateCreate(BaseModel):
@@ -14,4 +16,16 @@ class DocumentGenerateRequest(BaseModel):
     code: str
     template_id: int | None = None
     format: str = "txt"
-    meta: dict = {}
\ No newline at end of file
+    meta: dict = {}
+
+
+class DocumentTemplateBatchRender(BaseModel):
+    case_ids: list[int] = Field(min_length=1)
+
+
+class DocumentExportCreate(BaseModel):
+    document_code: str
+    format: Literal["docx", "pdf"] = "pdf"
+    view_id: int | None = None
+    case_ids: list[int] = Field(default_factory=list)
+    limit: int | None = Field(default=None, ge=1)
@@ -30,6 +30,8 @@ class PortfolioQueryRequest(BaseModel):
     filters: PortfolioQueryFilters = Field(default_factory=PortfolioQueryFilters)
     limit: int = Field(default=100, ge=1, le=1000)
     offset: int = Field(default=0, ge=0)
+    cursor: str | None = None
+    include_total: bool = True
     order_by: Literal[
         "id_desc",
         "id_asc",
@@ -25,6 +25,10 @@ def get_available_actions(db: Session, case_id: int) -> list[dict[str, Any]]:
     if not case:
         return []
 
+    return get_available_actions_for_case(case)
+
+
+def get_available_actions_for_case(case: Case) -> list[dict[str, Any]]:
     flags = _flags(case)
 
     if flags["closed"]:
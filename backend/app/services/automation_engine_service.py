@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import json
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
 
 from fastapi import HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from backend.app.events import CaseEvent, CaseEventType, emit_event
+from backend.app.config import AUTOMATION_RUN_CHUNK_SIZE, STREAM_YIELD_PER
+from backend.app.events import CaseEvent, CaseEventType, buffer_event, emit_event
 from backend.app.models import AutomationRule, AutomationRun, AutomationRunItem, Case
 from backend.app.services.external_action_service import prepare_external_action
 from backend.app.services.fssp_sync_service import run_fssp_case_check
@@ -178,6 +180,35 @@ def get_automation_run_detail(
     }
 
 
+def get_automation_run_summary(
+    db: Session,
+    *,
+    run_id: int,
+    tenant_id: int | None = None,
+) -> dict[str, Any]:
+    tenant_id = tenant_id or current_tenant_id(db)
+    run = get_automation_run_or_404(db, run_id=run_id, tenant_id=tenant_id)
+    return {"run": _serialize_run(run)}
+
+
+def iter_automation_run_items(
+    db: Session,
+    *,
+    run_id: int,
+    tenant_id: int,
+) -> Iterator[dict[str, Any]]:
+    query = (
+        db.query(AutomationRunItem)
+        .filter(
+            AutomationRunItem.run_id == run_id,
+            AutomationRunItem.tenant_id == tenant_id,
+        )
+        .order_by(AutomationRunItem.id.asc())
+    )
+    for item in query.yield_per(STREAM_YIELD_PER):
+        yield _serialize_run_item(item)
+
+
 def _evaluate_case_eligibility(
     case: Case,
     *,
@@ -475,122 +506,142 @@ def start_automation_run_for_cases(
     return get_automation_run_detail(db, run_id=run.id, tenant_id=tenant_id)
 
 
-def execute_automation_run(
-    db: Session,
-    *,
-    run_id: int,
-    tenant_id: int | None = None,
-    force: bool = False,
-) -> dict[str, Any]:
-    tenant_id = tenant_id or current_tenant_id(db)
+_RUN_COUNTER_BY_STATUS = {
+    "queued": "queued_items",
+    "done": "success_items",
+    "succeeded": "success_items",
+    "failed": "failed_items",
+    "blocked": "blocked_items",
+    "waiting": "waiting_items",
+    "not_applicable": "not_applicable_items",
+}
 
-    run = get_automation_run_or_404(db, run_id=run_id, tenant_id=tenant_id)
-    rule = _get_rule_or_404(db, rule_id=run.rule_id, tenant_id=tenant_id)
 
-    items = (
-        db.query(AutomationRunItem)
-        .filter(
-            AutomationRunItem.run_id == run.id,
-            AutomationRunItem.tenant_id == tenant_id,
-        )
-        .order_by(AutomationRunItem.id.asc())
-        .all()
+def _apply_run_counter_deltas(db: Session, run: AutomationRun, transitions: list[tuple[str, str]]) -> None:
+    deltas: dict[str, int] = {}
+    for old_status, new_status in transitions:
+        if old_status == new_status:
+            continue
+        old_column = _RUN_COUNTER_BY_STATUS.get(old_status)
+        new_column = _RUN_COUNTER_BY_STATUS.get(new_status)
+        if old_column:
+            deltas[old_column] = deltas.get(old_column, 0) - 1
+        if new_column:
+            deltas[new_column] = deltas.get(new_column, 0) + 1
+
+    values: dict[Any, Any] = {
+        getattr(AutomationRun, column): getattr(AutomationRun, column) + delta
+        for column, delta in deltas.items()
+        if delta
+    }
+    if not values:
+        return
+
+    # Счётчики двигаются атомарным UPDATE без перечитывания всех items.
+    (
+        db.query(AutomationRun)
+        .filter(AutomationRun.id == run.id)
+        .update(values, synchronize_session=False)
     )
 
-    if not items:
-        raise HTTPException(status_code=409, detail="Automation run has no items")
 
-    if run.status in {"finished", "succeeded"} and not force:
-        return get_automation_run_detail(db, run_id=run.id, tenant_id=tenant_id)
+def _recount_run_sql(db: Session, run: AutomationRun) -> None:
+    rows = (
+        db.query(AutomationRunItem.status, func.count(AutomationRunItem.id))
+        .filter(AutomationRunItem.run_id == run.id)
+        .group_by(AutomationRunItem.status)
+        .all()
+    )
 
-    external_action_id = None
-    now = _utcnow()
-    run.status = "running"
-    run.started_at = run.started_at or now
-    run.updated_at = now
-    db.add(run)
-    db.flush()
+    counters = {column: 0 for column in set(_RUN_COUNTER_BY_STATUS.values())}
+    total = 0
+    for status, count in rows:
+        total += int(count)
+        column = _RUN_COUNTER_BY_STATUS.get(status)
+        if column:
+            counters[column] += int(count)
 
-    for item in items:
-        if item.status not in {"queued"} and not force:
-            continue
+    run.total_items = total
+    for column, value in counters.items():
+        setattr(run, column, value)
 
-        case = (
-            db.query(Case)
-            .filter(
-                Case.id == item.case_id,
-                Case.tenant_id == tenant_id,
-            )
-            .first()
-        )
-        if not case:
-            item.status = "failed"
-            item.reason_code = "case_not_found"
-            item.reason_text = "Дело не найдено."
-            item.execution_finished_at = _utcnow()
-            item.updated_at = _utcnow()
-            item.result_json = _dump({"ok": False, "error": "case_not_found"})
-            db.add(item)
-            continue
 
-        item.execution_started_at = _utcnow()
+def _execute_run_item(
+    db: Session,
+    *,
+    run: AutomationRun,
+    rule: AutomationRule,
+    item: AutomationRunItem,
+    case: Case | None,
+    tenant_id: int,
+) -> str | None:
+    if not case:
+        item.status = "failed"
+        item.reason_code = "case_not_found"
+        item.reason_text = "Дело не найдено."
+        item.execution_finished_at = _utcnow()
         item.updated_at = _utcnow()
+        item.result_json = _dump({"ok": False, "error": "case_not_found"})
         db.add(item)
-        db.flush()
+        return None
+
+    item.execution_started_at = _utcnow()
+    item.updated_at = _utcnow()
 
+    # Savepoint на item: сбой одного дела не откатывает остальные в чанке.
+    savepoint = db.begin_nested()
+    try:
         execution = _execute_case_action(
             db,
             case=case,
             tenant_id=tenant_id,
             rule=rule,
         )
+        savepoint.commit()
+    except Exception as exc:
+        savepoint.rollback()
+        execution = {
+            "status": "failed",
+            "result": {"ok": False, "error": f"{type(exc).__name__}: {exc}"},
+            "external_action_id": None,
+        }
 
-        item.execution_finished_at = _utcnow()
-        item.updated_at = _utcnow()
-        item.result_json = _dump(execution.get("result") or {})
-        external_action_id = execution.get("external_action_id") or external_action_id
-
-        if execution["status"] == "done":
-            item.status = "succeeded"
-            emit_event(
-                db,
-                CaseEvent(
-                    case_id=case.id,
-                    type=CaseEventType.CASE_UPDATED,
-                    title=f"Automation done: {rule.title}",
-                    details="Automation action completed.",
-                    payload={
-                        "run_id": run.id,
-                        "rule_code": rule.code,
-                        "action_code": rule.action_code,
-                        "external_action_id": execution.get("external_action_id"),
-                    },
-                ),
-            )
-        elif execution["status"] == "not_applicable":
-            item.status = "not_applicable"
-            item.reason_code = "unsupported_action"
-            item.reason_text = "Automation action is not supported."
-        else:
-            item.status = "failed"
-            item.reason_code = "execution_failed"
-            item.reason_text = "Automation action failed."
+    item.execution_finished_at = _utcnow()
+    item.updated_at = _utcnow()
+    item.result_json = _dump(execution.get("result") or {})
 
-        db.add(item)
+    if execution["status"] == "done":
+        item.status = "succeeded"
+        buffer_event(
+            db,
+            CaseEvent(
+                case_id=case.id,
+                type=CaseEventType.CASE_UPDATED,
+                title=f"Automation done: {rule.title}",
+                details="Automation action completed.",
+                payload={
+                    "run_id": run.id,
+                    "rule_code": rule.code,
+                    "action_code": rule.action_code,
+                    "external_action_id": execution.get("external_action_id"),
+                },
+            ),
+        )
+    elif execution["status"] == "not_applicable":
+        item.status = "not_applicable"
+        item.reason_code = "unsupported_action"
+        item.reason_text = "Automation action is not supported."
+    else:
+        item.status = "failed"
+        item.reason_code = "execution_failed"
+        item.reason_text = "Automation action failed."
 
-    db.flush()
+    db.add(item)
+    return execution.get("external_action_id")
 
-    refreshed_items = (
-        db.query(AutomationRunItem)
-        .filter(
-            AutomationRunItem.run_id == run.id,
-            AutomationRunItem.tenant_id == tenant_id,
-        )
-        .order_by(AutomationRunItem.id.asc())
-        .all()
-    )
 
-    _recount_run(run, refreshed_items)
+def _finalize_run(db: Session, run: AutomationRun, *, external_action_id: Any) -> None:
+    _recount_run_sql(db, run)
 
     if run.failed_items == 0 and run.queued_items == 0 and run.blocked_items == 0 and run.waiting_items == 0:
         run.status = "succeeded"
@@ -623,12 +674,193 @@ def execute_automation_run(
         }
     )
     db.add(run)
+
+
+def execute_automation_run(
+    db: Session,
+    *,
+    run_id: int,
+    tenant_id: int | None = None,
+    force: bool = False,
+    chunk_size: int | None = None,
+) -> dict[str, Any]:
+    tenant_id = tenant_id or current_tenant_id(db)
+    chunk_size = max(int(chunk_size or AUTOMATION_RUN_CHUNK_SIZE), 1)
+
+    run = get_automation_run_or_404(db, run_id=run_id, tenant_id=tenant_id)
+    rule = _get_rule_or_404(db, rule_id=run.rule_id, tenant_id=tenant_id)
+
+    has_items = (
+        db.query(AutomationRunItem.id)
+        .filter(
+            AutomationRunItem.run_id == run.id,
+            AutomationRunItem.tenant_id == tenant_id,
+        )
+        .first()
+    )
+    if not has_items:
+        raise HTTPException(status_code=409, detail="Automation run has no items")
+
+    if run.status in {"finished", "succeeded"} and not force:
+        return get_automation_run_detail(db, run_id=run.id, tenant_id=tenant_id)
+
+    result = _load(run.result_json)
+    external_action_id = result.get("external_action_id")
+    now = _utcnow()
+    run.status = "running"
+    run.started_at = run.started_at or now
+    run.updated_at = now
+    if force:
+        run.cursor_item_id = None
+    db.add(run)
+    # Каждый чанк фиксируется отдельно: сбой или отмена не откатывает уже сделанное.
+    db.commit()
+
+    while True:
+        query = db.query(AutomationRunItem).filter(
+            AutomationRunItem.run_id == run.id,
+            AutomationRunItem.tenant_id == tenant_id,
+        )
+        if run.cursor_item_id:
+            query = query.filter(AutomationRunItem.id > run.cursor_item_id)
+        if not force:
+            query = query.filter(AutomationRunItem.status == "queued")
+        items = query.order_by(AutomationRunItem.id.asc()).limit(chunk_size).all()
+
+        if not items:
+            break
+
+        cases_map = {
+            case.id: case
+            for case in db.query(Case)
+            .filter(
+                Case.tenant_id == tenant_id,
+                Case.id.in_([item.case_id for item in items]),
+            )
+            .all()
+        }
+
+        transitions: list[tuple[str, str]] = []
+        for item in items:
+            old_status = item.status
+            external_action_id = (
+                _execute_run_item(
+                    db,
+                    run=run,
+                    rule=rule,
+                    item=item,
+                    case=cases_map.get(item.case_id),
+                    tenant_id=tenant_id,
+                )
+                or external_action_id
+            )
+            transitions.append((old_status, item.status))
+
+        _apply_run_counter_deltas(db, run, transitions)
+        run.cursor_item_id = items[-1].id
+        run.updated_at = _utcnow()
+        db.add(run)
+        db.commit()
+
+        # Отмена из другого запроса видна после commit.
+        db.refresh(run)
+        if run.status == "cancelled":
+            return get_automation_run_detail(db, run_id=run.id, tenant_id=tenant_id)
+
+    _finalize_run(db, run, external_action_id=external_action_id)
     db.flush()
     db.refresh(run)
 
     return get_automation_run_detail(db, run_id=run.id, tenant_id=tenant_id)
 
 
+def execute_automation_run_item(
+    db: Session,
+    *,
+    run_item_id: int,
+    tenant_id: int | None = None,
+    force: bool = False,
+) -> AutomationRunItem:
+    tenant_id = tenant_id or current_tenant_id(db)
+
+    item = (
+        db.query(AutomationRunItem)
+        .filter(
+            AutomationRunItem.id == run_item_id,
+            AutomationRunItem.tenant_id == tenant_id,
+        )
+        .first()
+    )
+    if not item:
+        raise HTTPException(status_code=404, detail="Automation run item not found")
+
+    if item.status != "queued" and not force:
+        return item
+
+    run = get_automation_run_or_404(db, run_id=item.run_id, tenant_id=tenant_id)
+    rule = _get_rule_or_404(db, rule_id=run.rule_id, tenant_id=tenant_id)
+    case = (
+        db.query(Case)
+        .filter(
+            Case.id == item.case_id,
+            Case.tenant_id == tenant_id,
+        )
+        .first()
+    )
+
+    old_status = item.status
+    _execute_run_item(
+        db,
+        run=run,
+        rule=rule,
+        item=item,
+        case=case,
+        tenant_id=tenant_id,
+    )
+    _apply_run_counter_deltas(db, run, [(old_status, item.status)])
+    db.flush()
+
+    return item
+
+
+def finalize_automation_run(
+    db: Session,
+    *,
+    run_id: int,
+    tenant_id: int | None = None,
+) -> AutomationRun:
+    tenant_id = tenant_id or current_tenant_id(db)
+    run = get_automation_run_or_404(db, run_id=run_id, tenant_id=tenant_id)
+
+    _finalize_run(db, run, external_action_id=_load(run.result_json).get("external_action_id"))
+    db.flush()
+
+    return run
+
+
+def cancel_automation_run(
+    db: Session,
+    *,
+    run_id: int,
+    tenant_id: int | None = None,
+) -> dict[str, Any]:
+    tenant_id = tenant_id or current_tenant_id(db)
+    run = get_automation_run_or_404(db, run_id=run_id, tenant_id=tenant_id)
+
+    if run.status in {"finished", "succeeded", "failed", "cancelled"}:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Cannot cancel automation run in status={run.status}",
+        )
+
+    run.status = "cancelled"
+    run.updated_at = _utcnow()
+    db.add(run)
+    db.flush()
+
+    return get_automation_run_detail(db, run_id=run.id, tenant_id=tenant_id)
+
+
 def get_waiting_bucket(
     db: Session,
     *,
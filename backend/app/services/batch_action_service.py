@@ -4,13 +4,13 @@ from collections import Counter
 from datetime import datetime
 from typing import Any
 
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from backend.app.models import Case
-from backend.app.services.action_service import get_available_actions
+from backend.app.services.action_service import get_available_actions_for_case
 from backend.app.services.case_service import apply_action_write
-from backend.app.services.playbook_engine_service import evaluate_case_playbook
-from backend.app.services.tenant_query_service import load_case_for_tenant_or_404
+from backend.app.services.playbook_engine_service import evaluate_playbooks_for_cases
 
 
 BUCKET_TITLES = {
@@ -162,14 +162,8 @@ def _case_snapshot(case: Case) -> dict[str, Any]:
     }
 
 
-def _detect_case_bucket(
-    db: Session,
-    case: Case,
-    tenant_id: int,
-    action_code: str,
-) -> dict[str, Any]:
-    available_actions = get_available_actions(db, case.id)
-    action_codes = _normalize_action_codes(available_actions)
+def _detect_static_bucket(case: Case, action_code: str) -> dict[str, Any] | None:
+    action_codes = _normalize_action_codes(get_available_actions_for_case(case))
 
     if action_code in action_codes:
         return {
@@ -196,8 +190,10 @@ def _detect_case_bucket(
             "eligible_at": None,
         }
 
-    playbook_eval = evaluate_case_playbook(db, case, tenant_id=tenant_id)
+    return None
+
 
+def _detect_playbook_bucket(playbook_eval: dict[str, Any]) -> dict[str, Any]:
     waiting_bucket = _first_waiting_bucket(playbook_eval)
     if waiting_bucket:
         return {
@@ -225,6 +221,60 @@ def _detect_case_bucket(
     }
 
 
+def _detect_case_buckets(
+    db: Session,
+    cases: list[Case],
+    tenant_id: int,
+    action_code: str,
+) -> dict[int, dict[str, Any]]:
+    result: dict[int, dict[str, Any]] = {}
+    needs_playbook: list[Case] = []
+
+    for case in cases:
+        static_bucket = _detect_static_bucket(case, action_code)
+        if static_bucket is None:
+            needs_playbook.append(case)
+        else:
+            result[case.id] = static_bucket
+
+    # Playbook, шаги и waiting buckets грузятся одним пакетом на все оставшиеся дела.
+    evaluations = evaluate_playbooks_for_cases(db, needs_playbook, tenant_id=tenant_id)
+    for case in needs_playbook:
+        result[case.id] = _detect_playbook_bucket(evaluations[case.id])
+
+    return result
+
+
+def _load_cases_for_batch(
+    db: Session,
+    *,
+    tenant_id: int,
+    case_ids: list[int],
+) -> list[Case]:
+    unique_ids = list(dict.fromkeys(int(case_id) for case_id in case_ids))
+    if not unique_ids:
+        return []
+
+    rows = (
+        db.query(Case)
+        .filter(
+            Case.tenant_id == tenant_id,
+            Case.id.in_(unique_ids),
+        )
+        .all()
+    )
+    cases_by_id = {case.id: case for case in rows}
+
+    missing_ids = [case_id for case_id in unique_ids if case_id not in cases_by_id]
+    if missing_ids:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Cases not found for tenant: {missing_ids}",
+        )
+
+    return [cases_by_id[case_id] for case_id in unique_ids]
+
+
 def _build_guardrails(
     cases: list[Case],
     preview_items: list[dict[str, Any]],
@@ -535,7 +585,6 @@ def preview_batch_action(
     case_ids: list[int],
 ) -> dict[str, Any]:
     items: list[dict[str, Any]] = []
-    cases: list[Case] = []
 
     grouped: dict[str, list[int]] = {
         "eligible_now": [],
@@ -545,16 +594,11 @@ def preview_batch_action(
         "not_applicable": [],
     }
 
-    for case_id in case_ids:
-        case = load_case_for_tenant_or_404(
-            db,
-            case_id=case_id,
-            tenant_id=tenant_id,
-            include_archived=True,
-        )
-        cases.append(case)
+    cases = _load_cases_for_batch(db, tenant_id=tenant_id, case_ids=case_ids)
+    buckets = _detect_case_buckets(db, cases, tenant_id, action_code)
 
-        result = _detect_case_bucket(db, case, tenant_id, action_code)
+    for case in cases:
+        result = buckets[case.id]
         bucket = str(result["bucket"])
 
         grouped.setdefault(bucket, []).append(case.id)
@@ -598,19 +642,13 @@ def execute_batch_action(
     force: bool = False,
 ) -> dict[str, Any]:
     results: list[dict[str, Any]] = []
-    cases: list[Case] = []
     executed_count = 0
 
-    for case_id in case_ids:
-        case = load_case_for_tenant_or_404(
-            db,
-            case_id=case_id,
-            tenant_id=tenant_id,
-            include_archived=True,
-        )
-        cases.append(case)
+    cases = _load_cases_for_batch(db, tenant_id=tenant_id, case_ids=case_ids)
+    buckets = _detect_case_buckets(db, cases, tenant_id, action_code)
 
-        preview = _detect_case_bucket(db, case, tenant_id, action_code)
+    for case in cases:
+        preview = buckets[case.id]
 
         if preview["bucket"] in {"already_processed", "not_applicable"}:
             results.append(
@@ -7,7 +7,7 @@ from typing import Any
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
-from backend.app.events import CaseEvent, CaseEventType, emit_event
+from backend.app.events import CaseEvent, CaseEventType, buffer_event, emit_event
 from backend.app.models import (
     AutomationRule,
     BatchJob,
@@ -350,7 +350,7 @@ def start_batch_job(
         batch_items.append(batch_item)
 
         if batch_item.bucket == "done":
-            emit_event(
+            buffer_event(
                 db,
                 CaseEvent(
                     case_id=batch_item.case_id,
@@ -365,7 +365,7 @@ def start_batch_job(
                 ),
             )
         elif batch_item.bucket == "blocked":
-            emit_event(
+            buffer_event(
                 db,
                 CaseEvent(
                     case_id=batch_item.case_id,
@@ -380,7 +380,7 @@ def start_batch_job(
                 ),
             )
         elif batch_item.bucket == "waiting":
-            emit_event(
+            buffer_event(
                 db,
                 CaseEvent(
                     case_id=batch_item.case_id,
@@ -400,7 +400,7 @@ def start_batch_job(
                 ),
             )
         elif batch_item.bucket == "not_applicable":
-            emit_event(
+            buffer_event(
                 db,
                 CaseEvent(
                     case_id=batch_item.case_id,
@@ -415,7 +415,7 @@ def start_batch_job(
                 ),
             )
         elif batch_item.bucket == "failed":
-            emit_event(
+            buffer_event(
                 db,
                 CaseEvent(
                     case_id=batch_item.case_id,
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import json
 from datetime import UTC, datetime
+from typing import Any, Iterator
 
 from fastapi import HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from backend.app.config import BATCH_JOB_PARTITION_SIZE, STREAM_YIELD_PER
 from backend.app.events import CaseEvent, CaseEventType, emit_event
 from backend.app.models import Case
 from backend.app.models.batch_job import BatchJob
 from backend.app.models.batch_job_item import BatchJobItem
-from backend.app.services.automation_engine_service import execute_automation_run, get_automation_run_or_404
+from backend.app.services.automation_engine_service import (
+    execute_automation_run_item,
+    finalize_automation_run,
+    start_automation_run_for_cases,
+)
 from backend.app.services.automation_rule_service import get_automation_rule_or_404
 from backend.app.services.portfolio_query_service import resolve_case_ids_for_portfolio
 from backend.app.services.portfolio_view_service import get_portfolio_view_or_404
@@ -19,20 +27,65 @@ def _utcnow() -> datetime:
     return datetime.now(UTC).replace(tzinfo=None)
 
 
+# Статус AutomationRunItem -> bucket BatchJobItem.
+BATCH_BUCKET_BY_RUN_STATUS = {
+    "queued": "queued",
+    "done": "done",
+    "succeeded": "done",
+    "failed": "failed",
+    "blocked": "blocked",
+    "waiting": "waiting",
+    "not_applicable": "not_applicable",
+}
+
+_BATCH_COUNTER_BY_BUCKET = {
+    "queued": "queued_items",
+    "done": "success_items",
+    "failed": "failed_items",
+    "blocked": "blocked_items",
+    "waiting": "waiting_items",
+    "not_applicable": "not_applicable_items",
+}
+
+
+def _load(value: str | None) -> dict[str, Any]:
+    if not value:
+        return {}
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def _dump(value: dict[str, Any] | None) -> str | None:
+    if value is None:
+        return None
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
 def _serialize_batch_job(item: BatchJob) -> dict:
     return {
         "id": item.id,
         "tenant_id": item.tenant_id,
-        "job_type": item.job_type,
+        "rule_id": item.rule_id,
+        "rule_code": item.rule_code,
         "title": item.title,
-        "description": item.description,
+        "job_type": item.job_type,
+        "trigger_type": item.trigger_type,
         "status": item.status,
-        "rule_id": item.rule_id,
-        "selection_snapshot": item.selection_snapshot or {},
-        "execution_params": item.execution_params or {},
-        "summary": item.summary or {},
-        "result": item.result or {},
-        "error_message": item.error_message,
+        "total_items": item.total_items,
+        "queued_items": item.queued_items,
+        "success_items": item.success_items,
+        "failed_items": item.failed_items,
+        "blocked_items": item.blocked_items,
+        "waiting_items": item.waiting_items,
+        "not_applicable_items": item.not_applicable_items,
+        "requested_by": item.requested_by,
+        "correlation_id": item.correlation_id,
+        "selection": _load(item.selection_json),
+        "filters": _load(item.filters_json),
+        "result": _load(item.result_json),
         "started_at": item.started_at.isoformat() if item.started_at else None,
         "finished_at": item.finished_at.isoformat() if item.finished_at else None,
         "created_at": item.created_at.isoformat() if item.created_at else None,
@@ -47,17 +100,20 @@ def _serialize_batch_job_item(item: BatchJobItem) -> dict:
         "batch_job_id": item.batch_job_id,
         "case_id": item.case_id,
         "automation_run_id": item.automation_run_id,
-        "external_action_id": item.external_action_id,
+        "automation_run_item_id": item.automation_run_item_id,
         "status": item.status,
-        "bucket_code": item.bucket_code,
+        "bucket": item.bucket,
         "reason_code": item.reason_code,
         "reason_text": item.reason_text,
+        "action_code": item.action_code,
         "eligible_at": item.eligible_at.isoformat() if item.eligible_at else None,
-        "item_payload": item.item_payload or {},
-        "result": item.result or {},
-        "error_message": item.error_message,
-        "started_at": item.started_at.isoformat() if item.started_at else None,
-        "finished_at": item.finished_at.isoformat() if item.finished_at else None,
+        "execution_started_at": (
+            item.execution_started_at.isoformat() if item.execution_started_at else None
+        ),
+        "execution_finished_at": (
+            item.execution_finished_at.isoformat() if item.execution_finished_at else None
+        ),
+        "result": _load(item.result_json),
         "created_at": item.created_at.isoformat() if item.created_at else None,
         "updated_at": item.updated_at.isoformat() if item.updated_at else None,
     }
@@ -82,6 +138,16 @@ def get_batch_job_or_404(
     return item
 
 
+def get_batch_job(
+    db: Session,
+    *,
+    batch_job_id: int,
+    tenant_id: int,
+) -> dict:
+    job = get_batch_job_or_404(db, batch_job_id=batch_job_id, tenant_id=tenant_id)
+    return {"job": _serialize_batch_job(job)}
+
+
 def list_batch_jobs(
     db: Session,
     *,
@@ -104,16 +170,21 @@ def list_batch_jobs(
     return {"items": [_serialize_batch_job(item) for item in items]}
 
 
-def list_batch_job_items(
+def _validate_batch_item_filters(*, status: str | None, bucket_code: str | None) -> None:
+    if status and status not in BATCH_BUCKET_BY_RUN_STATUS:
+        raise HTTPException(status_code=422, detail=f"Unknown batch item status: {status}")
+    if bucket_code and bucket_code not in _BATCH_COUNTER_BY_BUCKET:
+        raise HTTPException(status_code=422, detail=f"Unknown batch item bucket: {bucket_code}")
+
+
+def _batch_job_items_query(
     db: Session,
     *,
     batch_job_id: int,
     tenant_id: int,
     status: str | None = None,
     bucket_code: str | None = None,
-) -> dict:
-    _ = get_batch_job_or_404(db, batch_job_id=batch_job_id, tenant_id=tenant_id)
-
+):
     query = (
         db.query(BatchJobItem)
         .filter(
@@ -126,29 +197,89 @@ def list_batch_job_items(
     if status:
         query = query.filter(BatchJobItem.status == status)
     if bucket_code:
-        query = query.filter(BatchJobItem.bucket_code == bucket_code)
+        query = query.filter(BatchJobItem.bucket == bucket_code)
 
-    items = query.all()
+    return query
+
+
+def list_batch_job_items(
+    db: Session,
+    *,
+    batch_job_id: int,
+    tenant_id: int,
+    status: str | None = None,
+    bucket_code: str | None = None,
+) -> dict:
+    _ = get_batch_job_or_404(db, batch_job_id=batch_job_id, tenant_id=tenant_id)
+    _validate_batch_item_filters(status=status, bucket_code=bucket_code)
+
+    items = _batch_job_items_query(
+        db,
+        batch_job_id=batch_job_id,
+        tenant_id=tenant_id,
+        status=status,
+        bucket_code=bucket_code,
+    ).all()
     return {"items": [_serialize_batch_job_item(item) for item in items]}
 
 
-def _calc_batch_summary(items: list[BatchJobItem]) -> dict:
-    counts_by_status: dict[str, int] = {}
-    counts_by_bucket: dict[str, int] = {}
-    next_eligible_at = None
+def prepare_batch_job_items_stream(
+    db: Session,
+    *,
+    batch_job_id: int,
+    tenant_id: int,
+    status: str | None = None,
+    bucket_code: str | None = None,
+) -> dict:
+    # Проверки до начала потока: после заголовка 404/422 уже не вернуть.
+    job = get_batch_job_or_404(db, batch_job_id=batch_job_id, tenant_id=tenant_id)
+    _validate_batch_item_filters(status=status, bucket_code=bucket_code)
+    return {"batch_job_id": job.id, "status": status, "bucket_code": bucket_code}
 
-    for item in items:
-        counts_by_status[item.status] = counts_by_status.get(item.status, 0) + 1
-        bucket = item.bucket_code or "unknown"
-        counts_by_bucket[bucket] = counts_by_bucket.get(bucket, 0) + 1
 
-        if item.eligible_at:
-            if next_eligible_at is None or item.eligible_at < next_eligible_at:
-                next_eligible_at = item.eligible_at
+def iter_batch_job_items(
+    db: Session,
+    *,
+    batch_job_id: int,
+    tenant_id: int,
+    status: str | None = None,
+    bucket_code: str | None = None,
+) -> Iterator[dict]:
+    query = _batch_job_items_query(
+        db,
+        batch_job_id=batch_job_id,
+        tenant_id=tenant_id,
+        status=status,
+        bucket_code=bucket_code,
+    )
+    for item in query.yield_per(STREAM_YIELD_PER):
+        yield _serialize_batch_job_item(item)
+
+
+def _calc_batch_summary(db: Session, *, batch_job_id: int, tenant_id: int) -> dict:
+    rows = (
+        db.query(
+            BatchJobItem.bucket,
+            func.count(BatchJobItem.id),
+            func.min(BatchJobItem.eligible_at),
+        )
+        .filter(
+            BatchJobItem.batch_job_id == batch_job_id,
+            BatchJobItem.tenant_id == tenant_id,
+        )
+        .group_by(BatchJobItem.bucket)
+        .all()
+    )
+
+    counts_by_bucket: dict[str, int] = {}
+    next_eligible_at = None
+    for bucket, count, eligible_at in rows:
+        counts_by_bucket[bucket or "unknown"] = int(count)
+        if eligible_at and (next_eligible_at is None or eligible_at < next_eligible_at):
+            next_eligible_at = eligible_at
 
     return {
-        "total_items": len(items),
-        "counts_by_status": counts_by_status,
+        "total_items": sum(counts_by_bucket.values()),
         "counts_by_bucket": counts_by_bucket,
         "next_eligible_at": next_eligible_at.isoformat() if next_eligible_at else None,
     }
@@ -162,26 +293,24 @@ def rebuild_batch_job_summary(
 ) -> dict:
     job = get_batch_job_or_404(db, batch_job_id=batch_job_id, tenant_id=tenant_id)
 
-    items = (
-        db.query(BatchJobItem)
-        .filter(
-            BatchJobItem.batch_job_id == batch_job_id,
-            BatchJobItem.tenant_id == tenant_id,
-        )
-        .order_by(BatchJobItem.id.asc())
-        .all()
-    )
+    summary = _calc_batch_summary(db, batch_job_id=batch_job_id, tenant_id=tenant_id)
+    counts = summary["counts_by_bucket"]
 
-    summary = _calc_batch_summary(items)
-    job.summary = summary
+    job.total_items = summary["total_items"]
+    for bucket, column in _BATCH_COUNTER_BY_BUCKET.items():
+        setattr(job, column, counts.get(bucket, 0))
+    job.result_json = _dump({**_load(job.result_json), "summary": summary})
     job.updated_at = _utcnow()
 
-    statuses = {item.status for item in items}
-    if "running" in statuses:
+    buckets = set(counts)
+    if "running" in buckets or ("queued" in buckets and job.started_at):
         job.status = "running"
-    elif "failed" in statuses and len(statuses) == 1:
+    elif "queued" in buckets:
+        # Пока _prepare_batch_job не запустил задачу, она остаётся в очереди.
+        job.status = "queued"
+    elif buckets == {"failed"}:
         job.status = "failed"
-    elif statuses and statuses.issubset({"succeeded", "failed", "blocked", "waiting", "skipped"}):
+    elif buckets and buckets.issubset({"done", "failed", "blocked", "waiting", "not_applicable"}):
         job.status = "completed"
 
     db.add(job)
@@ -227,23 +356,27 @@ def create_batch_job(
         tenant_id=tenant_id,
         job_type=payload["job_type"],
         title=str(payload["title"]).strip(),
-        description=payload.get("description"),
         status="queued",
         rule_id=rule.id,
-        selection_snapshot={
-            "case_ids": case_ids,
-            "total_cases": len(case_ids),
-            "rule": {
-                "id": rule.id,
-                "name": rule.name,
-                "action_code": rule.action_code,
-                "execution_mode": rule.execution_mode,
-            },
-        },
-        execution_params=dict(payload.get("execution_params") or {}),
-        summary={},
-        result={},
-        error_message=None,
+        rule_code=rule.code,
+        trigger_type="manual",
+        requested_by=payload.get("requested_by"),
+        correlation_id=f"batch-{rule.code}-{int(now.timestamp())}",
+        selection_json=_dump(
+            {
+                "case_ids": case_ids,
+                "total_cases": len(case_ids),
+                "description": payload.get("description"),
+                "rule": {
+                    "id": rule.id,
+                    "code": rule.code,
+                    "title": rule.title,
+                    "action_code": rule.action_code,
+                },
+            }
+        ),
+        filters_json=_dump(dict(payload.get("execution_params") or {})),
+        result_json=_dump({}),
         started_at=None,
         finished_at=None,
         created_at=now,
@@ -253,32 +386,21 @@ def create_batch_job(
     db.flush()
     db.refresh(job)
 
+    # AutomationRun по делу создаётся при выполнении item, см. _execute_batch_item.
     for case in cases:
         item = BatchJobItem(
             tenant_id=tenant_id,
             batch_job_id=job.id,
             case_id=case.id,
             automation_run_id=None,
-            external_action_id=None,
-            status="pending",
-            bucket_code="pending",
+            automation_run_item_id=None,
+            status="queued",
+            bucket="queued",
             reason_code=None,
             reason_text=None,
+            action_code=rule.action_code,
             eligible_at=None,
-            item_payload={
-                "case_snapshot": {
-                    "id": case.id,
-                    "status": getattr(case.status, "value", str(case.status)),
-                    "contract_type": getattr(case.contract_type, "value", str(case.contract_type)),
-                    "debtor_type": getattr(case.debtor_type, "value", str(case.debtor_type)),
-                    "principal_amount": str(case.principal_amount),
-                    "due_date": case.due_date.isoformat() if case.due_date else None,
-                }
-            },
-            result={},
-            error_message=None,
-            started_at=None,
-            finished_at=None,
+            result_json=_dump({}),
             created_at=now,
             updated_at=now,
         )
@@ -286,6 +408,8 @@ def create_batch_job(
 
     db.flush()
 
+    rebuild_batch_job_summary(db, batch_job_id=job.id, tenant_id=tenant_id)
+
     items = (
         db.query(BatchJobItem)
         .filter(
@@ -295,10 +419,6 @@ def create_batch_job(
         .order_by(BatchJobItem.id.asc())
         .all()
     )
-    job.summary = _calc_batch_summary(items)
-    db.add(job)
-    db.flush()
-    db.refresh(job)
 
     return {
         "ok": True,
@@ -307,192 +427,372 @@ def create_batch_job(
     }
 
 
-def execute_batch_job(
+def _apply_batch_counter_deltas(db: Session, job: BatchJob, transitions: list[tuple[str, str]]) -> None:
+    deltas: dict[str, int] = {}
+    for old_bucket, new_bucket in transitions:
+        if old_bucket == new_bucket:
+            continue
+        old_column = _BATCH_COUNTER_BY_BUCKET.get(old_bucket)
+        new_column = _BATCH_COUNTER_BY_BUCKET.get(new_bucket)
+        if old_column:
+            deltas[old_column] = deltas.get(old_column, 0) - 1
+        if new_column:
+            deltas[new_column] = deltas.get(new_column, 0) + 1
+
+    values: dict[Any, Any] = {
+        getattr(BatchJob, column): getattr(BatchJob, column) + delta
+        for column, delta in deltas.items()
+        if delta
+    }
+    if not values:
+        return
+
+    # Партиции завершаются параллельно, поэтому счётчики двигаются атомарным UPDATE.
+    (
+        db.query(BatchJob)
+        .filter(BatchJob.id == job.id)
+        .update(values, synchronize_session=False)
+    )
+
+
+def _lock_case(db: Session, *, case_id: int, tenant_id: int) -> Case | None:
+    # Блокировка строки дела: два воркера не выполняют действия по одному делу одновременно.
+    # В SQLite FOR UPDATE игнорируется, запись там и так сериализована.
+    return (
+        db.query(Case)
+        .filter(
+            Case.id == case_id,
+            Case.tenant_id == tenant_id,
+        )
+        .with_for_update()
+        .first()
+    )
+
+
+def _execute_batch_item(
     db: Session,
     *,
-    batch_job_id: int,
+    job: BatchJob,
+    item: BatchJobItem,
     tenant_id: int,
-    force: bool = False,
-) -> dict:
-    from backend.app.services.automation_engine_service import evaluate_case_automation_rules
-
-    job = get_batch_job_or_404(db, batch_job_id=batch_job_id, tenant_id=tenant_id)
-    rule = get_automation_rule_or_404(db, rule_id=int(job.rule_id), tenant_id=tenant_id)
+    force: bool,
+) -> None:
+    item.execution_started_at = item.execution_started_at or _utcnow()
+    item.updated_at = _utcnow()
+
+    savepoint = db.begin_nested()
+    try:
+        if not _lock_case(db, case_id=item.case_id, tenant_id=tenant_id):
+            raise HTTPException(status_code=404, detail="Case not found")
+
+        if not item.automation_run_item_id:
+            run_detail = start_automation_run_for_cases(
+                db,
+                rule_id=int(job.rule_id),
+                case_ids=[item.case_id],
+                tenant_id=tenant_id,
+                requested_by=job.requested_by,
+            )
+            item.automation_run_id = run_detail["run"]["id"]
+            item.automation_run_item_id = run_detail["items"][0]["id"]
 
-    if job.status not in {"queued", "running", "completed"} and not force:
+        run_item = execute_automation_run_item(
+            db,
+            run_item_id=int(item.automation_run_item_id),
+            tenant_id=tenant_id,
+            force=force,
+        )
+        # Run на одно дело закрываем сразу, а не перебором всех run в конце batch job.
+        finalize_automation_run(db, run_id=int(run_item.run_id), tenant_id=tenant_id)
+        savepoint.commit()
+    except Exception as exc:
+        savepoint.rollback()
+        item.status = "failed"
+        item.bucket = "failed"
+        item.reason_code = "execution_error"
+        item.reason_text = str(exc)[:1000]
+        item.result_json = _dump({"ok": False, "error": f"{type(exc).__name__}: {exc}"})
+        item.execution_finished_at = _utcnow()
+        item.updated_at = _utcnow()
+        db.add(item)
+        return
+
+    item.status = run_item.status
+    item.bucket = BATCH_BUCKET_BY_RUN_STATUS.get(run_item.status, "failed")
+    item.reason_code = run_item.reason_code
+    item.reason_text = run_item.reason_text
+    item.action_code = run_item.action_code
+    item.eligible_at = run_item.eligible_at
+    item.result_json = run_item.result_json
+    item.execution_finished_at = _utcnow()
+    item.updated_at = _utcnow()
+    db.add(item)
+
+
+def _prepare_batch_job(db: Session, *, job: BatchJob, tenant_id: int, force: bool) -> None:
+    if job.status not in {"queued", "running", "completed", "finished"} and not force:
         raise HTTPException(
             status_code=409,
             detail=f"Cannot execute batch job in status={job.status}",
         )
 
+    if force:
+        # Повторный прогон: все items снова в очереди, обработчики берут только queued.
+        (
+            db.query(BatchJobItem)
+            .filter(
+                BatchJobItem.batch_job_id == job.id,
+                BatchJobItem.tenant_id == tenant_id,
+            )
+            .update(
+                {BatchJobItem.status: "queued", BatchJobItem.bucket: "queued"},
+                synchronize_session=False,
+            )
+        )
+
+    rebuild_batch_job_summary(db, batch_job_id=job.id, tenant_id=tenant_id)
+
     now = _utcnow()
     job.status = "running"
     job.started_at = job.started_at or now
+    job.finished_at = None
     job.updated_at = now
-    job.error_message = None
+    result = _load(job.result_json)
+    result["force"] = force
+    job.result_json = _dump(result)
     db.add(job)
     db.flush()
 
-    items = (
-        db.query(BatchJobItem)
-        .filter(
-            BatchJobItem.batch_job_id == batch_job_id,
-            BatchJobItem.tenant_id == tenant_id,
-        )
-        .order_by(BatchJobItem.id.asc())
-        .all()
-    )
 
+def _execute_batch_items(
+    db: Session,
+    *,
+    job: BatchJob,
+    items: list[BatchJobItem],
+    tenant_id: int,
+    force: bool,
+    commit_each: bool,
+) -> int:
+    processed = 0
     for item in items:
-        item.started_at = item.started_at or _utcnow()
-        item.updated_at = _utcnow()
-        item.status = "running"
-        item.bucket_code = "running"
-        db.add(item)
-        db.flush()
-
-        try:
-            evaluation_result = evaluate_case_automation_rules(
-                db,
-                tenant_id=tenant_id,
-                case_id=item.case_id,
-                execute=False,
-            )
-
-            matched_run = None
-            for run in reversed(evaluation_result.get("runs") or []):
-                if run.get("rule_id") == rule.id or run.get("evaluation_payload", {}).get("rule", {}).get("id") == rule.id:
-                    matched_run = run
-                    break
-
-            if not matched_run:
-                item.status = "skipped"
-                item.bucket_code = "skipped"
-                item.reason_code = "rule_run_not_created"
-                item.reason_text = "Automation run for rule was not created"
-                item.result = {"evaluation": evaluation_result}
-                item.finished_at = _utcnow()
-                item.updated_at = _utcnow()
-                db.add(item)
-                db.flush()
-                continue
-
-            run_id = matched_run.get("id")
-            item.automation_run_id = run_id
-            item.result = {"evaluation": evaluation_result}
-
-            run_row = get_automation_run_or_404(
-                db,
-                run_id=run_id,
-                tenant_id=tenant_id,
-            )
-
-            if run_row.status == "waiting":
-                item.status = "waiting"
-                item.bucket_code = "waiting"
-                item.reason_code = run_row.eligibility_code
-                item.reason_text = run_row.eligibility_reason
-                item.eligible_at = run_row.eligible_at
-                item.finished_at = _utcnow()
-                item.updated_at = _utcnow()
-                db.add(item)
-                db.flush()
-                continue
-
-            if run_row.status == "blocked":
-                item.status = "blocked"
-                item.bucket_code = "blocked"
-                item.reason_code = run_row.eligibility_code
-                item.reason_text = run_row.eligibility_reason
-                item.finished_at = _utcnow()
-                item.updated_at = _utcnow()
-                db.add(item)
-                db.flush()
-                continue
-
-            execute_result = execute_automation_run(
-                db,
-                run_id=run_row.id,
-                tenant_id=tenant_id,
-                force=force,
-            )
-
-            final_run = execute_result["run"]
-            item.automation_run_id = final_run.get("id")
-            item.external_action_id = final_run.get("external_action_id")
-
-            if final_run.get("status") == "succeeded":
-                item.status = "succeeded"
-                item.bucket_code = "succeeded"
-            elif final_run.get("status") == "waiting":
-                item.status = "waiting"
-                item.bucket_code = "waiting"
-            elif final_run.get("status") == "blocked":
-                item.status = "blocked"
-                item.bucket_code = "blocked"
-            else:
-                item.status = "failed"
-                item.bucket_code = "failed"
-
-            item.reason_code = final_run.get("eligibility_code")
-            item.reason_text = final_run.get("eligibility_reason")
-            item.result = {
-                **(item.result or {}),
-                "execution": execute_result,
-            }
-            item.finished_at = _utcnow()
-            item.updated_at = _utcnow()
-            db.add(item)
+        if item.bucket != "queued":
+            continue
+
+        old_bucket = item.bucket
+        _execute_batch_item(db, job=job, item=item, tenant_id=tenant_id, force=force)
+        _apply_batch_counter_deltas(db, job, [(old_bucket, item.bucket)])
+        processed += 1
+
+        if commit_each:
+            # Commit освобождает блокировку дела и фиксирует прогресс до ретрая.
+            db.commit()
+        else:
             db.flush()
 
-        except Exception as exc:
-            item.status = "failed"
-            item.bucket_code = "failed"
-            item.error_message = str(exc)
-            item.reason_code = "execution_error"
-            item.reason_text = str(exc)
-            item.finished_at = _utcnow()
-            item.updated_at = _utcnow()
-            db.add(item)
-            db.flush()
+    return processed
 
-    items = (
-        db.query(BatchJobItem)
+
+def _claim_batch_job_finish(db: Session, *, job: BatchJob) -> bool:
+    # Условный UPDATE: итог сводит только партиция, которая перевела задачу из running.
+    claimed = (
+        db.query(BatchJob)
         .filter(
-            BatchJobItem.batch_job_id == batch_job_id,
-            BatchJobItem.tenant_id == tenant_id,
+            BatchJob.id == job.id,
+            BatchJob.status == "running",
+            BatchJob.queued_items <= 0,
         )
-        .order_by(BatchJobItem.id.asc())
-        .all()
+        .update({BatchJob.status: "completed"}, synchronize_session=False)
     )
+    if not claimed:
+        return False
+
+    db.refresh(job)
+    return True
 
-    summary = _calc_batch_summary(items)
-    job.summary = summary
-    job.result = {"last_execution_at": _utcnow().isoformat()}
-    job.status = "completed"
+
+def _finish_batch_job(db: Session, *, job: BatchJob, tenant_id: int) -> None:
+    rebuild_batch_job_summary(db, batch_job_id=job.id, tenant_id=tenant_id)
+
+    job.result_json = _dump(
+        {
+            **_load(job.result_json),
+            "last_execution_at": _utcnow().isoformat(),
+        }
+    )
     job.finished_at = _utcnow()
     job.updated_at = _utcnow()
     db.add(job)
     db.flush()
-    db.refresh(job)
 
-    first_case_id = items[0].case_id if items else None
-    if first_case_id:
+    first_item = (
+        db.query(BatchJobItem)
+        .filter(
+            BatchJobItem.batch_job_id == job.id,
+            BatchJobItem.tenant_id == tenant_id,
+        )
+        .order_by(BatchJobItem.id.asc())
+        .first()
+    )
+    if first_item:
         emit_event(
             db,
             CaseEvent(
-                case_id=first_case_id,
+                case_id=first_item.case_id,
                 type=CaseEventType.CASE_UPDATED,
                 title=f"Batch job выполнен: {job.title}",
                 details=f"Batch job #{job.id} finished with status={job.status}",
                 payload={
                     "batch_job_id": job.id,
                     "job_type": job.job_type,
-                    "summary": job.summary,
+                    "summary": _load(job.result_json).get("summary") or {},
                 },
             ),
         )
 
+
+def _queued_item_ids(db: Session, *, batch_job_id: int, tenant_id: int) -> list[int]:
+    return [
+        row[0]
+        for row in db.query(BatchJobItem.id)
+        .filter(
+            BatchJobItem.batch_job_id == batch_job_id,
+            BatchJobItem.tenant_id == tenant_id,
+            BatchJobItem.bucket == "queued",
+        )
+        .order_by(BatchJobItem.case_id.asc(), BatchJobItem.id.asc())
+        .all()
+    ]
+
+
+def dispatch_batch_job(
+    db: Session,
+    *,
+    batch_job_id: int,
+    tenant_id: int,
+    force: bool = False,
+    partition_size: int | None = None,
+) -> dict:
+    from backend.app.services.job_queue_service import enqueue_job
+
+    job = get_batch_job_or_404(db, batch_job_id=batch_job_id, tenant_id=tenant_id)
+    _prepare_batch_job(db, job=job, tenant_id=tenant_id, force=force)
+
+    partition_size = max(int(partition_size or BATCH_JOB_PARTITION_SIZE), 1)
+    item_ids = _queued_item_ids(db, batch_job_id=job.id, tenant_id=tenant_id)
+
+    # У batch job одно дело на item, поэтому партиции по item_id не пересекаются по делам.
+    queue_job_ids: list[int] = []
+    for offset in range(0, len(item_ids), partition_size):
+        queue_job = enqueue_job(
+            db,
+            tenant_id=tenant_id,
+            job_type="batch_job_partition_execute",
+            payload={
+                "batch_job_id": job.id,
+                "item_ids": item_ids[offset:offset + partition_size],
+                "force": force,
+            },
+        )
+        queue_job_ids.append(queue_job.id)
+
+    if not queue_job_ids:
+        _finish_batch_job(db, job=job, tenant_id=tenant_id)
+
+    db.refresh(job)
+
+    return {
+        "ok": True,
+        "job": _serialize_batch_job(job),
+        "partitions": len(queue_job_ids),
+        "queue_job_ids": queue_job_ids,
+    }
+
+
+def execute_batch_job_partition(
+    db: Session,
+    *,
+    batch_job_id: int,
+    tenant_id: int,
+    item_ids: list[int],
+    force: bool = False,
+) -> dict:
+    job = get_batch_job_or_404(db, batch_job_id=batch_job_id, tenant_id=tenant_id)
+
+    items = (
+        db.query(BatchJobItem)
+        .filter(
+            BatchJobItem.batch_job_id == job.id,
+            BatchJobItem.tenant_id == tenant_id,
+            BatchJobItem.id.in_(item_ids),
+        )
+        .order_by(BatchJobItem.id.asc())
+        .all()
+    )
+
+    processed = _execute_batch_items(
+        db,
+        job=job,
+        items=items,
+        tenant_id=tenant_id,
+        force=force,
+        commit_each=True,
+    )
+
+    # Последняя завершившаяся партиция сводит итог ровно один раз.
+    finished = _claim_batch_job_finish(db, job=job)
+    if finished:
+        _finish_batch_job(db, job=job, tenant_id=tenant_id)
+
+    return {
+        "ok": True,
+        "batch_job_id": job.id,
+        "processed_items": processed,
+        "batch_finished": finished,
+    }
+
+
+def execute_batch_job(
+    db: Session,
+    *,
+    batch_job_id: int,
+    tenant_id: int,
+    force: bool = False,
+    chunk_size: int | None = None,
+) -> dict:
+    job = get_batch_job_or_404(db, batch_job_id=batch_job_id, tenant_id=tenant_id)
+    _prepare_batch_job(db, job=job, tenant_id=tenant_id, force=force)
+
+    chunk_size = max(int(chunk_size or BATCH_JOB_PARTITION_SIZE), 1)
+    item_ids = _queued_item_ids(db, batch_job_id=job.id, tenant_id=tenant_id)
+
+    for offset in range(0, len(item_ids), chunk_size):
+        items = (
+            db.query(BatchJobItem)
+            .filter(BatchJobItem.id.in_(item_ids[offset:offset + chunk_size]))
+            .order_by(BatchJobItem.id.asc())
+            .all()
+        )
+        _execute_batch_items(
+            db,
+            job=job,
+            items=items,
+            tenant_id=tenant_id,
+            force=force,
+            commit_each=False,
+        )
+
+    _finish_batch_job(db, job=job, tenant_id=tenant_id)
+
+    items = (
+        db.query(BatchJobItem)
+        .filter(
+            BatchJobItem.batch_job_id == batch_job_id,
+            BatchJobItem.tenant_id == tenant_id,
+        )
+        .order_by(BatchJobItem.id.asc())
+        .all()
+    )
+
     return {
         "ok": True,
         "job": _serialize_batch_job(job),
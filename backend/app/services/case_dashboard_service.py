@@ -10,8 +10,9 @@ from backend.app.models.debtor_profile import DebtorProfile
 from backend.app.services.action_service import get_available_actions
 from backend.app.services.case_service import (
     debtor_widget,
-    get_projection_data_or_rebuild,
+    get_projection_data,
 )
+from backend.app.services.debtor_identity_service import find_related_cases
 from backend.app.services.debtor_intelligence_service import (
     build_debtor_intelligence_payload,
     build_organization_starter_kit_payload,
@@ -97,23 +98,15 @@ def _build_policy_timing(case: Case) -> dict[str, Any]:
 def _related_cases(db: Session, case: Case) -> dict[str, Any]:
     inn, ogrn, debtor_name = _extract_case_identity(case)
 
-    query = db.query(Case).filter(Case.tenant_id == case.tenant_id)
-    items: list[dict[str, Any]] = []
-
-    for item in query.order_by(Case.id.desc()).all():
-        item_inn, item_ogrn, item_name = _extract_case_identity(item)
-
-        same = False
-        if inn and item_inn and inn == item_inn:
-            same = True
-        elif ogrn and item_ogrn and ogrn == item_ogrn:
-            same = True
-        elif debtor_name and item_name and debtor_name == item_name:
-            same = True
+    debtor_profile = (
+        db.query(DebtorProfile)
+        .filter(DebtorProfile.case_id == case.id)
+        .first()
+    )
 
-        if not same:
-            continue
+    items: list[dict[str, Any]] = []
 
+    for item in find_related_cases(db, case, debtor_profile):
         status_code = getattr(item.status, "value", item.status)
         contract_type_code = getattr(item.contract_type, "value", item.contract_type)
 
@@ -131,12 +124,6 @@ def _related_cases(db: Session, case: Case) -> dict[str, Any]:
             }
         )
 
-    debtor_profile = (
-        db.query(DebtorProfile)
-        .filter(DebtorProfile.case_id == case.id)
-        .first()
-    )
-
     total_amount = "0.00"
     try:
         total = sum(float(x["principal_amount"]) for x in items)
@@ -254,7 +241,7 @@ def build_case_dashboard(db: Session, case_id: int) -> dict[str, Any]:
     if not case:
         return {}
 
-    projection = get_projection_data_or_rebuild(db, case_id)
+    projection = get_projection_data(db, case_id)
     raw_actions = get_available_actions(db, case_id)
     raw_documents = get_available_documents(db, case_id)
 
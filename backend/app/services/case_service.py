@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Iterable
 
 from fastapi import HTTPException
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
+from backend.app.config import PROJECTION_SWEEP_BATCH_SIZE
 from backend.app.events import CaseEvent, CaseEventType, emit_event
 from backend.app.models import Case, CaseProjection, DebtorProfile
-from backend.app.services.action_service import get_available_actions
-from backend.app.services.document_stage_service import get_available_documents
+from backend.app.services.action_service import get_available_actions_for_case
+from backend.app.services.control_room_summary_service import refresh_case_summary
+from backend.app.services.debtor_identity_service import refresh_debtor_identity
+from backend.app.services.document_stage_service import get_available_documents_for_case
 from backend.app.services.tenant_query_service import load_case_for_tenant_or_404
 
 
@@ -58,8 +62,33 @@ def _case_status_from_stage(stage_status: str) -> str:
     return "overdue"
 
 
-def debtor_widget(db: Session, case_id: int) -> dict[str, Any]:
-    profile = db.query(DebtorProfile).filter(DebtorProfile.case_id == case_id).first()
+# Секции CaseProjection.data и их версии. Версию секции повышают, когда меняется
+# её сборка: такие проекции считаются устаревшими и пересобираются по частям.
+PROJECTION_SECTION_VERSIONS: dict[str, int] = {
+    "case": 1,
+    "contract_data": 1,
+    "stage": 1,
+    "documents": 1,
+    "status": 1,
+    "debtor_widget": 1,
+}
+
+PROJECTION_VERSION = ",".join(
+    f"{section}:{version}" for section, version in PROJECTION_SECTION_VERSIONS.items()
+)
+
+# Что изменилось -> какие секции пересобрать.
+PROJECTION_CHANGE_SECTIONS: dict[str, tuple[str, ...]] = {
+    "case": tuple(PROJECTION_SECTION_VERSIONS),
+    "action": ("case", "contract_data", "stage", "status"),
+    "contract_data": ("contract_data", "documents", "debtor_widget"),
+    "debtor_profile": ("debtor_widget",),
+}
+
+_NOT_LOADED = object()
+
+
+def _debtor_widget_for_case(case: Case | None, profile: DebtorProfile | None) -> dict[str, Any]:
     if profile:
         return {
             "name": profile.name,
@@ -70,7 +99,6 @@ def debtor_widget(db: Session, case_id: int) -> dict[str, Any]:
             "source": profile.source,
         }
 
-    case = db.query(Case).filter(Case.id == case_id).first()
     debtor = dict((case.contract_data or {}).get("debtor") or {}) if case else {}
     return {
         "name": debtor.get("name") or (case.debtor_name if case else None),
@@ -82,73 +110,250 @@ def debtor_widget(db: Session, case_id: int) -> dict[str, Any]:
     }
 
 
-def _build_projection_payload(db: Session, case: Case) -> dict[str, Any]:
-    stage_status = _derive_stage_status(case)
-    documents = get_available_documents(db, case.id)
-    actions = get_available_actions(db, case.id)
+def debtor_widget(db: Session, case_id: int) -> dict[str, Any]:
+    profile = db.query(DebtorProfile).filter(DebtorProfile.case_id == case_id).first()
+    if profile:
+        return _debtor_widget_for_case(None, profile)
+
+    case = db.query(Case).filter(Case.id == case_id).first()
+    return _debtor_widget_for_case(case, None)
 
+
+def _case_section(case: Case, profile: DebtorProfile | None) -> dict[str, Any]:
     return {
-        "case": {
-            "id": case.id,
-            "tenant_id": case.tenant_id,
-            "debtor_name": case.debtor_name,
-            "debtor_type": _status_value(case.debtor_type),
-            "contract_type": _status_value(case.contract_type),
-            "principal_amount": str(case.principal_amount),
-            "due_date": case.due_date.isoformat() if case.due_date else None,
-            "status": _status_value(case.status),
-            "is_archived": bool(getattr(case, "is_archived", False)),
-        },
-        "contract_data": case.contract_data or {},
-        "stage": {
-            "status": stage_status,
-            "flags": _stage_flags(case),
-            "actions": actions,
-        },
-        "documents": documents,
-        "status": {
-            "code": _status_value(case.status),
-            "title": _status_value(case.status),
-        },
-        "debtor_widget": debtor_widget(db, case.id),
+        "id": case.id,
+        "tenant_id": case.tenant_id,
+        "debtor_name": case.debtor_name,
+        "debtor_type": _status_value(case.debtor_type),
+        "contract_type": _status_value(case.contract_type),
+        "principal_amount": str(case.principal_amount),
+        "due_date": case.due_date.isoformat() if case.due_date else None,
+        "status": _status_value(case.status),
+        "is_archived": bool(getattr(case, "is_archived", False)),
     }
 
 
-def sync_and_persist_case(db: Session, case: Case) -> dict[str, Any]:
-    payload = _build_projection_payload(db, case)
-    now = datetime.utcnow()
+def _contract_data_section(case: Case, profile: DebtorProfile | None) -> dict[str, Any]:
+    return case.contract_data or {}
 
-    projection = (
-        db.query(CaseProjection)
-        .filter(CaseProjection.case_id == case.id)
-        .first()
-    )
-    if not projection:
-        projection = CaseProjection(
-            case_id=case.id,
-            data=payload,
-            updated_at=now,
+
+def _stage_section(case: Case, profile: DebtorProfile | None) -> dict[str, Any]:
+    return {
+        "status": _derive_stage_status(case),
+        "flags": _stage_flags(case),
+        "actions": get_available_actions_for_case(case),
+    }
+
+
+def _documents_section(case: Case, profile: DebtorProfile | None) -> list[dict[str, Any]]:
+    return get_available_documents_for_case(case)
+
+
+def _status_section(case: Case, profile: DebtorProfile | None) -> dict[str, Any]:
+    return {
+        "code": _status_value(case.status),
+        "title": _status_value(case.status),
+    }
+
+
+_PROJECTION_SECTION_BUILDERS: dict[str, Callable[[Case, DebtorProfile | None], Any]] = {
+    "case": _case_section,
+    "contract_data": _contract_data_section,
+    "stage": _stage_section,
+    "documents": _documents_section,
+    "status": _status_section,
+    "debtor_widget": _debtor_widget_for_case,
+}
+
+
+def projection_sections_for_changes(changes: Iterable[str]) -> set[str]:
+    sections: set[str] = set()
+    for change in changes:
+        normalized = (change or "").strip().lower()
+        if normalized not in PROJECTION_CHANGE_SECTIONS:
+            raise ValueError(f"Unknown projection change: {change}")
+        sections.update(PROJECTION_CHANGE_SECTIONS[normalized])
+    return sections
+
+
+def stale_projection_sections(projection: CaseProjection | None) -> set[str]:
+    if projection is None or not projection.data:
+        return set(PROJECTION_SECTION_VERSIONS)
+
+    versions = dict(projection.section_versions or {})
+    return {
+        section
+        for section, version in PROJECTION_SECTION_VERSIONS.items()
+        if versions.get(section) != version or section not in projection.data
+    }
+
+
+def _load_profile(db: Session, case_id: int) -> DebtorProfile | None:
+    return db.query(DebtorProfile).filter(DebtorProfile.case_id == case_id).first()
+
+
+def _refresh_projection(
+    db: Session,
+    case: Case,
+    *,
+    sections: set[str],
+    projection: CaseProjection | None | object = _NOT_LOADED,
+    profile: DebtorProfile | None | object = _NOT_LOADED,
+) -> dict[str, Any]:
+    if projection is _NOT_LOADED:
+        projection = (
+            db.query(CaseProjection)
+            .filter(CaseProjection.case_id == case.id)
+            .first()
         )
-        db.add(projection)
-    else:
-        projection.data = payload
-        projection.updated_at = now
-        db.add(projection)
 
+    # Устаревшие по версии секции пересобираются заодно с изменёнными.
+    sections = set(sections) | stale_projection_sections(projection)
+    if projection is not None and not sections:
+        return projection.data
+
+    if "debtor_widget" in sections and profile is _NOT_LOADED:
+        profile = _load_profile(db, case.id)
+
+    current = dict(projection.data or {}) if projection is not None else {}
+    versions = dict(projection.section_versions or {}) if projection is not None else {}
+
+    for section in sections:
+        current[section] = _PROJECTION_SECTION_BUILDERS[section](case, profile)
+        versions[section] = PROJECTION_SECTION_VERSIONS[section]
+
+    payload = {section: current[section] for section in PROJECTION_SECTION_VERSIONS}
+    now = datetime.utcnow()
+
+    if projection is None:
+        projection = CaseProjection(case_id=case.id)
+
+    projection.tenant_id = case.tenant_id
+    projection.data = payload
+    projection.section_versions = versions
+    projection.projection_version = PROJECTION_VERSION
+    projection.updated_at = now
+    db.add(projection)
     db.flush()
     return payload
 
 
-def get_projection_data_or_rebuild(db: Session, case_id: int) -> dict[str, Any]:
+def sync_and_persist_case(
+    db: Session,
+    case: Case,
+    *,
+    changes: Iterable[str] | None = None,
+) -> dict[str, Any]:
+    # changes=None — полная пересборка; иначе только секции, затронутые изменениями.
+    db.flush()
+    sections = (
+        set(PROJECTION_SECTION_VERSIONS)
+        if changes is None
+        else projection_sections_for_changes(changes)
+    )
+
+    profile = _load_profile(db, case.id)
+    if "debtor_widget" in sections:
+        refresh_debtor_identity(db, case, profile)
+    refresh_case_summary(db, case, profile)
+
+    return _refresh_projection(db, case, sections=sections, profile=profile)
+
+
+def get_projection_data(db: Session, case_id: int) -> dict[str, Any]:
+    # Чтение ничего не пишет: устаревшие секции отдаются как сохранены и помечаются
+    # в stale_sections, пересборка — за sweep_case_projections и путём записи.
     row = db.query(CaseProjection).filter(CaseProjection.case_id == case_id).first()
-    if row and row.data:
-        return row.data
+    if row and row.data and row.projection_version == PROJECTION_VERSION:
+        return {**row.data, "stale_sections": []}
 
-    case = db.query(Case).filter(Case.id == case_id).first()
-    if not case:
-        raise HTTPException(status_code=404, detail="Case not found")
+    stale = stale_projection_sections(row)
+    data = dict(row.data or {}) if row is not None else {}
+    missing = [section for section in PROJECTION_SECTION_VERSIONS if section not in data]
 
-    return sync_and_persist_case(db, case)
+    if missing:
+        # Отсутствующие секции собираются в памяти и не сохраняются.
+        case = db.query(Case).filter(Case.id == case_id).first()
+        if not case:
+            raise HTTPException(status_code=404, detail="Case not found")
+
+        profile = _load_profile(db, case_id) if "debtor_widget" in missing else None
+        for section in missing:
+            data[section] = _PROJECTION_SECTION_BUILDERS[section](case, profile)
+
+    payload = {section: data[section] for section in PROJECTION_SECTION_VERSIONS}
+    payload["stale_sections"] = sorted(stale - set(missing))
+    return payload
+
+
+def _stale_projection_cases_query(db: Session, *, tenant_id: int | None):
+    query = (
+        db.query(Case, CaseProjection)
+        .outerjoin(CaseProjection, CaseProjection.case_id == Case.id)
+        .filter(
+            or_(
+                CaseProjection.id.is_(None),
+                CaseProjection.projection_version.is_(None),
+                CaseProjection.projection_version != PROJECTION_VERSION,
+            )
+        )
+    )
+    if tenant_id is not None:
+        query = query.filter(Case.tenant_id == tenant_id)
+    return query
+
+
+def sweep_case_projections(
+    db: Session,
+    *,
+    tenant_id: int | None = None,
+    batch_size: int | None = None,
+) -> dict[str, Any]:
+    batch_size = max(int(batch_size or PROJECTION_SWEEP_BATCH_SIZE), 1)
+    last_case_id = 0
+    rebuilt = 0
+    created = 0
+
+    while True:
+        rows = (
+            _stale_projection_cases_query(db, tenant_id=tenant_id)
+            .filter(Case.id > last_case_id)
+            .order_by(Case.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        case_ids = [case.id for case, _projection in rows]
+        profiles = {
+            profile.case_id: profile
+            for profile in db.query(DebtorProfile).filter(DebtorProfile.case_id.in_(case_ids))
+        }
+
+        for case, projection in rows:
+            if projection is None or not projection.data:
+                created += 1
+            _refresh_projection(
+                db,
+                case,
+                sections=set(),
+                projection=projection,
+                profile=profiles.get(case.id),
+            )
+            rebuilt += 1
+
+        last_case_id = case_ids[-1]
+        # Коммит на пачку: долгий sweep не держит одну транзакцию.
+        db.commit()
+
+    return {
+        "ok": True,
+        "tenant_id": tenant_id,
+        "projection_version": PROJECTION_VERSION,
+        "rebuilt": rebuilt,
+        "created": created,
+    }
 
 
 def create_case_write(
@@ -275,7 +480,7 @@ def apply_action_write(
             ),
         )
 
-    payload = sync_and_persist_case(db, case)
+    payload = sync_and_persist_case(db, case, changes=("action",))
     db.flush()
     db.refresh(case)
 
@@ -1,23 +1,44 @@
 from __future__ import annotations
 
 from collections import Counter
-from datetime import date
+from datetime import date, datetime, time, timedelta
 from typing import Any
 
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
 from backend.app.models.automation_run import AutomationRun
 from backend.app.models.batch_job import BatchJob
 from backend.app.models.case import Case
+from backend.app.models.control_room_case_stat import ControlRoomCaseStat
 from backend.app.models.debtor_profile import DebtorProfile
 from backend.app.services.case_dashboard_service import build_case_dashboard
+from backend.app.services.control_room_summary_service import (
+    blocked_reason_flags,
+    extract_debtor_identifiers,
+    mark_related_priorities_stale,
+    read_control_room_counters,
+)
 from backend.app.services.focus_queue_service import get_control_room_focus_queues
 from backend.app.services.portfolio_routing_service import build_portfolio_routing
 from backend.app.services.priority_engine_service import build_case_priority_snapshot
-from backend.app.services.tenant_query_service import filter_cases_by_tenant
 from backend.app.services.waiting_bucket_service import list_waiting_buckets
 
 
+PRIORITY_REFRESH_CHUNK_SIZE = 50
+ROUTING_PREVIEW_LIMIT = 10
+ROUTING_STATUSES = ("ready", "waiting", "blocked", "idle")
+
+PRIORITY_PAYLOAD_KEYS = (
+    "priority_band_label",
+    "priority_reasons",
+    "operator_focus",
+    "decision_positives",
+    "decision_blockers",
+    "decision_signals",
+)
+
+
 def _status_value(value: Any) -> str:
     return str(getattr(value, "value", value) or "").strip()
 
@@ -35,57 +56,12 @@ def _format_money(value: float) -> str:
     return f"{value:.2f}"
 
 
-def _extract_debtor_identifiers(
-    case: Case,
-    debtor_profile: DebtorProfile | None,
-) -> tuple[str | None, str | None]:
-    contract_data = dict(case.contract_data or {})
-    debtor = dict(contract_data.get("debtor") or {})
-
-    inn = (debtor_profile.inn if debtor_profile else None) or debtor.get("inn")
-    ogrn = (debtor_profile.ogrn if debtor_profile else None) or debtor.get("ogrn")
-    return inn, ogrn
-
-
 def _is_overdue(case: Case) -> bool:
     if not case.due_date:
         return False
     return case.due_date < date.today()
 
 
-def _blocked_reason_flags(case: Case, debtor_profile: DebtorProfile | None) -> list[str]:
-    reasons: list[str] = []
-
-    if not str(case.debtor_name or "").strip():
-        reasons.append("missing_debtor_name")
-
-    if _amount_to_float(case.principal_amount) <= 0:
-        reasons.append("missing_principal_amount")
-
-    if not case.due_date:
-        reasons.append("missing_due_date")
-
-    inn, ogrn = _extract_debtor_identifiers(case, debtor_profile)
-    if not str(inn or "").strip() and not str(ogrn or "").strip():
-        reasons.append("missing_debtor_identifiers")
-
-    return reasons
-
-
-def _status_bucket(status: str) -> str:
-    if status == "closed":
-        return "closed"
-    if status == "court":
-        return "court"
-    if status in {"fssp", "enforcement"}:
-        return "fssp"
-    if status == "pretrial":
-        return "pretrial"
-    if status == "overdue":
-        return "overdue"
-    return "draft"
-
-
 def _route_lane_from_status(status: str) -> str:
     if status == "court":
         return "court_lane"
@@ -106,31 +82,23 @@ def _risk_level(score: int) -> str:
     return "low"
 
 
-def _load_cases_with_profiles(
+def _load_profiles_map(
     db: Session,
     tenant_id: int,
-    *,
-    include_archived: bool = False,
-) -> tuple[list[Case], dict[int, DebtorProfile]]:
-    query = db.query(Case).order_by(Case.id.desc())
-    query = filter_cases_by_tenant(query, tenant_id, include_archived=include_archived)
-    cases = query.all()
-
-    case_ids = [item.id for item in cases]
-    profiles_map: dict[int, DebtorProfile] = {}
-
-    if case_ids:
-        profiles = (
-            db.query(DebtorProfile)
-            .filter(
-                DebtorProfile.tenant_id == tenant_id,
-                DebtorProfile.case_id.in_(case_ids),
-            )
-            .all()
+    case_ids: list[int],
+) -> dict[int, DebtorProfile]:
+    if not case_ids:
+        return {}
+
+    profiles = (
+        db.query(DebtorProfile)
+        .filter(
+            DebtorProfile.tenant_id == tenant_id,
+            DebtorProfile.case_id.in_(case_ids),
         )
-        profiles_map = {item.case_id: item for item in profiles}
-
-    return cases, profiles_map
+        .all()
+    )
+    return {item.case_id: item for item in profiles}
 
 
 def _build_routing_map(routing: dict[str, Any]) -> dict[int, dict[str, Any]]:
@@ -172,7 +140,7 @@ def _safe_percent(value: float) -> int:
     return max(0, min(100, int(round(value))))
 
 
-def _build_priority_mix(priority_items: list[dict[str, Any]]) -> dict[str, int]:
+def _build_priority_mix(priority_groups: list[dict[str, Any]]) -> dict[str, int]:
     mix = {
         "low": 0,
         "medium": 0,
@@ -180,20 +148,20 @@ def _build_priority_mix(priority_items: list[dict[str, Any]]) -> dict[str, int]:
         "critical": 0,
     }
 
-    for item in priority_items:
-        band = str(item.get("priority_band") or "").strip().lower()
+    for group in priority_groups:
+        band = str(group.get("priority_band") or "").strip().lower()
         if band in mix:
-            mix[band] += 1
+            mix[band] += _safe_int(group.get("cases"))
 
     return mix
 
 
 def _build_pressure_metrics(
     *,
-    priority_items: list[dict[str, Any]],
+    priority_groups: list[dict[str, Any]],
     routing: dict[str, Any],
 ) -> dict[str, int]:
-    total_cases = max(len(priority_items), 1)
+    total_cases = max(sum(_safe_int(group.get("cases")) for group in priority_groups), 1)
     routing_summary = dict(routing.get("summary") or {})
 
     ready_cases = _safe_int(routing_summary.get("ready"))
@@ -206,22 +174,23 @@ def _build_pressure_metrics(
     waiting_high_priority_cases = 0
     ready_high_priority_cases = 0
 
-    for item in priority_items:
-        band = str(item.get("priority_band") or "").strip().lower()
-        is_blocked = bool(item.get("is_blocked"))
-        is_waiting = bool(item.get("is_waiting"))
-        is_ready_now = bool(item.get("is_ready_now"))
+    for group in priority_groups:
+        band = str(group.get("priority_band") or "").strip().lower()
+        cases = _safe_int(group.get("cases"))
+        is_blocked = bool(group.get("is_blocked"))
+        is_waiting = bool(group.get("is_waiting"))
+        is_ready_now = bool(group.get("is_ready_now"))
 
         if band == "critical":
-            critical_cases += 1
+            critical_cases += cases
         if band in {"high", "critical"}:
-            high_cases += 1
+            high_cases += cases
         if is_blocked and band in {"high", "critical"}:
-            blocked_high_risk_cases += 1
+            blocked_high_risk_cases += cases
         if is_waiting and band in {"high", "critical"}:
-            waiting_high_priority_cases += 1
+            waiting_high_priority_cases += cases
         if is_ready_now and band in {"high", "critical"}:
-            ready_high_priority_cases += 1
+            ready_high_priority_cases += cases
 
     ready_pressure = (
         ready_cases * 8
@@ -276,65 +245,272 @@ def get_control_room_summary(
     tenant_id: int,
     include_archived: bool = False,
 ) -> dict[str, Any]:
-    cases, profiles_map = _load_cases_with_profiles(
+    counters = read_control_room_counters(
         db,
-        tenant_id,
+        tenant_id=tenant_id,
         include_archived=include_archived,
     )
 
-    total_amount = 0.0
-    active_count = 0
-    archived_count = 0
-    blocked_count = 0
-    overdue_now_count = 0
+    total_cases = int(counters["total_cases"])
+    total_amount = _amount_to_float(counters["total_principal_amount"])
+    avg_amount = total_amount / total_cases if total_cases else 0.0
 
-    buckets = {
-        "draft": 0,
-        "overdue": 0,
-        "pretrial": 0,
-        "court": 0,
-        "fssp": 0,
-        "closed": 0,
+    return {
+        "total_cases": total_cases,
+        "active_cases": counters["active_cases"],
+        "archived_cases": counters["archived_cases"],
+        "draft_cases": counters["draft_cases"],
+        "overdue_cases": counters["overdue_cases"],
+        "pretrial_cases": counters["pretrial_cases"],
+        "court_cases": counters["court_cases"],
+        "fssp_cases": counters["fssp_cases"],
+        "closed_cases": counters["closed_cases"],
+        "blocked_cases": counters["blocked_cases"],
+        "overdue_now_cases": counters["overdue_now_cases"],
+        "total_principal_amount": _format_money(total_amount),
+        "average_principal_amount": _format_money(avg_amount),
     }
 
-    for case in cases:
-        amount = _amount_to_float(case.principal_amount)
-        total_amount += amount
 
-        if bool(getattr(case, "is_archived", False)):
-            archived_count += 1
-        else:
-            active_count += 1
+def _parse_eligible_at(routing_row: dict[str, Any]) -> datetime | None:
+    eligible_at = routing_row.get("waiting_eligible_at")
+    if not eligible_at:
+        return None
+    try:
+        return datetime.fromisoformat(str(eligible_at)).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _priority_expires_at(case: Case, routing_row: dict[str, Any]) -> datetime | None:
+    candidates: list[datetime] = []
 
-        status = _status_bucket(_status_value(case.status))
-        buckets[status] = buckets.get(status, 0) + 1
+    # Пороги просрочки из priority_engine_service: 1, 90 и 365 дней.
+    if case.due_date:
+        for days in (1, 90, 365):
+            threshold = case.due_date + timedelta(days=days)
+            if threshold > date.today():
+                candidates.append(datetime.combine(threshold, time.min))
+                break
 
-        profile = profiles_map.get(case.id)
-        if _blocked_reason_flags(case, profile):
-            blocked_count += 1
+    eligible_at = _parse_eligible_at(routing_row)
+    if eligible_at:
+        candidates.append(eligible_at)
 
-        if _is_overdue(case) and status not in {"closed", "fssp"}:
-            overdue_now_count += 1
+    return min(candidates) if candidates else None
 
-    avg_amount = total_amount / len(cases) if cases else 0.0
 
+def _compute_priority(
+    db: Session,
+    case: Case,
+    profile: DebtorProfile | None,
+    routing_row: dict[str, Any],
+) -> dict[str, Any]:
+    return build_case_priority_snapshot(
+        case=case,
+        dashboard=build_case_dashboard(db, case.id),
+        routing_row=routing_row,
+        blocked_reasons=blocked_reason_flags(case, profile),
+    )
+
+
+def _store_priority(
+    stat: ControlRoomCaseStat,
+    case: Case,
+    routing_row: dict[str, Any],
+    priority: dict[str, Any],
+) -> None:
+    stat.priority_score = _safe_int(priority.get("priority_score"))
+    stat.priority_band = str(priority.get("priority_band") or "low")
+    stat.priority_ready_now = bool(priority.get("ready_now"))
+    stat.priority_waiting = bool(priority.get("waiting"))
+    stat.priority_blocked = bool(priority.get("blocked"))
+    stat.priority_stale = False
+    stat.priority_expires_at = _priority_expires_at(case, routing_row)
+    stat.priority_computed_at = datetime.utcnow()
+    stat.priority_payload = {key: priority.get(key) for key in PRIORITY_PAYLOAD_KEYS}
+    stat.routing_status = str(routing_row.get("routing_status") or "idle")
+    stat.waiting_eligible_at = _parse_eligible_at(routing_row)
+
+
+def _stored_priority(stat: ControlRoomCaseStat) -> dict[str, Any]:
     return {
-        "total_cases": len(cases),
-        "active_cases": active_count,
-        "archived_cases": archived_count,
-        "draft_cases": buckets["draft"],
-        "overdue_cases": buckets["overdue"],
-        "pretrial_cases": buckets["pretrial"],
-        "court_cases": buckets["court"],
-        "fssp_cases": buckets["fssp"],
-        "closed_cases": buckets["closed"],
-        "blocked_cases": blocked_count,
-        "overdue_now_cases": overdue_now_count,
-        "total_principal_amount": _format_money(total_amount),
-        "average_principal_amount": _format_money(avg_amount),
+        **dict(stat.priority_payload or {}),
+        "priority_score": _safe_int(stat.priority_score),
+        "priority_band": stat.priority_band or "low",
+        "ready_now": bool(stat.priority_ready_now),
+        "waiting": bool(stat.priority_waiting),
+        "blocked": bool(stat.priority_blocked),
+    }
+
+
+def _mark_related_cases_stale(db: Session, *, tenant_id: int) -> None:
+    # Приоритет учитывает портфель должника, поэтому изменённое дело
+    # делает устаревшими и связанные; запись дела этого не ищет.
+    stale_ids = [
+        row[0]
+        for row in db.query(ControlRoomCaseStat.case_id)
+        .filter(
+            ControlRoomCaseStat.tenant_id == tenant_id,
+            ControlRoomCaseStat.priority_stale.is_(True),
+        )
+        .order_by(ControlRoomCaseStat.case_id.asc())
+        .all()
+    ]
+
+    for offset in range(0, len(stale_ids), PRIORITY_REFRESH_CHUNK_SIZE):
+        case_ids = stale_ids[offset:offset + PRIORITY_REFRESH_CHUNK_SIZE]
+        cases = db.query(Case).filter(Case.id.in_(case_ids)).all()
+        profiles_map = _load_profiles_map(db, tenant_id, case_ids)
+        for case in cases:
+            mark_related_priorities_stale(db, case, profiles_map.get(case.id))
+
+    db.flush()
+
+
+def refresh_stale_priorities(
+    db: Session,
+    *,
+    tenant_id: int,
+    limit: int | None = None,
+) -> int:
+    _mark_related_cases_stale(db, tenant_id=tenant_id)
+
+    now = datetime.utcnow()
+    query = (
+        db.query(ControlRoomCaseStat)
+        .filter(
+            ControlRoomCaseStat.tenant_id == tenant_id,
+            or_(
+                ControlRoomCaseStat.priority_stale.is_(True),
+                ControlRoomCaseStat.priority_score.is_(None),
+                ControlRoomCaseStat.priority_expires_at <= now,
+            ),
+        )
+        .order_by(ControlRoomCaseStat.case_id.asc())
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    stats = query.all()
+
+    for offset in range(0, len(stats), PRIORITY_REFRESH_CHUNK_SIZE):
+        chunk = stats[offset:offset + PRIORITY_REFRESH_CHUNK_SIZE]
+        case_ids = [item.case_id for item in chunk]
+
+        cases = db.query(Case).filter(Case.id.in_(case_ids)).all()
+        cases_map = {item.id: item for item in cases}
+        profiles_map = _load_profiles_map(db, tenant_id, case_ids)
+        routing_map = _build_routing_map(
+            build_portfolio_routing(db, tenant_id=tenant_id, cases=cases)
+        )
+
+        for stat in chunk:
+            case = cases_map.get(stat.case_id)
+            if case is None:
+                continue
+
+            routing_row = routing_map.get(case.id) or {}
+            priority = _compute_priority(db, case, profiles_map.get(case.id), routing_row)
+            _store_priority(stat, case, routing_row, priority)
+            db.add(stat)
+
+        db.flush()
+
+    return len(stats)
+
+
+def _build_priority_item(
+    case: Case,
+    profile: DebtorProfile | None,
+    routing_row: dict[str, Any],
+    priority: dict[str, Any],
+) -> dict[str, Any]:
+    routing_status = str(routing_row.get("routing_status") or "idle")
+    route_lane = str(
+        routing_row.get("route_lane") or _route_lane_from_status(_status_value(case.status))
+    )
+    waiting_reason = routing_row.get("waiting_reason")
+    waiting_eligible_at = routing_row.get("waiting_eligible_at")
+    routing_hint = routing_row.get("routing_hint")
+
+    inn, ogrn = extract_debtor_identifiers(case, profile)
+
+    blocked_reasons = _merge_signals(
+        list(priority.get("decision_blockers") or []),
+        [str(routing_hint)] if routing_status == "blocked" and routing_hint else [],
+    )
+
+    signals = _merge_signals(
+        list(priority.get("decision_signals") or []),
+        [str(waiting_reason)] if waiting_reason else [],
+        ["overdue_now"] if _is_overdue(case) else [],
+        ["high_amount"] if _amount_to_float(case.principal_amount) >= 500_000 else [],
+    )
+
+    is_waiting = bool(priority.get("waiting"))
+    is_blocked = bool(priority.get("blocked"))
+    is_court_lane = route_lane == "court_lane"
+    is_enforcement_lane = route_lane == "enforcement_lane"
+    is_ready_now = bool(priority.get("ready_now"))
+
+    return {
+        "case_id": case.id,
+        "debtor_name": case.debtor_name,
+        "status": _status_value(case.status),
+        "contract_type": _status_value(case.contract_type),
+        "debtor_type": _status_value(case.debtor_type),
+        "principal_amount": (
+            str(case.principal_amount) if case.principal_amount is not None else None
+        ),
+        "due_date": case.due_date.isoformat() if case.due_date else None,
+        "risk_score": _safe_int(priority.get("priority_score")),
+        "risk_level": str(priority.get("priority_band") or "low"),
+        "priority_score": _safe_int(priority.get("priority_score")),
+        "priority_band": str(priority.get("priority_band") or "low"),
+        "priority_band_label": priority.get("priority_band_label"),
+        "priority_reasons": list(priority.get("priority_reasons") or []),
+        "operator_focus": priority.get("operator_focus"),
+        "decision_positives": list(priority.get("decision_positives") or []),
+        "decision_blockers": list(priority.get("decision_blockers") or []),
+        "decision_signals": list(priority.get("decision_signals") or []),
+        "signals": signals,
+        "routing_bucket": (
+            route_lane if route_lane in {"court_lane", "enforcement_lane"} else routing_status
+        ),
+        "routing_status": routing_status,
+        "routing_hint": routing_hint,
+        "route_lane": route_lane,
+        "waiting_reason": waiting_reason,
+        "waiting_eligible_at": waiting_eligible_at,
+        "recommended_action": priority.get("operator_focus"),
+        "blocked": is_blocked,
+        "blocked_reasons": blocked_reasons,
+        "is_blocked": is_blocked,
+        "is_waiting": is_waiting,
+        "is_ready_now": is_ready_now,
+        "is_court_lane": is_court_lane,
+        "is_enforcement_lane": is_enforcement_lane,
+        "inn": inn,
+        "ogrn": ogrn,
+        "is_archived": bool(getattr(case, "is_archived", False)),
     }
 
 
+def _priority_stats_query(db: Session, *, tenant_id: int, include_archived: bool):
+    query = db.query(ControlRoomCaseStat).filter(ControlRoomCaseStat.tenant_id == tenant_id)
+    if not include_archived:
+        query = query.filter(ControlRoomCaseStat.is_archived.is_(False))
+    return query
+
+
+def _order_by_priority(query):
+    return query.order_by(
+        ControlRoomCaseStat.priority_score.desc().nulls_last(),
+        ControlRoomCaseStat.principal_amount.desc(),
+        ControlRoomCaseStat.case_id.asc(),
+    )
+
+
 def get_control_room_priority_cases(
     db: Session,
     *,
@@ -342,117 +518,191 @@ def get_control_room_priority_cases(
     limit: int = 10,
     include_archived: bool = False,
 ) -> dict[str, Any]:
-    cases, profiles_map = _load_cases_with_profiles(
+    counters = read_control_room_counters(
         db,
-        tenant_id,
+        tenant_id=tenant_id,
         include_archived=include_archived,
     )
 
-    routing = build_portfolio_routing(
-        db,
-        tenant_id=tenant_id,
-        cases=cases,
+    # Только чтение: балл, порядок и причины — из сохранённого расчёта
+    # задачи control_room_priority_refresh.
+    top_stats = (
+        _order_by_priority(
+            _priority_stats_query(db, tenant_id=tenant_id, include_archived=include_archived)
+        )
+        .limit(limit)
+        .all()
     )
-    routing_map = _build_routing_map(routing)
 
-    items: list[dict[str, Any]] = []
+    return {
+        "items": build_priority_items(db, tenant_id=tenant_id, stats=top_stats),
+        "total": int(counters["total_cases"]),
+    }
 
-    for case in cases:
-        profile = profiles_map.get(case.id)
-        routing_row = routing_map.get(case.id) or {}
 
-        blocked_flags = _blocked_reason_flags(case, profile)
-        routing_status = str(routing_row.get("routing_status") or "idle")
-        route_lane = str(
-            routing_row.get("route_lane") or _route_lane_from_status(_status_value(case.status))
-        )
-        waiting_reason = routing_row.get("waiting_reason")
-        waiting_eligible_at = routing_row.get("waiting_eligible_at")
-        routing_hint = routing_row.get("routing_hint")
-
-        dashboard = build_case_dashboard(db, case.id)
-        priority = build_case_priority_snapshot(
-            case=case,
-            dashboard=dashboard,
-            routing_row=routing_row,
-            blocked_reasons=blocked_flags,
+def build_priority_items(
+    db: Session,
+    *,
+    tenant_id: int,
+    stats: list[ControlRoomCaseStat],
+) -> list[dict[str, Any]]:
+    case_ids = [item.case_id for item in stats]
+    if not case_ids:
+        return []
+
+    cases_map = {item.id: item for item in db.query(Case).filter(Case.id.in_(case_ids)).all()}
+    profiles_map = _load_profiles_map(db, tenant_id, case_ids)
+    # Маршрут только для показанных дел и без записи waiting buckets.
+    routing_map = _build_routing_map(
+        build_portfolio_routing(
+            db,
+            tenant_id=tenant_id,
+            cases=list(cases_map.values()),
+            persist_waiting_buckets=False,
         )
+    )
 
-        inn, ogrn = _extract_debtor_identifiers(case, profile)
+    items: list[dict[str, Any]] = []
+    for stat in stats:
+        case = cases_map.get(stat.case_id)
+        if case is None:
+            continue
 
-        blocked_reasons = _merge_signals(
-            list(priority.get("decision_blockers") or []),
-            [str(routing_hint)] if routing_status == "blocked" and routing_hint else [],
-        )
+        routing_row = dict(routing_map.get(case.id) or {})
+        if stat.routing_status:
+            # Корзина — из сохранённого расчёта, как и балл; подсказки — из текущей оценки.
+            routing_row["routing_status"] = stat.routing_status
 
-        signals = _merge_signals(
-            list(priority.get("decision_signals") or []),
-            [str(waiting_reason)] if waiting_reason else [],
-            ["overdue_now"] if _is_overdue(case) else [],
-            ["high_amount"] if _amount_to_float(case.principal_amount) >= 500_000 else [],
+        items.append(
+            _build_priority_item(
+                case,
+                profiles_map.get(case.id),
+                routing_row,
+                _stored_priority(stat),
+            )
         )
 
-        is_waiting = bool(priority.get("waiting"))
-        is_blocked = bool(priority.get("blocked"))
-        is_court_lane = route_lane == "court_lane"
-        is_enforcement_lane = route_lane == "enforcement_lane"
-        is_ready_now = bool(priority.get("ready_now"))
+    return items
 
-        items.append(
-            {
-                "case_id": case.id,
-                "debtor_name": case.debtor_name,
-                "status": _status_value(case.status),
-                "contract_type": _status_value(case.contract_type),
-                "debtor_type": _status_value(case.debtor_type),
-                "principal_amount": (
-                    str(case.principal_amount) if case.principal_amount is not None else None
-                ),
-                "due_date": case.due_date.isoformat() if case.due_date else None,
-                "risk_score": _safe_int(priority.get("priority_score")),
-                "risk_level": str(priority.get("priority_band") or "low"),
-                "priority_score": _safe_int(priority.get("priority_score")),
-                "priority_band": str(priority.get("priority_band") or "low"),
-                "priority_band_label": priority.get("priority_band_label"),
-                "priority_reasons": list(priority.get("priority_reasons") or []),
-                "operator_focus": priority.get("operator_focus"),
-                "decision_positives": list(priority.get("decision_positives") or []),
-                "decision_blockers": list(priority.get("decision_blockers") or []),
-                "decision_signals": list(priority.get("decision_signals") or []),
-                "signals": signals,
-                "routing_bucket": (
-                    route_lane if route_lane in {"court_lane", "enforcement_lane"} else routing_status
-                ),
-                "routing_status": routing_status,
-                "routing_hint": routing_hint,
-                "route_lane": route_lane,
-                "waiting_reason": waiting_reason,
-                "waiting_eligible_at": waiting_eligible_at,
-                "recommended_action": priority.get("operator_focus"),
-                "blocked": is_blocked,
-                "blocked_reasons": blocked_reasons,
-                "is_blocked": is_blocked,
-                "is_waiting": is_waiting,
-                "is_ready_now": is_ready_now,
-                "is_court_lane": is_court_lane,
-                "is_enforcement_lane": is_enforcement_lane,
-                "inn": inn,
-                "ogrn": ogrn,
-                "is_archived": bool(getattr(case, "is_archived", False)),
-            }
+
+def _load_priority_groups(
+    db: Session,
+    *,
+    tenant_id: int,
+    include_archived: bool,
+) -> list[dict[str, Any]]:
+    # Агрегат по сочетаниям признаков: десятки строк вместо строки на дело.
+    rows = (
+        _priority_stats_query(db, tenant_id=tenant_id, include_archived=include_archived)
+        .with_entities(
+            ControlRoomCaseStat.priority_band,
+            ControlRoomCaseStat.priority_ready_now,
+            ControlRoomCaseStat.priority_waiting,
+            ControlRoomCaseStat.priority_blocked,
+            func.count(ControlRoomCaseStat.id),
+            func.coalesce(func.sum(ControlRoomCaseStat.priority_score), 0),
+        )
+        .group_by(
+            ControlRoomCaseStat.priority_band,
+            ControlRoomCaseStat.priority_ready_now,
+            ControlRoomCaseStat.priority_waiting,
+            ControlRoomCaseStat.priority_blocked,
         )
+        .all()
+    )
 
-    items.sort(
-        key=lambda item: (
-            -_safe_int(item["priority_score"]),
-            -_amount_to_float(item.get("principal_amount")),
-            item["case_id"],
+    return [
+        {
+            "priority_band": band,
+            "is_blocked": bool(blocked),
+            "is_waiting": bool(waiting),
+            "is_ready_now": bool(ready_now),
+            "cases": int(cases or 0),
+            "priority_score_sum": int(score_sum or 0),
+        }
+        for band, ready_now, waiting, blocked, cases, score_sum in rows
+    ]
+
+
+def _count_routing_statuses(
+    db: Session,
+    *,
+    tenant_id: int,
+    include_archived: bool,
+) -> dict[str, int]:
+    rows = (
+        _priority_stats_query(db, tenant_id=tenant_id, include_archived=include_archived)
+        .with_entities(ControlRoomCaseStat.routing_status, func.count(ControlRoomCaseStat.id))
+        .group_by(ControlRoomCaseStat.routing_status)
+        .all()
+    )
+
+    counts = {status: 0 for status in ROUTING_STATUSES}
+    for routing_status, cases in rows:
+        # Дела, которые задача пересчёта ещё не видела, считаются idle.
+        counts[routing_status if routing_status in counts else "idle"] += int(cases or 0)
+    return counts
+
+
+def _routing_status_filter(routing_status: str):
+    if routing_status == "idle":
+        return or_(
+            ControlRoomCaseStat.routing_status == "idle",
+            ControlRoomCaseStat.routing_status.is_(None),
         )
+    return ControlRoomCaseStat.routing_status == routing_status
+
+
+def _build_lane_summary(counters: dict[str, Any]) -> dict[str, int]:
+    court = _safe_int(counters.get("court_cases"))
+    enforcement = _safe_int(counters.get("fssp_cases"))
+    closed = _safe_int(counters.get("closed_cases"))
+    return {
+        "soft_lane": _safe_int(counters.get("total_cases")) - court - enforcement - closed,
+        "court_lane": court,
+        "enforcement_lane": enforcement,
+        "closed_lane": closed,
+    }
+
+
+def get_control_room_routing(
+    db: Session,
+    *,
+    tenant_id: int,
+    include_archived: bool = False,
+    preview_limit: int = ROUTING_PREVIEW_LIMIT,
+) -> dict[str, Any]:
+    counters = read_control_room_counters(
+        db,
+        tenant_id=tenant_id,
+        include_archived=include_archived,
+    )
+    status_counts = _count_routing_statuses(
+        db,
+        tenant_id=tenant_id,
+        include_archived=include_archived,
     )
 
+    # В корзинах только верх по приоритету; полный список — /portfolio/routing.
+    buckets = {
+        routing_status: build_priority_items(
+            db,
+            tenant_id=tenant_id,
+            stats=_order_by_priority(
+                _priority_stats_query(db, tenant_id=tenant_id, include_archived=include_archived)
+                .filter(_routing_status_filter(routing_status))
+            )
+            .limit(preview_limit)
+            .all(),
+        )
+        for routing_status in ROUTING_STATUSES
+    }
+
     return {
-        "items": items[:limit],
-        "total": len(items),
+        "summary": {"total": sum(status_counts.values()), **status_counts},
+        "lane_summary": _build_lane_summary(counters),
+        "buckets": buckets,
+        "preview_limit": preview_limit,
     }
 
 
@@ -594,39 +844,40 @@ def get_control_room_execution_console(
 
 
 def _build_intelligence_kpi(
-    priority_items: list[dict[str, Any]],
+    priority_groups: list[dict[str, Any]],
     routing: dict[str, Any],
 ) -> dict[str, Any]:
     lane_summary = dict(routing.get("lane_summary") or {})
     counter = Counter()
 
-    total_cases = len(priority_items)
+    total_cases = 0
     total_priority_score = 0
 
-    for item in priority_items:
-        priority_score = _safe_int(item.get("priority_score"))
-        total_priority_score += priority_score
-
-        if item.get("priority_band") in {"high", "critical"}:
-            counter["high_risk_cases"] += 1
-        if item.get("priority_band") == "critical":
-            counter["critical_cases"] += 1
-        if item.get("blocked") and item.get("priority_band") in {"high", "critical"}:
-            counter["blocked_high_risk_cases"] += 1
-        if item.get("is_ready_now"):
-            counter["ready_now_cases"] += 1
-        if item.get("is_waiting"):
-            counter["waiting_cases"] += 1
-        if item.get("is_blocked"):
-            counter["blocked_cases"] += 1
+    for group in priority_groups:
+        cases = _safe_int(group.get("cases"))
+        total_cases += cases
+        total_priority_score += _safe_int(group.get("priority_score_sum"))
+
+        if group.get("priority_band") in {"high", "critical"}:
+            counter["high_risk_cases"] += cases
+        if group.get("priority_band") == "critical":
+            counter["critical_cases"] += cases
+        if group.get("is_blocked") and group.get("priority_band") in {"high", "critical"}:
+            counter["blocked_high_risk_cases"] += cases
+        if group.get("is_ready_now"):
+            counter["ready_now_cases"] += cases
+        if group.get("is_waiting"):
+            counter["waiting_cases"] += cases
+        if group.get("is_blocked"):
+            counter["blocked_cases"] += cases
 
     avg_priority_score = round(total_priority_score / total_cases, 1) if total_cases else 0.0
     avg_risk_score = avg_priority_score
 
-    priority_mix = _build_priority_mix(priority_items)
+    priority_mix = _build_priority_mix(priority_groups)
 
     pressure = _build_pressure_metrics(
-        priority_items=priority_items,
+        priority_groups=priority_groups,
         routing=routing,
     )
 
@@ -665,20 +916,18 @@ def get_control_room_dashboard(
     tenant_id: int,
     include_archived: bool = False,
 ) -> dict[str, Any]:
-    query = db.query(Case).order_by(Case.id.desc())
-    query = filter_cases_by_tenant(query, tenant_id, include_archived=include_archived)
-    cases = query.all()
-
+    # Всё из агрегатов и строк control_room_case_stats: дела целиком не читаются,
+    # playbook оценивается только для показанных дел.
     summary = get_control_room_summary(
         db,
         tenant_id=tenant_id,
         include_archived=include_archived,
     )
 
-    routing = build_portfolio_routing(
+    routing = get_control_room_routing(
         db,
         tenant_id=tenant_id,
-        cases=cases,
+        include_archived=include_archived,
     )
 
     waiting_preview = get_control_room_waiting_preview(
@@ -693,18 +942,13 @@ def get_control_room_dashboard(
         limit=20,
     )
 
-    all_priority_cases = get_control_room_priority_cases(
+    priority_cases = get_control_room_priority_cases(
         db,
         tenant_id=tenant_id,
-        limit=max(len(cases), 10),
+        limit=10,
         include_archived=include_archived,
     )
 
-    priority_cases = {
-        "items": list(all_priority_cases["items"][:10]),
-        "total": all_priority_cases["total"],
-    }
-
     focus_queues = get_control_room_focus_queues(
         db,
         tenant_id=tenant_id,
@@ -713,7 +957,7 @@ def get_control_room_dashboard(
     )
 
     intelligence_kpi = _build_intelligence_kpi(
-        all_priority_cases["items"],
+        _load_priority_groups(db, tenant_id=tenant_id, include_archived=include_archived),
         routing,
     )
 
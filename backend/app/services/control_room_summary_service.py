@@ -0,0 +1,563 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterator
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.app.models import (
+    Case,
+    ControlRoomCaseStat,
+    ControlRoomSummary,
+    DebtorProfile,
+    JobQueueJob,
+    Tenant,
+)
+from backend.app.services.debtor_identity_service import find_related_cases
+from backend.app.services.job_queue_service import enqueue_job
+
+
+SCAN_CHUNK_SIZE = 500
+PRIORITY_REFRESH_JOB_TYPE = "control_room_priority_refresh"
+
+SUMMARY_COUNTERS = (
+    "total_cases",
+    "draft_cases",
+    "overdue_cases",
+    "pretrial_cases",
+    "court_cases",
+    "fssp_cases",
+    "closed_cases",
+    "blocked_cases",
+    "overdue_now_cases",
+)
+
+# Для этих стадий просрочка уже не считается «текущей».
+OVERDUE_EXEMPT_BUCKETS = {"closed", "fssp"}
+
+
+def _status_value(value: Any) -> str:
+    return str(getattr(value, "value", value) or "").strip()
+
+
+def _amount_to_decimal(value: Any) -> Decimal:
+    if value is None:
+        return Decimal("0")
+    try:
+        return Decimal(str(value))
+    except Exception:
+        return Decimal("0")
+
+
+def extract_debtor_identifiers(
+    case: Case,
+    debtor_profile: DebtorProfile | None,
+) -> tuple[str | None, str | None]:
+    contract_data = dict(case.contract_data or {})
+    debtor = dict(contract_data.get("debtor") or {})
+
+    inn = (debtor_profile.inn if debtor_profile else None) or debtor.get("inn")
+    ogrn = (debtor_profile.ogrn if debtor_profile else None) or debtor.get("ogrn")
+    return inn, ogrn
+
+
+def blocked_reason_flags(case: Case, debtor_profile: DebtorProfile | None) -> list[str]:
+    reasons: list[str] = []
+
+    if not str(case.debtor_name or "").strip():
+        reasons.append("missing_debtor_name")
+
+    if _amount_to_decimal(case.principal_amount) <= 0:
+        reasons.append("missing_principal_amount")
+
+    if not case.due_date:
+        reasons.append("missing_due_date")
+
+    inn, ogrn = extract_debtor_identifiers(case, debtor_profile)
+    if not str(inn or "").strip() and not str(ogrn or "").strip():
+        reasons.append("missing_debtor_identifiers")
+
+    return reasons
+
+
+def status_bucket(status: str) -> str:
+    if status == "closed":
+        return "closed"
+    if status == "court":
+        return "court"
+    if status in {"fssp", "enforcement"}:
+        return "fssp"
+    if status == "pretrial":
+        return "pretrial"
+    if status == "overdue":
+        return "overdue"
+    return "draft"
+
+
+def _case_contribution(case: Case, profile: DebtorProfile | None) -> dict[str, Any]:
+    return {
+        "is_archived": bool(getattr(case, "is_archived", False)),
+        "status_bucket": status_bucket(_status_value(case.status)),
+        "is_blocked": bool(blocked_reason_flags(case, profile)),
+        "principal_amount": _amount_to_decimal(case.principal_amount),
+        "due_date": case.due_date,
+    }
+
+
+def _stat_contribution(stat: ControlRoomCaseStat) -> dict[str, Any]:
+    return {
+        "is_archived": bool(stat.is_archived),
+        "status_bucket": stat.status_bucket,
+        "is_blocked": bool(stat.is_blocked),
+        "principal_amount": _amount_to_decimal(stat.principal_amount),
+        "due_date": stat.due_date,
+    }
+
+
+def _write_stat(stat: ControlRoomCaseStat, tenant_id: int | None, contribution: dict[str, Any]) -> None:
+    stat.tenant_id = tenant_id
+    stat.is_archived = contribution["is_archived"]
+    stat.status_bucket = contribution["status_bucket"]
+    stat.is_blocked = contribution["is_blocked"]
+    stat.principal_amount = contribution["principal_amount"]
+    stat.due_date = contribution["due_date"]
+    stat.updated_at = datetime.utcnow()
+
+
+def _is_overdue_now(contribution: dict[str, Any], as_of: date) -> bool:
+    due_date = contribution["due_date"]
+    if not due_date or contribution["status_bucket"] in OVERDUE_EXEMPT_BUCKETS:
+        return False
+    return due_date < as_of
+
+
+def _empty_counters() -> dict[str, Any]:
+    counters: dict[str, Any] = {key: 0 for key in SUMMARY_COUNTERS}
+    counters["total_principal_amount"] = Decimal("0")
+    return counters
+
+
+def _add_contribution(
+    counters: dict[str, Any],
+    contribution: dict[str, Any],
+    *,
+    as_of: date,
+    sign: int = 1,
+) -> dict[str, Any]:
+    counters["total_cases"] += sign
+    counters[f"{contribution['status_bucket']}_cases"] += sign
+    counters["total_principal_amount"] += contribution["principal_amount"] * sign
+    if contribution["is_blocked"]:
+        counters["blocked_cases"] += sign
+    if _is_overdue_now(contribution, as_of):
+        counters["overdue_now_cases"] += sign
+    return counters
+
+
+def _load_summary_rows(db: Session, tenant_id: int) -> dict[bool, ControlRoomSummary]:
+    rows = db.query(ControlRoomSummary).filter(ControlRoomSummary.tenant_id == tenant_id).all()
+    return {bool(row.is_archived): row for row in rows}
+
+
+def _ensure_summary_rows(db: Session, tenant_id: int) -> dict[bool, ControlRoomSummary]:
+    rows = _load_summary_rows(db, tenant_id)
+    missing = [is_archived for is_archived in (False, True) if is_archived not in rows]
+    if not missing:
+        return rows
+
+    now = datetime.utcnow()
+    values = [
+        {
+            **_empty_counters(),
+            "tenant_id": tenant_id,
+            "is_archived": is_archived,
+            "overdue_as_of": date.today(),
+            "updated_at": now,
+        }
+        for is_archived in missing
+    ]
+
+    # Первую строку могут создавать параллельно: проигравший просто инкрементирует чужую.
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name in {"postgresql", "sqlite"}:
+        dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        db.execute(
+            dialect_insert(ControlRoomSummary.__table__)
+            .values(values)
+            .on_conflict_do_nothing(
+                index_elements=[ControlRoomSummary.tenant_id, ControlRoomSummary.is_archived],
+            )
+        )
+    else:
+        for row_values in values:
+            try:
+                with db.begin_nested():
+                    db.add(ControlRoomSummary(**row_values))
+            except IntegrityError:
+                pass
+
+    return _load_summary_rows(db, tenant_id)
+
+
+def _load_profile(db: Session, case_id: int) -> DebtorProfile | None:
+    return db.query(DebtorProfile).filter(DebtorProfile.case_id == case_id).first()
+
+
+def _apply_contribution(
+    db: Session,
+    row: ControlRoomSummary,
+    contribution: dict[str, Any],
+    *,
+    sign: int,
+) -> None:
+    deltas = _add_contribution(_empty_counters(), contribution, as_of=row.overdue_as_of, sign=sign)
+    values: dict[Any, Any] = {
+        getattr(ControlRoomSummary, key): getattr(ControlRoomSummary, key) + value
+        for key, value in deltas.items()
+        if value
+    }
+    values[ControlRoomSummary.updated_at] = datetime.utcnow()
+
+    # Инкремент на стороне БД, чтобы параллельные транзакции не теряли обновления.
+    (
+        db.query(ControlRoomSummary)
+        .filter(ControlRoomSummary.id == row.id)
+        .update(values, synchronize_session=False)
+    )
+    db.expire(row)
+
+
+def refresh_case_summary(
+    db: Session,
+    case: Case,
+    profile: DebtorProfile | None = None,
+) -> None:
+    db.flush()
+
+    if profile is None:
+        profile = _load_profile(db, case.id)
+
+    new = _case_contribution(case, profile)
+    stat = db.query(ControlRoomCaseStat).filter(ControlRoomCaseStat.case_id == case.id).first()
+
+    # Кроме счётчиков запись дела только помечает приоритет устаревшим;
+    # пересчёт и связанные дела — на задаче control_room_priority_refresh.
+    if stat is not None:
+        stat.priority_stale = True
+        if stat.tenant_id == case.tenant_id and _stat_contribution(stat) == new:
+            db.add(stat)
+            return
+        if stat.tenant_id is not None:
+            old = _stat_contribution(stat)
+            old_row = _load_summary_rows(db, stat.tenant_id).get(old["is_archived"])
+            if old_row is not None:
+                _apply_contribution(db, old_row, old, sign=-1)
+    else:
+        stat = ControlRoomCaseStat(case_id=case.id)
+
+    _write_stat(stat, case.tenant_id, new)
+    db.add(stat)
+
+    if case.tenant_id is None:
+        return
+
+    rows = _ensure_summary_rows(db, case.tenant_id)
+    _apply_contribution(db, rows[new["is_archived"]], new, sign=1)
+
+
+def mark_related_priorities_stale(
+    db: Session,
+    case: Case,
+    profile: DebtorProfile | None,
+) -> None:
+    # Приоритет учитывает портфель должника, поэтому устаревают и связанные дела.
+    related_ids = [item.id for item in find_related_cases(db, case, profile) if item.id != case.id]
+    if not related_ids:
+        return
+
+    (
+        db.query(ControlRoomCaseStat)
+        .filter(ControlRoomCaseStat.case_id.in_(related_ids))
+        .update({ControlRoomCaseStat.priority_stale: True}, synchronize_session=False)
+    )
+
+
+def enqueue_priority_refresh(db: Session, *, tenant_id: int) -> JobQueueJob | None:
+    # Одна ожидающая задача на тенанта: она пересчитает все устаревшие приоритеты разом.
+    pending = (
+        db.query(JobQueueJob.id)
+        .filter(
+            JobQueueJob.tenant_id == tenant_id,
+            JobQueueJob.job_type == PRIORITY_REFRESH_JOB_TYPE,
+            JobQueueJob.status == "pending",
+        )
+        .first()
+    )
+    if pending is not None:
+        return None
+
+    return enqueue_job(
+        db,
+        tenant_id=tenant_id,
+        job_type=PRIORITY_REFRESH_JOB_TYPE,
+        payload={},
+    )
+
+
+def _has_stale_priorities(db: Session, *, tenant_id: int, now: datetime) -> bool:
+    # Две отдельные проверки, чтобы каждая шла по своему индексу.
+    stale = (
+        db.query(ControlRoomCaseStat.id)
+        .filter(
+            ControlRoomCaseStat.tenant_id == tenant_id,
+            ControlRoomCaseStat.priority_stale.is_(True),
+        )
+        .first()
+    )
+    if stale is not None:
+        return True
+
+    expired = (
+        db.query(ControlRoomCaseStat.id)
+        .filter(
+            ControlRoomCaseStat.tenant_id == tenant_id,
+            ControlRoomCaseStat.priority_expires_at <= now,
+        )
+        .first()
+    )
+    return expired is not None
+
+
+def schedule_stale_priority_refreshes(db: Session) -> dict[str, Any]:
+    now = datetime.utcnow()
+    tenant_ids: list[int] = []
+
+    for (tenant_id,) in db.query(Tenant.id).order_by(Tenant.id.asc()).all():
+        if not _has_stale_priorities(db, tenant_id=tenant_id, now=now):
+            continue
+        if enqueue_priority_refresh(db, tenant_id=tenant_id) is not None:
+            tenant_ids.append(tenant_id)
+
+    return {"ok": True, "tenant_ids": tenant_ids}
+
+
+def _iter_tenant_case_chunks(
+    db: Session,
+    tenant_id: int,
+) -> Iterator[list[tuple[Case, DebtorProfile | None]]]:
+    last_id = 0
+
+    while True:
+        cases = (
+            db.query(Case)
+            .filter(Case.tenant_id == tenant_id, Case.id > last_id)
+            .order_by(Case.id.asc())
+            .limit(SCAN_CHUNK_SIZE)
+            .all()
+        )
+        if not cases:
+            return
+
+        case_ids = [item.id for item in cases]
+        profiles = {
+            row.case_id: row
+            for row in db.query(DebtorProfile).filter(DebtorProfile.case_id.in_(case_ids)).all()
+        }
+
+        yield [(case, profiles.get(case.id)) for case in cases]
+
+        last_id = case_ids[-1]
+
+
+def compute_control_room_counters(
+    db: Session,
+    *,
+    tenant_id: int,
+    as_of: date | None = None,
+) -> dict[bool, dict[str, Any]]:
+    as_of = as_of or date.today()
+    result = {False: _empty_counters(), True: _empty_counters()}
+
+    for chunk in _iter_tenant_case_chunks(db, tenant_id):
+        for case, profile in chunk:
+            contribution = _case_contribution(case, profile)
+            _add_contribution(result[contribution["is_archived"]], contribution, as_of=as_of)
+
+    return result
+
+
+def rebuild_control_room_summary(db: Session, *, tenant_id: int) -> dict[str, Any]:
+    as_of = date.today()
+    totals = {False: _empty_counters(), True: _empty_counters()}
+    scanned = 0
+
+    for chunk in _iter_tenant_case_chunks(db, tenant_id):
+        case_ids = [case.id for case, _ in chunk]
+        stats = {
+            row.case_id: row
+            for row in db.query(ControlRoomCaseStat)
+            .filter(ControlRoomCaseStat.case_id.in_(case_ids))
+            .all()
+        }
+
+        for case, profile in chunk:
+            contribution = _case_contribution(case, profile)
+            _add_contribution(totals[contribution["is_archived"]], contribution, as_of=as_of)
+
+            stat = stats.get(case.id)
+            if stat is None:
+                stat = ControlRoomCaseStat(case_id=case.id)
+            _write_stat(stat, tenant_id, contribution)
+            db.add(stat)
+
+        db.flush()
+        scanned += len(chunk)
+
+    (
+        db.query(ControlRoomCaseStat)
+        .filter(
+            ControlRoomCaseStat.tenant_id == tenant_id,
+            ControlRoomCaseStat.case_id.not_in(select(Case.id).where(Case.tenant_id == tenant_id)),
+        )
+        .delete(synchronize_session=False)
+    )
+
+    rows = _load_summary_rows(db, tenant_id)
+    now = datetime.utcnow()
+
+    for is_archived, counters in totals.items():
+        row = rows.get(is_archived)
+        if row is None:
+            row = ControlRoomSummary(tenant_id=tenant_id, is_archived=is_archived)
+        for key, value in counters.items():
+            setattr(row, key, value)
+        row.overdue_as_of = as_of
+        row.updated_at = now
+        db.add(row)
+
+    db.flush()
+
+    return {
+        "ok": True,
+        "tenant_id": tenant_id,
+        "scanned_cases": scanned,
+    }
+
+
+def roll_over_overdue(
+    db: Session,
+    *,
+    tenant_id: int | None = None,
+    as_of: date | None = None,
+) -> dict[str, Any]:
+    as_of = as_of or date.today()
+
+    query = db.query(ControlRoomSummary).filter(ControlRoomSummary.overdue_as_of < as_of)
+    if tenant_id is not None:
+        query = query.filter(ControlRoomSummary.tenant_id == tenant_id)
+    rows = query.all()
+
+    for row in rows:
+        # Счётчик просрочки пересчитывается по срезу дел, без загрузки самих дел.
+        overdue_now = (
+            db.query(func.count(ControlRoomCaseStat.id))
+            .filter(
+                ControlRoomCaseStat.tenant_id == row.tenant_id,
+                ControlRoomCaseStat.is_archived == row.is_archived,
+                ControlRoomCaseStat.due_date.is_not(None),
+                ControlRoomCaseStat.due_date < as_of,
+                ControlRoomCaseStat.status_bucket.not_in(OVERDUE_EXEMPT_BUCKETS),
+            )
+            .scalar()
+        )
+        row.overdue_now_cases = int(overdue_now or 0)
+        row.overdue_as_of = as_of
+        row.updated_at = datetime.utcnow()
+        db.add(row)
+
+    db.flush()
+
+    return {
+        "ok": True,
+        "tenant_id": tenant_id,
+        "as_of": as_of.isoformat(),
+        "rolled_over": len(rows),
+    }
+
+
+def build_missing_control_room_summaries(db: Session) -> dict[str, Any]:
+    built: list[int] = []
+
+    # Полный пересчёт — только для тенантов без агрегата; дальше его ведут инкременты.
+    for tenant in db.query(Tenant).order_by(Tenant.id.asc()).all():
+        if len(_load_summary_rows(db, tenant.id)) == 2:
+            continue
+        rebuild_control_room_summary(db, tenant_id=tenant.id)
+        built.append(tenant.id)
+
+    return {"ok": True, "built_tenant_ids": built}
+
+
+def read_control_room_counters(
+    db: Session,
+    *,
+    tenant_id: int,
+    include_archived: bool = False,
+) -> dict[str, Any]:
+    # Только чтение: агрегат строится при старте, дату просрочки сдвигает ночной roll-over.
+    rows = _load_summary_rows(db, tenant_id)
+
+    counters = _empty_counters()
+    for is_archived, row in rows.items():
+        if is_archived and not include_archived:
+            continue
+        for key in counters:
+            counters[key] += getattr(row, key) or 0
+
+    counters["active_cases"] = int(getattr(rows.get(False), "total_cases", 0) or 0)
+    counters["archived_cases"] = (
+        int(getattr(rows.get(True), "total_cases", 0) or 0) if include_archived else 0
+    )
+    return counters
+
+
+def reconcile_control_room_summary(
+    db: Session,
+    *,
+    tenant_id: int,
+    repair: bool = False,
+) -> dict[str, Any]:
+    roll_over_overdue(db, tenant_id=tenant_id)
+    rows = _load_summary_rows(db, tenant_id)
+    expected = compute_control_room_counters(db, tenant_id=tenant_id)
+
+    mismatches: list[dict[str, Any]] = []
+    for is_archived, counters in expected.items():
+        row = rows.get(is_archived)
+        for key, value in counters.items():
+            actual = getattr(row, key) if row is not None else None
+            if key == "total_principal_amount" and actual is not None:
+                actual = _amount_to_decimal(actual)
+            if actual != value:
+                mismatches.append(
+                    {
+                        "is_archived": is_archived,
+                        "counter": key,
+                        "stored": str(actual) if actual is not None else None,
+                        "expected": str(value),
+                    }
+                )
+
+    if mismatches and repair:
+        rebuild_control_room_summary(db, tenant_id=tenant_id)
+
+    return {
+        "ok": not mismatches,
+        "tenant_id": tenant_id,
+        "mismatches": mismatches,
+        "repaired": bool(mismatches and repair),
+    }
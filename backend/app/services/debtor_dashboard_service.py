@@ -7,7 +7,7 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from backend.app.models import Case, DebtorProfile
-from backend.app.services.tenant_query_service import filter_cases_by_tenant
+from backend.app.services.debtor_identity_service import find_related_cases
 
 
 def _as_str(value: Any) -> str:
@@ -51,40 +51,6 @@ def _extract_identity(case: Case, profile: DebtorProfile | None) -> dict[str, An
     }
 
 
-def _load_profiles_map(db: Session, tenant_id: int, case_ids: list[int]) -> dict[int, DebtorProfile]:
-    if not case_ids:
-        return {}
-
-    rows = (
-        db.query(DebtorProfile)
-        .filter(
-            DebtorProfile.tenant_id == tenant_id,
-            DebtorProfile.case_id.in_(case_ids),
-        )
-        .all()
-    )
-    return {row.case_id: row for row in rows}
-
-
-def _same_debtor(left: dict[str, Any], right: dict[str, Any]) -> bool:
-    left_inn = _as_str(left.get("inn"))
-    right_inn = _as_str(right.get("inn"))
-    if left_inn and right_inn and left_inn == right_inn:
-        return True
-
-    left_ogrn = _as_str(left.get("ogrn"))
-    right_ogrn = _as_str(right.get("ogrn"))
-    if left_ogrn and right_ogrn and left_ogrn == right_ogrn:
-        return True
-
-    left_name = _as_str(left.get("name")).lower()
-    right_name = _as_str(right.get("name")).lower()
-    if left_name and right_name and left_name == right_name:
-        return True
-
-    return False
-
-
 def get_debtor_dashboard(
     db: Session,
     *,
@@ -113,19 +79,8 @@ def get_debtor_dashboard(
     if not base_case:
         raise HTTPException(status_code=404, detail="Base case for debtor profile not found")
 
-    query = db.query(Case).order_by(Case.id.desc())
-    query = filter_cases_by_tenant(query, tenant_id, include_archived=True)
-    all_cases = query.all()
-
-    profiles_map = _load_profiles_map(db, tenant_id, [item.id for item in all_cases])
-
     base_identity = _extract_identity(base_case, profile)
-
-    matched_cases: list[Case] = []
-    for item in all_cases:
-        item_identity = _extract_identity(item, profiles_map.get(item.id))
-        if _same_debtor(base_identity, item_identity):
-            matched_cases.append(item)
+    matched_cases = find_related_cases(db, base_case, profile)
 
     total_amount = Decimal("0")
     active_cases_count = 0
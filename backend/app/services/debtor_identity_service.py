@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from backend.app.models import Case, DebtorIdentity, DebtorProfile
+
+
+REBUILD_CHUNK_SIZE = 500
+
+_DIGITS_RE = re.compile(r"\D+")
+
+
+def _as_str(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _normalize_digits(value: Any) -> str | None:
+    cleaned = _DIGITS_RE.sub("", _as_str(value))
+    return cleaned or None
+
+
+def _normalize_name(value: Any) -> str | None:
+    cleaned = " ".join(_as_str(value).lower().split())
+    return cleaned[:500] or None
+
+
+def build_identity_keys(case: Case, profile: DebtorProfile | None) -> dict[str, str | None]:
+    debtor = dict((case.contract_data or {}).get("debtor") or {})
+
+    name = (
+        _as_str(profile.name if profile else None)
+        or _as_str(debtor.get("name_full"))
+        or _as_str(debtor.get("name"))
+        or _as_str(case.debtor_name)
+    )
+
+    return {
+        "inn": _normalize_digits((profile.inn if profile else None) or debtor.get("inn")),
+        "ogrn": _normalize_digits((profile.ogrn if profile else None) or debtor.get("ogrn")),
+        "name_key": _normalize_name(name),
+    }
+
+
+def _load_profile(db: Session, case_id: int) -> DebtorProfile | None:
+    return db.query(DebtorProfile).filter(DebtorProfile.case_id == case_id).first()
+
+
+def _apply_keys(row: DebtorIdentity, case: Case, keys: dict[str, str | None]) -> bool:
+    changed = (
+        row.tenant_id != case.tenant_id
+        or row.inn != keys["inn"]
+        or row.ogrn != keys["ogrn"]
+        or row.name_key != keys["name_key"]
+    )
+    if changed:
+        row.tenant_id = case.tenant_id
+        row.inn = keys["inn"]
+        row.ogrn = keys["ogrn"]
+        row.name_key = keys["name_key"]
+        row.updated_at = datetime.utcnow()
+    return changed
+
+
+def refresh_debtor_identity(
+    db: Session,
+    case: Case,
+    profile: DebtorProfile | None = None,
+) -> DebtorIdentity:
+    # Профиль мог быть только что добавлен в сессию (autoflush выключен).
+    db.flush()
+
+    if profile is None:
+        profile = _load_profile(db, case.id)
+
+    keys = build_identity_keys(case, profile)
+
+    row = db.query(DebtorIdentity).filter(DebtorIdentity.case_id == case.id).first()
+    if not row:
+        row = DebtorIdentity(case_id=case.id)
+
+    _apply_keys(row, case, keys)
+    db.add(row)
+    return row
+
+
+def find_related_cases(
+    db: Session,
+    case: Case,
+    profile: DebtorProfile | None,
+) -> list[Case]:
+    keys = build_identity_keys(case, profile)
+
+    clauses = []
+    if keys["inn"]:
+        clauses.append(DebtorIdentity.inn == keys["inn"])
+    if keys["ogrn"]:
+        clauses.append(DebtorIdentity.ogrn == keys["ogrn"])
+    if keys["name_key"]:
+        clauses.append(DebtorIdentity.name_key == keys["name_key"])
+
+    if not clauses:
+        return [case]
+
+    related = (
+        db.query(Case)
+        .join(DebtorIdentity, DebtorIdentity.case_id == Case.id)
+        .filter(
+            DebtorIdentity.tenant_id == case.tenant_id,
+            Case.tenant_id == case.tenant_id,
+            or_(*clauses),
+        )
+        .order_by(Case.id.desc())
+        .all()
+    )
+
+    # Текущее дело всегда совпадает само с собой, даже если индекс ещё не догнал запись.
+    if all(item.id != case.id for item in related):
+        related.append(case)
+        related.sort(key=lambda item: item.id, reverse=True)
+
+    return related
+
+
+def rebuild_debtor_identity_index(db: Session, *, tenant_id: int | None = None) -> dict[str, Any]:
+    scanned = 0
+    changed = 0
+    last_id = 0
+
+    while True:
+        query = db.query(Case).filter(Case.id > last_id)
+        if tenant_id is not None:
+            query = query.filter(Case.tenant_id == tenant_id)
+        cases = query.order_by(Case.id.asc()).limit(REBUILD_CHUNK_SIZE).all()
+        if not cases:
+            break
+
+        case_ids = [item.id for item in cases]
+        profiles = {
+            row.case_id: row
+            for row in db.query(DebtorProfile).filter(DebtorProfile.case_id.in_(case_ids)).all()
+        }
+        rows = {
+            row.case_id: row
+            for row in db.query(DebtorIdentity).filter(DebtorIdentity.case_id.in_(case_ids)).all()
+        }
+
+        for case in cases:
+            row = rows.get(case.id)
+            if not row:
+                row = DebtorIdentity(case_id=case.id)
+                db.add(row)
+            if _apply_keys(row, case, build_identity_keys(case, profiles.get(case.id))):
+                changed += 1
+
+        db.flush()
+        scanned += len(cases)
+        last_id = case_ids[-1]
+
+    return {
+        "ok": True,
+        "tenant_id": tenant_id,
+        "scanned_cases": scanned,
+        "updated_identities": changed,
+    }
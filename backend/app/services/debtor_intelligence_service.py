@@ -10,6 +10,7 @@ from backend.app.models.case import Case
 from backend.app.models.case_participant import CaseParticipant
 from backend.app.models.debtor_profile import DebtorProfile
 from backend.app.models.organization import Organization
+from backend.app.services.debtor_identity_service import find_related_cases
 
 
 def _as_str(value: Any) -> str:
@@ -18,10 +19,6 @@ def _as_str(value: Any) -> str:
     return str(value).strip()
 
 
-def _normalize_text(value: Any) -> str:
-    return _as_str(value).lower()
-
-
 def _safe_decimal(value: Any) -> Decimal:
     try:
         return Decimal(str(value or "0"))
@@ -77,43 +74,7 @@ def _find_related_cases(
     case: Case,
     debtor_profile: DebtorProfile | None,
 ) -> list[Case]:
-    identity = _extract_debtor_identity(case, debtor_profile)
-    current_inn = _as_str(identity.get("inn"))
-    current_ogrn = _as_str(identity.get("ogrn"))
-    current_name = _normalize_text(identity.get("name"))
-
-    query = (
-        db.query(Case)
-        .filter(Case.tenant_id == case.tenant_id)
-        .order_by(Case.id.desc())
-    )
-
-    related: list[Case] = []
-
-    for item in query.all():
-        item_profile = (
-            db.query(DebtorProfile)
-            .filter(DebtorProfile.case_id == item.id)
-            .first()
-        )
-        item_identity = _extract_debtor_identity(item, item_profile)
-
-        item_inn = _as_str(item_identity.get("inn"))
-        item_ogrn = _as_str(item_identity.get("ogrn"))
-        item_name = _normalize_text(item_identity.get("name"))
-
-        same = False
-        if current_inn and item_inn and current_inn == item_inn:
-            same = True
-        elif current_ogrn and item_ogrn and current_ogrn == item_ogrn:
-            same = True
-        elif current_name and item_name and current_name == item_name:
-            same = True
-
-        if same:
-            related.append(item)
-
-    return related
+    return find_related_cases(db, case, debtor_profile)
 
 
 def _serialize_related_cases(
@@ -0,0 +1,502 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from backend.app.config import (
+    DOCUMENT_EXPORT_CHUNK_SIZE,
+    DOCUMENT_EXPORT_DIR,
+    DOCUMENT_EXPORT_MAX_CASES,
+    DOCUMENT_EXPORT_PROCESSES,
+    WORKER_PROCESSES,
+)
+from backend.app.models import Case, DebtorProfile, DocumentExport
+from backend.app.services.case_service import get_projection_data
+from backend.app.services.document_cache_service import (
+    document_cache_key,
+    enforce_document_cache_limit,
+    get_cached_document,
+    store_cached_document,
+)
+from backend.app.services.document_render_service import (
+    get_document_renderer,
+    render_document,
+    warmup_document_renderers,
+)
+from backend.app.services.document_stage_service import get_available_documents_for_case
+from backend.app.services.job_queue_service import enqueue_job, update_job_progress
+from backend.app.services.legal_document_templates import (
+    build_legal_document_template,
+    is_supported_legal_document,
+)
+from backend.app.services.portfolio_query_service import resolve_case_ids_for_portfolio
+from backend.app.services.portfolio_view_service import get_portfolio_view_or_404
+
+
+DOCUMENT_EXPORT_JOB_TYPE = "document_bulk_export"
+MANIFEST_FILENAME = "manifest.json"
+
+
+def _load(value: str | None) -> Any:
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return None
+
+
+def _dump(value: Any) -> str | None:
+    if value is None:
+        return None
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _progress(export: DocumentExport) -> dict[str, Any]:
+    done = int(export.rendered_items or 0) + int(export.skipped_items or 0) + int(export.failed_items or 0)
+    return {
+        "export_id": export.id,
+        "status": export.status,
+        "total": int(export.total_items or 0),
+        "done": done,
+        "rendered": int(export.rendered_items or 0),
+        "skipped": int(export.skipped_items or 0),
+        "failed": int(export.failed_items or 0),
+    }
+
+
+def serialize_document_export(export: DocumentExport, *, include_manifest: bool = False) -> dict[str, Any]:
+    result = {
+        "id": export.id,
+        "tenant_id": export.tenant_id,
+        "document_code": export.document_code,
+        "format": export.format,
+        "status": export.status,
+        "view_id": export.view_id,
+        "job_id": export.job_id,
+        "progress": _progress(export),
+        "archive_size": export.archive_size,
+        "download_ready": export.status == "completed" and bool(export.archive_path),
+        "error_message": export.error_message,
+        "started_at": export.started_at.isoformat() if export.started_at else None,
+        "finished_at": export.finished_at.isoformat() if export.finished_at else None,
+        "created_at": export.created_at.isoformat() if export.created_at else None,
+    }
+    if include_manifest:
+        result["manifest"] = _load(export.manifest_json)
+    return result
+
+
+def _resolve_export_case_ids(
+    db: Session,
+    *,
+    tenant_id: int,
+    case_ids: list[int] | None,
+    view_id: int | None,
+    limit: int,
+) -> list[int]:
+    if view_id is not None:
+        view = get_portfolio_view_or_404(db, view_id=view_id, tenant_id=tenant_id)
+        sorting = dict(view.sorting or {})
+        return resolve_case_ids_for_portfolio(
+            db,
+            tenant_id=tenant_id,
+            filters=dict(view.filters or {}),
+            order_by=sorting.get("order_by") or "id_desc",
+            limit=limit,
+        )
+
+    requested = list(dict.fromkeys(int(case_id) for case_id in case_ids or []))
+    if not requested:
+        return []
+
+    found = {
+        case_id
+        for (case_id,) in db.query(Case.id).filter(
+            Case.tenant_id == tenant_id,
+            Case.id.in_(requested),
+        )
+    }
+    missing = [case_id for case_id in requested if case_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Cases not found for tenant: {missing}")
+
+    return requested
+
+
+def create_document_export(
+    db: Session,
+    *,
+    tenant_id: int,
+    document_code: str,
+    export_format: str = "pdf",
+    case_ids: list[int] | None = None,
+    view_id: int | None = None,
+    limit: int | None = None,
+) -> dict[str, Any]:
+    if not is_supported_legal_document(document_code):
+        raise HTTPException(status_code=422, detail=f"Unsupported document code: {document_code}")
+
+    export_format = (export_format or "").strip().lower()
+    try:
+        get_document_renderer(export_format)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    if view_id is None and not case_ids:
+        raise HTTPException(status_code=422, detail="Either view_id or case_ids is required")
+
+    resolved_ids = _resolve_export_case_ids(
+        db,
+        tenant_id=tenant_id,
+        case_ids=case_ids,
+        view_id=view_id,
+        limit=int(limit or DOCUMENT_EXPORT_MAX_CASES),
+    )
+    if not resolved_ids:
+        raise HTTPException(status_code=422, detail="Export resolved to empty case set")
+    if len(resolved_ids) > DOCUMENT_EXPORT_MAX_CASES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Too many cases for one export: {len(resolved_ids)} > {DOCUMENT_EXPORT_MAX_CASES}",
+        )
+
+    now = datetime.utcnow()
+    export = DocumentExport(
+        tenant_id=tenant_id,
+        document_code=document_code,
+        format=export_format,
+        status="pending",
+        view_id=view_id,
+        total_items=len(resolved_ids),
+        case_ids_json=_dump(resolved_ids),
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(export)
+    db.flush()
+
+    job = enqueue_job(
+        db,
+        tenant_id=tenant_id,
+        job_type=DOCUMENT_EXPORT_JOB_TYPE,
+        payload={"export_id": export.id},
+    )
+    export.job_id = job.id
+    update_job_progress(db, job_id=job.id, progress=_progress(export))
+    db.flush()
+
+    return {"ok": True, "export": serialize_document_export(export)}
+
+
+def get_document_export_or_404(db: Session, *, export_id: int, tenant_id: int) -> DocumentExport:
+    export = (
+        db.query(DocumentExport)
+        .filter(
+            DocumentExport.id == export_id,
+            DocumentExport.tenant_id == tenant_id,
+        )
+        .first()
+    )
+    if not export:
+        raise HTTPException(status_code=404, detail="Document export not found")
+    return export
+
+
+def _archive_path(export: DocumentExport) -> Path:
+    return (
+        Path(DOCUMENT_EXPORT_DIR)
+        / f"tenant_{export.tenant_id}"
+        / f"export_{export.id}_{export.document_code}.zip"
+    )
+
+
+def _prepare_chunk(
+    db: Session,
+    export: DocumentExport,
+    case_ids: list[int],
+) -> tuple[list[tuple[dict[str, Any], dict[str, Any]]], list[dict[str, Any]]]:
+    # Шаблоны собираются в основном процессе (нужна БД), в пул уходят только dict.
+    cases = {
+        case.id: case
+        for case in db.query(Case).filter(
+            Case.tenant_id == export.tenant_id,
+            Case.id.in_(case_ids),
+        )
+    }
+    profiles = {
+        profile.case_id: profile
+        for profile in db.query(DebtorProfile).filter(DebtorProfile.case_id.in_(case_ids))
+    }
+
+    to_render: list[tuple[dict[str, Any], dict[str, Any]]] = []
+    finished: list[dict[str, Any]] = []
+
+    for case_id in case_ids:
+        entry: dict[str, Any] = {"case_id": case_id}
+        case = cases.get(case_id)
+        if case is None:
+            finished.append({**entry, "status": "failed", "error": "Case not found"})
+            continue
+
+        document_meta = next(
+            (
+                item
+                for item in get_available_documents_for_case(case)
+                if item.get("code") == export.document_code
+            ),
+            None,
+        )
+        if document_meta is None or not document_meta.get("ready"):
+            finished.append(
+                {
+                    **entry,
+                    "status": "skipped",
+                    "missing_fields": list((document_meta or {}).get("missing_fields") or []),
+                }
+            )
+            continue
+
+        try:
+            template = build_legal_document_template(
+                db=db,
+                tenant_id=case.tenant_id,
+                document_code=export.document_code,
+                case=case,
+                projection=get_projection_data(db, case.id),
+                debtor_profile=profiles.get(case.id),
+            )
+        except ValueError as exc:
+            finished.append({**entry, "status": "failed", "error": str(exc)})
+            continue
+
+        entry["filename"] = f"case_{case_id}_{template['file_stub']}.{export.format}"
+        entry["cache_key"] = document_cache_key(
+            document_code=export.document_code,
+            export_format=export.format,
+            template=template,
+        )
+        to_render.append((entry, template))
+
+    return to_render, finished
+
+
+def _write_rendered(archive: zipfile.ZipFile, entry: dict[str, Any], content: bytes) -> dict[str, Any]:
+    archive.writestr(entry["filename"], content)
+    return {
+        **entry,
+        "status": "rendered",
+        "size": len(content),
+        "sha256": hashlib.sha256(content).hexdigest(),
+    }
+
+
+def _render_chunk(
+    archive: zipfile.ZipFile,
+    pool: ProcessPoolExecutor | None,
+    *,
+    tenant_id: int,
+    export_format: str,
+    to_render: list[tuple[dict[str, Any], dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    pending: list[tuple[dict[str, Any], dict[str, Any]]] = []
+
+    # Документы из кэша берём с диска, рендерим только промахи.
+    for entry, template in to_render:
+        cached_path = get_cached_document(
+            tenant_id=tenant_id,
+            key=entry["cache_key"],
+            export_format=export_format,
+        )
+        try:
+            content = cached_path.read_bytes() if cached_path is not None else None
+        except FileNotFoundError:
+            # Файл мог вытеснить параллельный enforce_document_cache_limit — считаем промахом.
+            content = None
+        if content is None:
+            pending.append((entry, template))
+            continue
+        results.append({**_write_rendered(archive, entry, content), "cached": True})
+
+    def _store(entry: dict[str, Any], content: bytes) -> dict[str, Any]:
+        store_cached_document(
+            tenant_id=tenant_id,
+            key=entry["cache_key"],
+            export_format=export_format,
+            content=content,
+            enforce_limit=False,
+        )
+        return {**_write_rendered(archive, entry, content), "cached": False}
+
+    if pool is None:
+        for entry, template in pending:
+            try:
+                results.append(_store(entry, render_document(export_format, template)))
+            except Exception as exc:
+                results.append({**entry, "status": "failed", "error": f"{type(exc).__name__}: {exc}"})
+        return results
+
+    futures: dict[Future, dict[str, Any]] = {
+        pool.submit(render_document, export_format, template): entry
+        for entry, template in pending
+    }
+    # Пишем в архив по мере готовности, не дожидаясь всей пачки.
+    for future in as_completed(futures):
+        entry = futures[future]
+        try:
+            results.append(_store(entry, future.result()))
+        except Exception as exc:
+            results.append({**entry, "status": "failed", "error": f"{type(exc).__name__}: {exc}"})
+    return results
+
+
+def _apply_results(export: DocumentExport, results: list[dict[str, Any]]) -> None:
+    for item in results:
+        if item["status"] == "rendered":
+            export.rendered_items = int(export.rendered_items or 0) + 1
+        elif item["status"] == "skipped":
+            export.skipped_items = int(export.skipped_items or 0) + 1
+        else:
+            export.failed_items = int(export.failed_items or 0) + 1
+
+
+_render_pool_instance: ProcessPoolExecutor | None = None
+_render_pool_lock = threading.Lock()
+
+
+def render_pool_size() -> int:
+    # Бюджет DOCUMENT_EXPORT_PROCESSES делится между процессами воркера.
+    return max(DOCUMENT_EXPORT_PROCESSES // max(WORKER_PROCESSES, 1), 1)
+
+
+def _render_pool(processes: int) -> ProcessPoolExecutor | None:
+    global _render_pool_instance
+
+    if processes <= 1:
+        return None
+
+    # Один пул на процесс для всех выгрузок: прогрев reportlab/docx оплачивается один раз.
+    with _render_pool_lock:
+        if _render_pool_instance is None or getattr(_render_pool_instance, "_broken", False):
+            # spawn: воркер очереди многопоточный и держит соединения с БД, fork здесь небезопасен.
+            _render_pool_instance = ProcessPoolExecutor(
+                max_workers=render_pool_size(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warmup_document_renderers,
+            )
+        return _render_pool_instance
+
+
+def shutdown_render_pool() -> None:
+    global _render_pool_instance
+
+    with _render_pool_lock:
+        pool, _render_pool_instance = _render_pool_instance, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def execute_document_export(
+    db: Session,
+    *,
+    export_id: int,
+    tenant_id: int,
+    processes: int | None = None,
+    chunk_size: int | None = None,
+) -> dict[str, Any]:
+    export = get_document_export_or_404(db, export_id=export_id, tenant_id=tenant_id)
+    if export.status == "completed":
+        return {"ok": True, "export": serialize_document_export(export)}
+
+    case_ids = [int(case_id) for case_id in _load(export.case_ids_json) or []]
+    chunk_size = max(int(chunk_size or DOCUMENT_EXPORT_CHUNK_SIZE), 1)
+    processes = max(int(processes or render_pool_size()), 1)
+
+    export.status = "running"
+    export.started_at = datetime.utcnow()
+    export.finished_at = None
+    export.error_message = None
+    export.rendered_items = 0
+    export.skipped_items = 0
+    export.failed_items = 0
+    db.add(export)
+    update_job_progress(db, job_id=export.job_id, progress=_progress(export))
+    db.commit()
+
+    archive_path = _archive_path(export)
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = archive_path.with_name(archive_path.name + ".part")
+    manifest_items: list[dict[str, Any]] = []
+    positions = {case_id: index for index, case_id in enumerate(case_ids)}
+    pool = _render_pool(min(processes, len(case_ids)))
+
+    try:
+        with zipfile.ZipFile(partial_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for offset in range(0, len(case_ids), chunk_size):
+                chunk = case_ids[offset:offset + chunk_size]
+                to_render, finished = _prepare_chunk(db, export, chunk)
+                results = finished + _render_chunk(
+                    archive,
+                    pool,
+                    tenant_id=export.tenant_id,
+                    export_format=export.format,
+                    to_render=to_render,
+                )
+                enforce_document_cache_limit(tenant_id=export.tenant_id)
+
+                manifest_items.extend(results)
+                _apply_results(export, results)
+                db.add(export)
+                update_job_progress(db, job_id=export.job_id, progress=_progress(export))
+                # Коммит на пачку: прогресс виден через job queue, пока выгрузка идёт.
+                db.commit()
+
+            manifest = {
+                "export_id": export.id,
+                "document_code": export.document_code,
+                "format": export.format,
+                "generated_at": datetime.utcnow().isoformat(),
+                "total": export.total_items,
+                "rendered": export.rendered_items,
+                "skipped": export.skipped_items,
+                "failed": export.failed_items,
+                "items": sorted(manifest_items, key=lambda item: positions[item["case_id"]]),
+            }
+            archive.writestr(MANIFEST_FILENAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+
+        os.replace(partial_path, archive_path)
+    except Exception as exc:
+        db.rollback()
+        if partial_path.exists():
+            partial_path.unlink()
+        export.status = "failed"
+        export.error_message = f"{type(exc).__name__}: {exc}"[:2000]
+        export.finished_at = datetime.utcnow()
+        db.add(export)
+        update_job_progress(db, job_id=export.job_id, progress=_progress(export))
+        db.commit()
+        raise
+
+    # Пропущенные и упавшие дела не валят выгрузку: причины — в manifest.json.
+    export.status = "completed"
+    export.archive_path = str(archive_path)
+    export.archive_size = archive_path.stat().st_size
+    export.manifest_json = _dump(manifest)
+    export.finished_at = datetime.utcnow()
+    db.add(export)
+    update_job_progress(db, job_id=export.job_id, progress=_progress(export))
+    db.flush()
+
+    return {"ok": True, "export": serialize_document_export(export)}
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from backend.app.config import DOCUMENT_CACHE_DIR, DOCUMENT_CACHE_MAX_BYTES_PER_TENANT
+from backend.app.services.document_render_service import DOCUMENT_RENDER_VERSION
+from backend.app.services.legal_document_templates import LEGAL_DOCUMENT_TEMPLATE_VERSION
+from backend.app.services.storage_service import LocalStorageService
+
+
+# Ключ — хэш всего, что влияет на байты файла. Изменились данные дела,
+# шаблон или вёрстка — изменился ключ; явная инвалидация не нужна.
+def document_cache_key(*, document_code: str, export_format: str, template: dict[str, Any]) -> str:
+    material = {
+        "document_code": document_code,
+        "format": export_format,
+        "template_version": LEGAL_DOCUMENT_TEMPLATE_VERSION,
+        "render_version": DOCUMENT_RENDER_VERSION,
+        "template": template,
+    }
+    encoded = json.dumps(material, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _storage() -> LocalStorageService:
+    return LocalStorageService(base_dir=DOCUMENT_CACHE_DIR)
+
+
+def _cache_filename(key: str, export_format: str) -> str:
+    return f"{key}.{export_format}"
+
+
+def get_cached_document(*, tenant_id: int, key: str, export_format: str) -> Path | None:
+    path = _storage().path_for(tenant_id=tenant_id, filename=_cache_filename(key, export_format))
+    try:
+        # mtime служит отметкой последнего обращения для LRU.
+        os.utime(path, None)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def store_cached_document(
+    *,
+    tenant_id: int,
+    key: str,
+    export_format: str,
+    content: bytes,
+    enforce_limit: bool = True,
+) -> Path:
+    path = Path(
+        _storage().save_bytes(
+            tenant_id=tenant_id,
+            filename=_cache_filename(key, export_format),
+            content=content,
+        )
+    )
+    if enforce_limit:
+        enforce_document_cache_limit(tenant_id=tenant_id, keep=path)
+    return path
+
+
+def enforce_document_cache_limit(
+    *,
+    tenant_id: int,
+    max_bytes: int | None = None,
+    keep: Path | None = None,
+) -> int:
+    max_bytes = DOCUMENT_CACHE_MAX_BYTES_PER_TENANT if max_bytes is None else max_bytes
+    tenant_dir = _storage().tenant_dir(tenant_id)
+
+    entries: list[tuple[float, int, Path]] = []
+    total = 0
+    try:
+        with os.scandir(tenant_dir) as items:
+            for item in items:
+                if not item.is_file() or item.name.startswith("."):
+                    continue
+                stat = item.stat()
+                entries.append((stat.st_mtime, stat.st_size, Path(item.path)))
+                total += stat.st_size
+    except FileNotFoundError:
+        return 0
+
+    removed = 0
+    # Вытесняем самые давно использованные, пока не уложимся в лимит тенанта.
+    for _mtime, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        if keep is not None and path == keep:
+            continue
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+
+    return removed
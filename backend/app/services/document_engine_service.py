@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterator
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from backend.app.config import DOCUMENT_TEMPLATE_BATCH_MAX_CASES, STREAM_YIELD_PER
 from backend.app.models import Case, DocumentTemplate, GeneratedDocument
-from backend.app.services.storage_service import LocalStorageService
+from backend.app.services.document_template_engine import (
+    CompiledTemplate,
+    TemplateSyntaxError,
+    compile_template,
+    get_compiled_template,
+)
+from backend.app.services.storage_service import get_blob_store
 
 
 def _serialize_template(item: DocumentTemplate) -> dict[str, Any]:
@@ -26,7 +33,11 @@ def _serialize_template(item: DocumentTemplate) -> dict[str, Any]:
     }
 
 
-def _serialize_generated(item: GeneratedDocument) -> dict[str, Any]:
+def _serialize_generated(
+    item: GeneratedDocument,
+    *,
+    rendered_content: str | None = None,
+) -> dict[str, Any]:
     return {
         "id": item.id,
         "tenant_id": item.tenant_id,
@@ -38,7 +49,10 @@ def _serialize_generated(item: GeneratedDocument) -> dict[str, Any]:
         "format": item.format,
         "file_path": item.file_path,
         "storage_provider": item.storage_provider,
-        "rendered_content": item.rendered_content,
+        "content_hash": item.content_hash,
+        "content_size": item.content_size,
+        # Тело документа лежит в blob-хранилище; в строке остаётся только у старых записей.
+        "rendered_content": rendered_content if rendered_content is not None else item.rendered_content,
         "context_snapshot": item.context_snapshot or {},
         "meta": item.meta or {},
         "created_at": item.created_at.isoformat() if item.created_at else None,
@@ -52,6 +66,11 @@ def create_document_template(
     tenant_id: int,
     payload: dict[str, Any],
 ) -> dict[str, Any]:
+    try:
+        compile_template(payload["template_body"])
+    except TemplateSyntaxError as exc:
+        raise HTTPException(status_code=422, detail=f"Invalid template body: {exc}")
+
     item = DocumentTemplate(
         tenant_id=tenant_id,
         code=payload["code"],
@@ -115,26 +134,11 @@ def _build_case_context(case: Case) -> dict[str, Any]:
     }
 
 
-def _render_template(template_body: str, context: dict[str, Any]) -> str:
-    rendered = template_body
-
-    flat_values = {
-        "case_id": context.get("case_id"),
-        "debtor_name": context.get("debtor_name"),
-        "debtor_type": context.get("debtor_type"),
-        "contract_type": context.get("contract_type"),
-        "principal_amount": context.get("principal_amount"),
-        "due_date": context.get("due_date"),
-        "debtor_inn": (context.get("debtor") or {}).get("inn"),
-        "debtor_ogrn": (context.get("debtor") or {}).get("ogrn"),
-        "debtor_address": (context.get("debtor") or {}).get("address"),
-        "debtor_director_name": (context.get("debtor") or {}).get("director_name"),
-    }
-
-    for key, value in flat_values.items():
-        rendered = rendered.replace(f"{{{{{key}}}}}", "" if value is None else str(value))
-
-    return rendered
+def _compile_template_or_422(template: DocumentTemplate) -> CompiledTemplate:
+    try:
+        return get_compiled_template(template)
+    except TemplateSyntaxError as exc:
+        raise HTTPException(status_code=422, detail=f"Invalid template body: {exc}")
 
 
 def generate_document_for_case(
@@ -191,16 +195,9 @@ def generate_document_for_case(
         raise HTTPException(status_code=404, detail="Document template not found")
 
     context = _build_case_context(case)
-    rendered = _render_template(template.template_body, context)
+    rendered = _compile_template_or_422(template).render(context)
 
-    storage = LocalStorageService()
-    filename = f"{template.code}_case_{case.id}.{fmt}"
-    path = storage.save_text(
-        tenant_id=tenant_id,
-        case_id=case.id,
-        filename=filename,
-        content=rendered,
-    )
+    blob = get_blob_store().put_text(rendered)
 
     item = GeneratedDocument(
         tenant_id=tenant_id,
@@ -210,9 +207,11 @@ def generate_document_for_case(
         title=template.title,
         status="generated",
         format=fmt,
-        file_path=path,
-        storage_provider="local",
-        rendered_content=rendered,
+        file_path=None,
+        storage_provider=blob.provider,
+        content_hash=blob.content_hash,
+        content_size=blob.size,
+        rendered_content=None,
         context_snapshot=context,
         meta=payload.get("meta") or {},
     )
@@ -221,7 +220,37 @@ def generate_document_for_case(
     db.flush()
     db.refresh(item)
 
-    return {"ok": True, "document": _serialize_generated(item)}
+    return {"ok": True, "document": _serialize_generated(item, rendered_content=rendered)}
+
+
+def get_generated_document_or_404(
+    db: Session,
+    *,
+    tenant_id: int,
+    document_id: int,
+) -> GeneratedDocument:
+    item = (
+        db.query(GeneratedDocument)
+        .filter(
+            GeneratedDocument.id == document_id,
+            GeneratedDocument.tenant_id == tenant_id,
+        )
+        .first()
+    )
+    if not item:
+        raise HTTPException(status_code=404, detail="Generated document not found")
+    return item
+
+
+def open_generated_document_stream(item: GeneratedDocument) -> Iterator[bytes]:
+    if not item.content_hash:
+        # Документы до перехода на blob-хранилище отдаём из строки БД.
+        return iter([(item.rendered_content or "").encode("utf-8")])
+
+    try:
+        return get_blob_store(item.storage_provider).open_stream(item.content_hash)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Generated document content not found")
 
 
 def list_generated_documents(
@@ -240,4 +269,75 @@ def list_generated_documents(
         .all()
     )
 
-    return {"case_id": case_id, "items": [_serialize_generated(item) for item in items]}
\ No newline at end of file
+    return {"case_id": case_id, "items": [_serialize_generated(item) for item in items]}
+
+
+def prepare_document_template_batch(
+    db: Session,
+    *,
+    tenant_id: int,
+    template_id: int,
+    case_ids: list[int],
+) -> tuple[dict[str, Any], CompiledTemplate, list[int]]:
+    requested = list(dict.fromkeys(int(case_id) for case_id in case_ids))
+    if not requested:
+        raise HTTPException(status_code=422, detail="case_ids is required")
+    if len(requested) > DOCUMENT_TEMPLATE_BATCH_MAX_CASES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Batch exceeds {DOCUMENT_TEMPLATE_BATCH_MAX_CASES} cases",
+        )
+
+    template = (
+        db.query(DocumentTemplate)
+        .filter(
+            DocumentTemplate.id == template_id,
+            DocumentTemplate.tenant_id == tenant_id,
+            DocumentTemplate.is_active.is_(True),
+        )
+        .first()
+    )
+    if not template:
+        raise HTTPException(status_code=404, detail="Document template not found")
+
+    # Ошибки шаблона отдаются до начала потока, пока ещё можно вернуть 422.
+    compiled = _compile_template_or_422(template)
+
+    header = {
+        "template_id": template.id,
+        "code": template.code,
+        "total_requested": len(requested),
+    }
+    return header, compiled, requested
+
+
+def iter_document_template_batch(
+    db: Session,
+    *,
+    tenant_id: int,
+    compiled: CompiledTemplate,
+    case_ids: list[int],
+) -> Iterator[dict[str, Any]]:
+    cases = (
+        db.query(Case)
+        .filter(
+            Case.tenant_id == tenant_id,
+            Case.id.in_(case_ids),
+        )
+        .order_by(Case.id.asc())
+        .yield_per(STREAM_YIELD_PER)
+    )
+
+    # Шаблон компилируется один раз, на каждое дело — только сборка контекста и склейка.
+    rendered_ids: set[int] = set()
+    for case in cases:
+        rendered_ids.add(case.id)
+        yield {
+            "case_id": case.id,
+            "status": "rendered",
+            "rendered_content": compiled.render(_build_case_context(case)),
+        }
+
+    for case_id in case_ids:
+        if case_id not in rendered_ids:
+            yield {"case_id": case_id, "status": "missing"}
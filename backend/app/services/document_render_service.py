@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import threading
+import zipfile
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from reportlab.lib.enums import TA_JUSTIFY, TA_LEFT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+
+# Рендер без обращения к БД: модуль импортируется и в процессах пула массовой выгрузки.
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+PDF_MEDIA_TYPE = "application/pdf"
+DOCX_MAIN_PART = "word/document.xml"
+# Повышать при изменении вёрстки DOCX/PDF: версия входит в ключ кэша документов.
+DOCUMENT_RENDER_VERSION = 1
+
+
+def _apply_docx_default_font(document: Document) -> None:
+    styles = document.styles
+
+    normal = styles["Normal"]
+    normal.font.name = "Times New Roman"
+    normal.font.size = Pt(12)
+    normal._element.rPr.rFonts.set(qn("w:eastAsia"), "Times New Roman")
+
+    if "Title" in styles:
+        title = styles["Title"]
+        title.font.name = "Times New Roman"
+        title.font.size = Pt(14)
+        title._element.rPr.rFonts.set(qn("w:eastAsia"), "Times New Roman")
+
+
+# Ресурсы рендера собираются один раз на процесс: шрифты, стили и
+# заготовка DOCX. На каждый документ строится только его содержимое.
+@lru_cache(maxsize=None)
+def _docx_base_bytes() -> bytes:
+    document = Document()
+    _apply_docx_default_font(document)
+    output = BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+@lru_cache(maxsize=None)
+def _docx_static_entries() -> tuple[tuple[str, bytes], ...]:
+    # Все части пакета, кроме word/document.xml, от документа к документу не меняются.
+    with zipfile.ZipFile(BytesIO(_docx_base_bytes())) as base:
+        return tuple(
+            (name, base.read(name))
+            for name in base.namelist()
+        )
+
+
+_docx_local = threading.local()
+
+
+def _docx_workspace() -> Document:
+    # python-docx не потокобезопасен: у каждого потока своя копия заготовки.
+    document = getattr(_docx_local, "document", None)
+    if document is None:
+        document = Document(BytesIO(_docx_base_bytes()))
+        _docx_local.document = document
+
+    body = document.element.body
+    for child in list(body):
+        if child.tag != qn("w:sectPr"):
+            body.remove(child)
+    return document
+
+
+def render_docx(template: dict[str, Any]) -> bytes:
+    document = _docx_workspace()
+
+    title = document.add_paragraph(style="Title")
+    title.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    title.add_run(template["title"]).bold = True
+
+    document.add_paragraph("")
+
+    # Шрифт и кегль наследуются от стиля Normal заготовки.
+    for paragraph in template["paragraphs"]:
+        p = document.add_paragraph(paragraph or "")
+        p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY if paragraph else WD_ALIGN_PARAGRAPH.LEFT
+
+    document_xml = document.part.blob
+
+    output = BytesIO()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in _docx_static_entries():
+            archive.writestr(name, document_xml if name == DOCX_MAIN_PART else data)
+
+    return output.getvalue()
+
+
+@lru_cache(maxsize=None)
+def _pdf_font_name() -> str:
+    candidates = [
+        ("DejaVuSerif", "/usr/share/fonts/truetype/dejavu/DejaVuSerif.ttf"),
+        ("LiberationSerif", "/usr/share/fonts/truetype/liberation2/LiberationSerif-Regular.ttf"),
+    ]
+
+    registered = set(pdfmetrics.getRegisteredFontNames())
+
+    for font_name, font_path in candidates:
+        if font_name in registered:
+            return font_name
+
+        if Path(font_path).exists():
+            try:
+                pdfmetrics.registerFont(TTFont(font_name, font_path))
+                return font_name
+            except Exception:
+                continue
+
+    return "Times-Roman"
+
+
+@lru_cache(maxsize=None)
+def _pdf_styles() -> tuple[ParagraphStyle, ParagraphStyle]:
+    font_name = _pdf_font_name()
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        "DebtrixTitle",
+        parent=styles["Heading1"],
+        fontName=font_name,
+        fontSize=14,
+        leading=18,
+        alignment=TA_LEFT,
+        spaceAfter=10,
+    )
+    body_style = ParagraphStyle(
+        "DebtrixBody",
+        parent=styles["BodyText"],
+        fontName=font_name,
+        fontSize=11,
+        leading=15,
+        alignment=TA_JUSTIFY,
+        spaceAfter=7,
+    )
+    return title_style, body_style
+
+
+def render_pdf(template: dict[str, Any]) -> bytes:
+    title_style, body_style = _pdf_styles()
+
+    output = BytesIO()
+    doc = SimpleDocTemplate(
+        output,
+        pagesize=A4,
+        leftMargin=20 * mm,
+        rightMargin=20 * mm,
+        topMargin=18 * mm,
+        bottomMargin=18 * mm,
+    )
+
+    story = [Paragraph(template["title"], title_style), Spacer(1, 4)]
+
+    for paragraph in template["paragraphs"]:
+        if not paragraph:
+            story.append(Spacer(1, 8))
+            continue
+
+        safe_text = (
+            paragraph.replace("&", "&amp;")
+            .replace("<", "&lt;")
+            .replace(">", "&gt;")
+        )
+        story.append(Paragraph(safe_text, body_style))
+
+    doc.build(story)
+
+    return output.getvalue()
+
+
+_RENDERERS = {
+    "docx": render_docx,
+    "pdf": render_pdf,
+}
+
+
+def get_document_renderer(export_format: str):
+    normalized = (export_format or "").strip().lower()
+    renderer = _RENDERERS.get(normalized)
+    if not renderer:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    return renderer
+
+
+def render_document(export_format: str, template: dict[str, Any]) -> bytes:
+    return get_document_renderer(export_format)(template)
+
+
+_WARMUP_TEMPLATE = {"title": "warmup", "paragraphs": ["warmup", ""]}
+
+
+def warmup_document_renderers() -> None:
+    # Первый рендер тянет ленивые импорты reportlab и кэши выше.
+    for renderer in _RENDERERS.values():
+        renderer(_WARMUP_TEMPLATE)
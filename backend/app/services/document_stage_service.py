@@ -29,6 +29,10 @@ def get_available_documents(db: Session, case_id: int) -> list[dict[str, Any]]:
     if not case:
         return []
 
+    return get_available_documents_for_case(case)
+
+
+def get_available_documents_for_case(case: Case) -> list[dict[str, Any]]:
     common_missing = _required_common_fields(case)
 
     documents = [
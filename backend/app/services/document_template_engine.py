@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Iterable
+
+from backend.app.config import DOCUMENT_TEMPLATE_CACHE_SIZE
+from backend.app.models import DocumentTemplate
+from backend.app.services.legal_document_templates import format_document_date, format_document_money
+
+
+class TemplateSyntaxError(ValueError):
+    pass
+
+
+PLACEHOLDER_RE = re.compile(r"\{\{(.*?)\}\}", re.S)
+PATH_SEGMENT_RE = re.compile(r"^(?:[A-Za-z_]\w*|\d+)$")
+
+# Плоские ключи старых шаблонов продолжают работать как псевдонимы вложенных путей.
+LEGACY_PLACEHOLDER_ALIASES: dict[str, tuple[str, ...]] = {
+    "debtor_inn": ("debtor", "inn"),
+    "debtor_ogrn": ("debtor", "ogrn"),
+    "debtor_address": ("debtor", "address"),
+    "debtor_director_name": ("debtor", "director_name"),
+}
+
+
+def _filter_money(value: Any, arg: str | None) -> str:
+    formatted = format_document_money(value)
+    return f"{formatted} {arg}" if arg else formatted
+
+
+def _filter_date(value: Any, arg: str | None) -> str:
+    if not arg:
+        return format_document_date(value)
+
+    if isinstance(value, (date, datetime)):
+        return value.strftime(arg)
+
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).strftime(arg)
+    except Exception:
+        return format_document_date(value)
+
+
+def _filter_default(value: Any, arg: str | None) -> Any:
+    if value is None or value == "":
+        return arg or ""
+    return value
+
+
+TemplateFilter = Callable[[Any, "str | None"], Any]
+
+_TEMPLATE_FILTERS: dict[str, TemplateFilter] = {
+    "money": _filter_money,
+    "date": _filter_date,
+    "default": _filter_default,
+    "upper": lambda value, _arg: None if value is None else str(value).upper(),
+    "lower": lambda value, _arg: None if value is None else str(value).lower(),
+    "trim": lambda value, _arg: None if value is None else str(value).strip(),
+}
+
+
+def get_template_filter(name: str) -> TemplateFilter:
+    normalized = (name or "").strip().lower()
+    template_filter = _TEMPLATE_FILTERS.get(normalized)
+    if not template_filter:
+        raise TemplateSyntaxError(f"Unknown template filter: {name}")
+    return template_filter
+
+
+@dataclass(frozen=True)
+class _Placeholder:
+    path: tuple[str | int, ...]
+    filters: tuple[tuple[TemplateFilter, str | None], ...]
+
+
+def _parse_path(expression: str) -> tuple[str | int, ...]:
+    if expression in LEGACY_PLACEHOLDER_ALIASES:
+        return LEGACY_PLACEHOLDER_ALIASES[expression]
+
+    segments = expression.split(".")
+    if not all(PATH_SEGMENT_RE.match(segment) for segment in segments):
+        raise TemplateSyntaxError(f"Invalid placeholder path: {expression}")
+
+    return tuple(int(segment) if segment.isdigit() else segment for segment in segments)
+
+
+def _parse_filter(expression: str) -> tuple[TemplateFilter, str | None]:
+    name, _, arg = expression.partition(":")
+    arg = arg.strip()
+    if len(arg) >= 2 and arg[0] == arg[-1] and arg[0] in "\"'":
+        arg = arg[1:-1]
+    return get_template_filter(name), (arg or None)
+
+
+def _parse_placeholder(expression: str) -> _Placeholder:
+    path_part, *filter_parts = [part.strip() for part in expression.split("|")]
+    if not path_part:
+        raise TemplateSyntaxError("Empty placeholder")
+
+    return _Placeholder(
+        path=_parse_path(path_part),
+        filters=tuple(_parse_filter(part) for part in filter_parts),
+    )
+
+
+def _resolve(context: Any, path: tuple[str | int, ...]) -> Any:
+    value = context
+    for segment in path:
+        if isinstance(value, dict):
+            value = value.get(segment if isinstance(segment, str) else str(segment))
+        elif isinstance(segment, int) and isinstance(value, (list, tuple)) and segment < len(value):
+            value = value[segment]
+        else:
+            return None
+        if value is None:
+            return None
+    return value
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    tokens: tuple[str | _Placeholder, ...]
+
+    @property
+    def placeholders(self) -> list[tuple[str | int, ...]]:
+        return [token.path for token in self.tokens if isinstance(token, _Placeholder)]
+
+    def render(self, context: dict[str, Any]) -> str:
+        parts: list[str] = []
+        append = parts.append
+
+        for token in self.tokens:
+            if token.__class__ is str:
+                append(token)
+                continue
+
+            value = _resolve(context, token.path)
+            for template_filter, arg in token.filters:
+                value = template_filter(value, arg)
+            append("" if value is None else str(value))
+
+        return "".join(parts)
+
+    def render_many(self, contexts: Iterable[dict[str, Any]]) -> list[str]:
+        render = self.render
+        return [render(context) for context in contexts]
+
+
+def compile_template(template_body: str) -> CompiledTemplate:
+    tokens: list[str | _Placeholder] = []
+    position = 0
+
+    # Один проход регуляркой: дальше рендер только склеивает готовые куски.
+    for match in PLACEHOLDER_RE.finditer(template_body or ""):
+        if match.start() > position:
+            tokens.append(template_body[position:match.start()])
+        tokens.append(_parse_placeholder(match.group(1).strip()))
+        position = match.end()
+
+    if position < len(template_body or ""):
+        tokens.append(template_body[position:])
+
+    return CompiledTemplate(tokens=tuple(tokens))
+
+
+_compiled_cache: OrderedDict[int, tuple[Any, CompiledTemplate]] = OrderedDict()
+_compiled_cache_lock = threading.Lock()
+
+
+def get_compiled_template(template: DocumentTemplate) -> CompiledTemplate:
+    stamp = template.updated_at
+
+    with _compiled_cache_lock:
+        cached = _compiled_cache.get(template.id)
+        if cached is not None and cached[0] == stamp:
+            _compiled_cache.move_to_end(template.id)
+            return cached[1]
+
+    compiled = compile_template(template.template_body)
+
+    with _compiled_cache_lock:
+        _compiled_cache[template.id] = (stamp, compiled)
+        _compiled_cache.move_to_end(template.id)
+        while len(_compiled_cache) > DOCUMENT_TEMPLATE_CACHE_SIZE:
+            _compiled_cache.popitem(last=False)
+
+    return compiled
+
+
+def invalidate_compiled_template(template_id: int | None = None) -> None:
+    with _compiled_cache_lock:
+        if template_id is None:
+            _compiled_cache.clear()
+        else:
+            _compiled_cache.pop(template_id, None)
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import ast
+import threading
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from types import CodeType
 from typing import Any
 
 
@@ -40,41 +45,153 @@ def build_case_eligibility_context(case: Any) -> dict[str, Any]:
     }
 
 
-def eval_eligibility_expr(expr: str | None, context: dict[str, Any]) -> tuple[bool, str | None]:
+_ALLOWED_NODES: tuple[type[ast.AST], ...] = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.And,
+    ast.Or,
+    ast.UnaryOp,
+    ast.Not,
+    ast.Compare,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.In,
+    ast.NotIn,
+    ast.Is,
+    ast.IsNot,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.List,
+    ast.Tuple,
+    ast.Set,
+)
+
+
+@dataclass(frozen=True)
+class CompiledEligibility:
+    expr: str | None
+    code: CodeType | None = None
+    error: str | None = None
+
+    def evaluate(self, context: dict[str, Any]) -> tuple[bool, str | None]:
+        if self.error:
+            return False, f"eligibility_eval_error: {self.error}"
+        if self.code is None:
+            return True, None
+
+        try:
+            return bool(eval(self.code, {"__builtins__": {}}, context)), None
+        except Exception as exc:
+            return False, f"eligibility_eval_error: {exc}"
+
+
+def _validate_expr_tree(tree: ast.AST) -> None:
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"unsupported expression element: {type(node).__name__}")
+
+
+@lru_cache(maxsize=2048)
+def compile_eligibility_expr(expr: str | None) -> CompiledEligibility:
     if not expr:
-        return True, None
-
-    safe_globals: dict[str, Any] = {"__builtins__": {}}
-    safe_locals = dict(context)
+        return CompiledEligibility(expr=expr)
 
     try:
-        result = bool(eval(expr, safe_globals, safe_locals))
-        return result, None
-    except Exception as exc:
-        return False, f"eligibility_eval_error: {exc}"
+        tree = ast.parse(expr.strip(), mode="eval")
+        _validate_expr_tree(tree)
+        code = compile(tree, "<eligibility_expr>", "eval")
+    except (SyntaxError, ValueError) as exc:
+        return CompiledEligibility(expr=expr, error=str(exc))
 
+    return CompiledEligibility(expr=expr, code=code)
 
-def compute_blockers_for_step(step: Any, context: dict[str, Any]) -> list[dict[str, Any]]:
-    blockers: list[dict[str, Any]] = []
 
-    ok, eval_error = eval_eligibility_expr(getattr(step, "eligibility_expr", None), context)
+# Скомпилированные выражения шагов по (playbook_id, version).
+_PLAYBOOK_ELIGIBILITY_CACHE: dict[tuple[int, int], dict[int, CompiledEligibility]] = {}
+_PLAYBOOK_ELIGIBILITY_LOCK = threading.Lock()
+
+
+def compile_playbook_eligibility(playbook: Any, steps: list[Any]) -> dict[int, CompiledEligibility]:
+    key = (int(playbook.id), int(playbook.version or 0))
+
+    with _PLAYBOOK_ELIGIBILITY_LOCK:
+        cached = _PLAYBOOK_ELIGIBILITY_CACHE.get(key)
+    if cached is not None and all(step.id in cached for step in steps):
+        return cached
+
+    compiled = {
+        step.id: compile_eligibility_expr(getattr(step, "eligibility_expr", None))
+        for step in steps
+    }
+    with _PLAYBOOK_ELIGIBILITY_LOCK:
+        _PLAYBOOK_ELIGIBILITY_CACHE[key] = compiled
+    return compiled
+
+
+def invalidate_eligibility_cache(playbook_id: int | None = None) -> None:
+    with _PLAYBOOK_ELIGIBILITY_LOCK:
+        if playbook_id is None:
+            _PLAYBOOK_ELIGIBILITY_CACHE.clear()
+        else:
+            for key in [item for item in _PLAYBOOK_ELIGIBILITY_CACHE if item[0] == playbook_id]:
+                del _PLAYBOOK_ELIGIBILITY_CACHE[key]
+
+    if playbook_id is None:
+        compile_eligibility_expr.cache_clear()
+
+
+def eval_eligibility_expr(expr: str | None, context: dict[str, Any]) -> tuple[bool, str | None]:
+    return compile_eligibility_expr(expr).evaluate(context)
+
+
+def eval_eligibility_batch(
+    compiled: CompiledEligibility,
+    contexts: list[dict[str, Any]],
+) -> list[tuple[bool, str | None]]:
+    return [compiled.evaluate(context) for context in contexts]
+
+
+def _blockers_from_result(step: Any, ok: bool, eval_error: str | None) -> list[dict[str, Any]]:
     if eval_error:
-        blockers.append(
+        return [
             {
                 "code": "eligibility_eval_error",
                 "title": "Ошибка расчета eligibility",
                 "details": eval_error,
             }
-        )
-        return blockers
+        ]
 
     if not ok:
-        blockers.append(
+        return [
             {
                 "code": "eligibility_not_met",
                 "title": "Условия шага не выполнены",
                 "details": getattr(step, "eligibility_expr", None),
             }
-        )
+        ]
+
+    return []
+
+
+def compute_blockers_for_step(step: Any, context: dict[str, Any]) -> list[dict[str, Any]]:
+    ok, eval_error = eval_eligibility_expr(getattr(step, "eligibility_expr", None), context)
+    return _blockers_from_result(step, ok, eval_error)
+
+
+def compute_blockers_for_step_batch(
+    step: Any,
+    contexts: list[dict[str, Any]],
+    compiled: CompiledEligibility | None = None,
+) -> list[list[dict[str, Any]]]:
+    if compiled is None:
+        compiled = compile_eligibility_expr(getattr(step, "eligibility_expr", None))
 
-    return blockers
\ No newline at end of file
+    return [
+        _blockers_from_result(step, ok, eval_error)
+        for ok, eval_error in eval_eligibility_batch(compiled, contexts)
+    ]
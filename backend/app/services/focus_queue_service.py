@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-from datetime import date, datetime
+from datetime import date
 from typing import Any
 
+from sqlalchemy import and_, case, func, or_
 from sqlalchemy.orm import Session
 
 from backend.app.models.case import Case
+from backend.app.models.control_room_case_stat import ControlRoomCaseStat
 from backend.app.models.debtor_profile import DebtorProfile
-from backend.app.services.portfolio_routing_service import build_portfolio_routing
-from backend.app.services.tenant_query_service import filter_cases_by_tenant
 
 
 def _status_value(value: Any) -> str:
@@ -145,52 +145,6 @@ def _queue_recommendation(
     return "Проверить маршрут взыскания"
 
 
-def _parse_dt(value: Any) -> datetime | None:
-    if not value:
-        return None
-    if isinstance(value, datetime):
-        return value
-    try:
-        return datetime.fromisoformat(str(value))
-    except Exception:
-        return None
-
-
-def _build_routing_map(routing: dict[str, Any]) -> dict[int, dict[str, Any]]:
-    buckets = dict(routing.get("buckets") or {})
-    result: dict[int, dict[str, Any]] = {}
-
-    for bucket_code in ("ready", "waiting", "blocked", "idle"):
-        rows = buckets.get(bucket_code) or []
-        for row in rows:
-            case_id = row.get("case_id")
-            if not case_id:
-                continue
-            result[int(case_id)] = {
-                "bucket": bucket_code,
-                "row": row,
-            }
-
-    return result
-
-
-def _priority_sort_key(item: dict[str, Any]) -> tuple[Any, ...]:
-    return (
-        -int(item.get("priority_score") or 0),
-        -_amount_to_float(item.get("principal_amount")),
-        int(item.get("case_id") or 0),
-    )
-
-
-def _waiting_sort_key(item: dict[str, Any]) -> tuple[Any, ...]:
-    eligible_at = _parse_dt(item.get("waiting_eligible_at"))
-    return (
-        eligible_at or datetime.max,
-        -int(item.get("risk_score") or 0),
-        int(item.get("case_id") or 0),
-    )
-
-
 def _serialize_focus_item(
     *,
     queue_code: str,
@@ -245,31 +199,52 @@ def _serialize_focus_item(
     }
 
 
-def _load_cases_with_profiles(
-    db: Session,
-    tenant_id: int,
-    *,
-    include_archived: bool = False,
-) -> tuple[list[Case], dict[int, DebtorProfile]]:
-    query = db.query(Case).order_by(Case.id.desc())
-    query = filter_cases_by_tenant(query, tenant_id, include_archived=include_archived)
-    cases = query.all()
-
-    profiles_map: dict[int, DebtorProfile] = {}
-    case_ids = [item.id for item in cases]
-
-    if case_ids:
-        profiles = (
-            db.query(DebtorProfile)
-            .filter(
-                DebtorProfile.tenant_id == tenant_id,
-                DebtorProfile.case_id.in_(case_ids),
-            )
-            .all()
+FOCUS_QUEUE_CODES = (
+    "urgent_ready",
+    "blocked_cleanup",
+    "waiting_next",
+    "court_lane",
+    "enforcement_lane",
+)
+
+
+def _focus_queue_condition(queue_code: str):
+    if queue_code == "urgent_ready":
+        return and_(
+            ControlRoomCaseStat.routing_status == "ready",
+            ControlRoomCaseStat.priority_blocked.is_(False),
         )
-        profiles_map = {item.case_id: item for item in profiles}
+    if queue_code == "blocked_cleanup":
+        return or_(
+            ControlRoomCaseStat.priority_blocked.is_(True),
+            ControlRoomCaseStat.routing_status == "blocked",
+        )
+    if queue_code == "waiting_next":
+        return ControlRoomCaseStat.routing_status == "waiting"
+    if queue_code == "court_lane":
+        return ControlRoomCaseStat.status_bucket == "court"
+    return ControlRoomCaseStat.status_bucket == "fssp"
+
+
+def _focus_queue_order(queue_code: str) -> tuple[Any, ...]:
+    if queue_code == "waiting_next":
+        return (
+            ControlRoomCaseStat.waiting_eligible_at.asc().nulls_last(),
+            ControlRoomCaseStat.priority_score.desc().nulls_last(),
+            ControlRoomCaseStat.case_id.asc(),
+        )
+    return (
+        ControlRoomCaseStat.priority_score.desc().nulls_last(),
+        ControlRoomCaseStat.principal_amount.desc(),
+        ControlRoomCaseStat.case_id.asc(),
+    )
 
-    return cases, profiles_map
+
+def _focus_stats_query(db: Session, *, tenant_id: int, include_archived: bool):
+    query = db.query(ControlRoomCaseStat).filter(ControlRoomCaseStat.tenant_id == tenant_id)
+    if not include_archived:
+        query = query.filter(ControlRoomCaseStat.is_archived.is_(False))
+    return query
 
 
 def get_control_room_focus_queues(
@@ -279,128 +254,41 @@ def get_control_room_focus_queues(
     include_archived: bool = False,
     per_queue_limit: int = 5,
 ) -> dict[str, Any]:
-    cases, profiles_map = _load_cases_with_profiles(
-        db,
-        tenant_id,
-        include_archived=include_archived,
-    )
-
-    routing = build_portfolio_routing(
-        db,
-        tenant_id=tenant_id,
-        cases=cases,
+    from backend.app.services.control_room_service import build_priority_items
+
+    # Очереди строятся по предрасчитанным строкам control_room_case_stats:
+    # счётчики одним агрегатом, карточки только для попавших в очередь дел.
+    counts = (
+        _focus_stats_query(db, tenant_id=tenant_id, include_archived=include_archived)
+        .with_entities(
+            *[
+                func.coalesce(func.sum(case((_focus_queue_condition(code), 1), else_=0)), 0)
+                for code in FOCUS_QUEUE_CODES
+            ]
+        )
+        .one()
     )
-    routing_map = _build_routing_map(routing)
 
-    from backend.app.services.control_room_service import get_control_room_priority_cases
-
-    priority_payload = get_control_room_priority_cases(
-        db,
-        tenant_id=tenant_id,
-        limit=max(len(cases), 10),
-        include_archived=include_archived,
-    )
-    priority_items = list(priority_payload.get("items") or [])
-    priority_map: dict[int, dict[str, Any]] = {
-        int(item["case_id"]): item
-        for item in priority_items
-        if item.get("case_id") is not None
-    }
-
-    urgent_ready: list[dict[str, Any]] = []
-    blocked_cleanup: list[dict[str, Any]] = []
-    waiting_next: list[dict[str, Any]] = []
-    court_lane: list[dict[str, Any]] = []
-    enforcement_lane: list[dict[str, Any]] = []
-
-    for case in cases:
-        case_id = int(case.id)
-        profile = profiles_map.get(case.id)
-        _ = profile
-
-        priority_item = priority_map.get(case_id)
-        if not priority_item:
-            continue
-
-        routing_ref = routing_map.get(case_id) or {}
-        routing_bucket = str(
-            routing_ref.get("bucket")
-            or ((routing_ref.get("row") or {}).get("routing_status"))
-            or ""
-        ).strip()
-        routing_row = routing_ref.get("row") or {}
-
-        status = _status_value(case.status)
-
-        if priority_item.get("routing_status") == "ready" and not priority_item.get("blocked"):
-            urgent_ready.append(
-                _serialize_focus_item(
-                    queue_code="urgent_ready",
-                    priority_item=priority_item,
-                    routing_bucket=routing_bucket,
-                    routing_row=routing_row,
-                )
-            )
-
-        if priority_item.get("blocked") or priority_item.get("routing_status") == "blocked":
-            blocked_cleanup.append(
-                _serialize_focus_item(
-                    queue_code="blocked_cleanup",
-                    priority_item=priority_item,
-                    routing_bucket=routing_bucket,
-                    routing_row=routing_row,
-                )
-            )
-
-        if priority_item.get("routing_status") == "waiting":
-            waiting_next.append(
-                _serialize_focus_item(
-                    queue_code="waiting_next",
-                    priority_item=priority_item,
-                    routing_bucket=routing_bucket,
-                    routing_row=routing_row,
-                )
-            )
-
-        if status == "court":
-            court_lane.append(
-                _serialize_focus_item(
-                    queue_code="court_lane",
-                    priority_item=priority_item,
-                    routing_bucket=routing_bucket,
-                    routing_row=routing_row,
-                )
-            )
-
-        if status in {"fssp", "enforcement"}:
-            enforcement_lane.append(
-                _serialize_focus_item(
-                    queue_code="enforcement_lane",
-                    priority_item=priority_item,
-                    routing_bucket=routing_bucket,
-                    routing_row=routing_row,
-                )
+    queues: dict[str, list[dict[str, Any]]] = {}
+    for code in FOCUS_QUEUE_CODES:
+        stats = (
+            _focus_stats_query(db, tenant_id=tenant_id, include_archived=include_archived)
+            .filter(_focus_queue_condition(code))
+            .order_by(*_focus_queue_order(code))
+            .limit(per_queue_limit)
+            .all()
+        )
+        queues[code] = [
+            _serialize_focus_item(
+                queue_code=code,
+                priority_item=item,
+                routing_bucket=item.get("routing_status"),
+                routing_row=None,
             )
-
-    urgent_ready.sort(key=_priority_sort_key)
-    blocked_cleanup.sort(key=_priority_sort_key)
-    waiting_next.sort(key=_waiting_sort_key)
-    court_lane.sort(key=_priority_sort_key)
-    enforcement_lane.sort(key=_priority_sort_key)
+            for item in build_priority_items(db, tenant_id=tenant_id, stats=stats)
+        ]
 
     return {
-        "summary": {
-            "urgent_ready": len(urgent_ready),
-            "blocked_cleanup": len(blocked_cleanup),
-            "waiting_next": len(waiting_next),
-            "court_lane": len(court_lane),
-            "enforcement_lane": len(enforcement_lane),
-        },
-        "queues": {
-            "urgent_ready": urgent_ready[:per_queue_limit],
-            "blocked_cleanup": blocked_cleanup[:per_queue_limit],
-            "waiting_next": waiting_next[:per_queue_limit],
-            "court_lane": court_lane[:per_queue_limit],
-            "enforcement_lane": enforcement_lane[:per_queue_limit],
-        },
-    }
\ No newline at end of file
+        "summary": {code: int(count or 0) for code, count in zip(FOCUS_QUEUE_CODES, counts)},
+        "queues": queues,
+    }
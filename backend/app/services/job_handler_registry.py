@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session
+
+from backend.app.services.automation_engine_service import execute_automation_run
+from backend.app.services.batch_job_service import execute_batch_job, execute_batch_job_partition
+from backend.app.services.case_service import sweep_case_projections, sync_and_persist_case
+from backend.app.services.control_room_service import refresh_stale_priorities
+from backend.app.services.control_room_summary_service import PRIORITY_REFRESH_JOB_TYPE
+from backend.app.services.document_bulk_export_service import (
+    DOCUMENT_EXPORT_JOB_TYPE,
+    execute_document_export,
+)
+from backend.app.services.document_engine_service import generate_document_for_case
+from backend.app.services.fns_sync_service import run_fns_case_sync
+from backend.app.services.outbound_gateway_service import dispatch_external_action
+from backend.app.services.tenant_query_service import load_case_for_tenant_or_404
+
+
+# Обработчик может коммитить промежуточные результаты сам (запуски автоматизации,
+# партиции batch job, выгрузки документов, sweep проекций), поэтому при повторе
+# после сбоя или потери аренды он обязан быть идемпотентным и продолжать с места остановки.
+JobHandler = Callable[..., dict[str, Any]]
+
+
+def _handle_automation_run_execute(db: Session, *, tenant_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+    return execute_automation_run(
+        db,
+        run_id=int(payload["run_id"]),
+        tenant_id=tenant_id,
+        force=bool(payload.get("force", False)),
+    )
+
+
+def _handle_batch_job_execute(db: Session, *, tenant_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+    return execute_batch_job(
+        db,
+        batch_job_id=int(payload["batch_job_id"]),
+        tenant_id=tenant_id,
+        force=bool(payload.get("force", False)),
+    )
+
+
+def _handle_batch_job_partition_execute(
+    db: Session,
+    *,
+    tenant_id: int,
+    payload: dict[str, Any],
+) -> dict[str, Any]:
+    return execute_batch_job_partition(
+        db,
+        batch_job_id=int(payload["batch_job_id"]),
+        tenant_id=tenant_id,
+        item_ids=[int(item_id) for item_id in payload.get("item_ids") or []],
+        force=bool(payload.get("force", False)),
+    )
+
+
+def _handle_fns_case_sync(db: Session, *, tenant_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+    case = load_case_for_tenant_or_404(db, int(payload["case_id"]), tenant_id, include_archived=True)
+    result = run_fns_case_sync(db, case=case, tenant_id=tenant_id)
+    sync_and_persist_case(db, case, changes=("contract_data", "debtor_profile"))
+    return result
+
+
+def _handle_case_projection_sweep(db: Session, *, tenant_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+    return sweep_case_projections(
+        db,
+        tenant_id=tenant_id,
+        batch_size=payload.get("batch_size"),
+    )
+
+
+def _handle_control_room_priority_refresh(
+    db: Session,
+    *,
+    tenant_id: int,
+    payload: dict[str, Any],
+) -> dict[str, Any]:
+    _ = payload
+    refreshed = refresh_stale_priorities(db, tenant_id=tenant_id)
+    return {"ok": True, "tenant_id": tenant_id, "refreshed": refreshed}
+
+
+def _handle_external_action_dispatch(
+    db: Session,
+    *,
+    tenant_id: int,
+    payload: dict[str, Any],
+) -> dict[str, Any]:
+    return dispatch_external_action(
+        db,
+        action_id=int(payload["action_id"]),
+        tenant_id=tenant_id,
+    )
+
+
+def _handle_document_generate(db: Session, *, tenant_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+    return generate_document_for_case(
+        db,
+        tenant_id=tenant_id,
+        case_id=int(payload["case_id"]),
+        payload=dict(payload.get("document") or {}),
+    )
+
+
+def _handle_document_bulk_export(db: Session, *, tenant_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+    return execute_document_export(
+        db,
+        export_id=int(payload["export_id"]),
+        tenant_id=tenant_id,
+    )
+
+
+_JOB_HANDLERS: dict[str, JobHandler] = {
+    "automation_run_execute": _handle_automation_run_execute,
+    "batch_job_execute": _handle_batch_job_execute,
+    "batch_job_partition_execute": _handle_batch_job_partition_execute,
+    "fns_case_sync": _handle_fns_case_sync,
+    "case_projection_sweep": _handle_case_projection_sweep,
+    PRIORITY_REFRESH_JOB_TYPE: _handle_control_room_priority_refresh,
+    "external_action_dispatch": _handle_external_action_dispatch,
+    "document_generate": _handle_document_generate,
+    DOCUMENT_EXPORT_JOB_TYPE: _handle_document_bulk_export,
+}
+
+
+def get_job_handler(job_type: str) -> JobHandler:
+    normalized = (job_type or "").strip().lower()
+    handler = _JOB_HANDLERS.get(normalized)
+    if not handler:
+        raise ValueError(f"Unknown job type: {job_type}")
+    return handler
+
+
+def register_job_handler(job_type: str, handler: JobHandler) -> None:
+    _JOB_HANDLERS[(job_type or "").strip().lower()] = handler
@@ -5,7 +5,8 @@ from datetime import datetime
 
 from sqlalchemy.orm import Session
 
-from backend.app.models import JobQueueJob
+from backend.app.models import JobQueueAttempt, JobQueueJob
+from backend.app.services.job_wakeup_service import notify_job_enqueued
 
 
 def enqueue_job(
@@ -15,6 +16,8 @@ def enqueue_job(
     job_type: str,
     payload: dict,
     priority: int = 100,
+    max_retries: int = 3,
+    scheduled_at: datetime | None = None,
 ):
     job = JobQueueJob(
         tenant_id=tenant_id,
@@ -22,10 +25,82 @@ def enqueue_job(
         status="pending",
         priority=priority,
         payload_json=json.dumps(payload),
+        scheduled_at=scheduled_at,
+        retry_count=0,
+        max_retries=max_retries,
         created_at=datetime.utcnow(),
     )
 
     db.add(job)
     db.flush()
 
-    return job
\ No newline at end of file
+    notify_job_enqueued(db)
+
+    return job
+
+
+def load_job_payload(job: JobQueueJob) -> dict:
+    if not job.payload_json:
+        return {}
+    try:
+        payload = json.loads(job.payload_json)
+    except ValueError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def load_job_progress(job: JobQueueJob) -> dict | None:
+    if not job.progress_json:
+        return None
+    try:
+        progress = json.loads(job.progress_json)
+    except ValueError:
+        return None
+    return progress if isinstance(progress, dict) else None
+
+
+def update_job_progress(db: Session, *, job_id: int | None, progress: dict) -> None:
+    if job_id is None:
+        return
+    (
+        db.query(JobQueueJob)
+        .filter(JobQueueJob.id == job_id)
+        .update({"progress_json": json.dumps(progress)}, synchronize_session=False)
+    )
+
+
+def serialize_job(db: Session, job: JobQueueJob) -> dict:
+    attempts = (
+        db.query(JobQueueAttempt)
+        .filter(JobQueueAttempt.job_id == job.id)
+        .order_by(JobQueueAttempt.id.asc())
+        .all()
+    )
+
+    return {
+        "id": job.id,
+        "tenant_id": job.tenant_id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "priority": job.priority,
+        "payload": load_job_payload(job),
+        "progress": load_job_progress(job),
+        "worker_id": job.worker_id,
+        "retry_count": job.retry_count,
+        "max_retries": job.max_retries,
+        "scheduled_at": job.scheduled_at.isoformat() if job.scheduled_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "attempts": [
+            {
+                "id": item.id,
+                "worker_id": item.worker_id,
+                "status": item.status,
+                "error_message": item.error_message,
+                "started_at": item.started_at.isoformat() if item.started_at else None,
+                "finished_at": item.finished_at.isoformat() if item.finished_at else None,
+            }
+            for item in attempts
+        ],
+    }
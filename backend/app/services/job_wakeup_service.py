@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+import os
+import select
+import threading
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, SessionTransaction
+
+from backend.app.config import JOB_QUEUE_NOTIFY_CHANNEL, WORKER_WAKEUP_FILE
+from backend.app.database import engine
+
+
+FILE_POLL_SECONDS = 0.02
+
+logger = logging.getLogger(__name__)
+
+
+def _touch_wakeup_file(*_args) -> None:
+    try:
+        with open(WORKER_WAKEUP_FILE, "a"):
+            pass
+        os.utime(WORKER_WAKEUP_FILE, None)
+    except OSError:
+        # Без файла воркеры всё равно подхватят задачу по таймауту простоя.
+        pass
+
+
+def notify_job_enqueued(db: Session) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        # NOTIFY транзакционный: воркеры проснутся только после commit.
+        db.execute(text("SELECT pg_notify(:channel, '')"), {"channel": JOB_QUEUE_NOTIFY_CHANNEL})
+        return
+
+    db.info["job_wakeup_pending"] = True
+
+    # Обработчики вешаются на сессию один раз и срабатывают только при отложенном сигнале.
+    if not db.info.get("job_wakeup_listening"):
+        db.info["job_wakeup_listening"] = True
+        event.listen(db, "after_commit", _after_commit)
+        event.listen(db, "after_soft_rollback", _after_soft_rollback)
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop("job_wakeup_pending", None):
+        _touch_wakeup_file()
+
+
+def _after_soft_rollback(session: Session, previous_transaction: SessionTransaction) -> None:
+    # Откат savepoint не отменяет внешнюю транзакцию: сигнал уйдёт при её commit.
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop("job_wakeup_pending", None)
+
+
+# Одна подписка на процесс; потоки воркеров ждут сигнала через Condition.
+class JobWakeupHub:
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="job-wakeup", daemon=True)
+
+    def start(self) -> "JobWakeupHub":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._signal()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def wait(self, generation: int, timeout: float) -> int:
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._generation != generation or self._stop.is_set(),
+                timeout=timeout,
+            )
+            return self._generation
+
+    def _signal(self) -> None:
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        if engine.dialect.name == "postgresql":
+            try:
+                self._listen_postgres()
+                return
+            except Exception as exc:
+                logger.warning("LISTEN unavailable, falling back to wakeup file: %r", exc)
+        self._watch_file()
+
+    def _listen_postgres(self) -> None:
+        connection = engine.raw_connection()
+        try:
+            dbapi_connection = connection.dbapi_connection
+            dbapi_connection.autocommit = True
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f'LISTEN "{JOB_QUEUE_NOTIFY_CHANNEL}"')
+
+            while not self._stop.is_set():
+                readable, _, _ = select.select([dbapi_connection], [], [], 1.0)
+                if not readable:
+                    continue
+
+                dbapi_connection.poll()
+                if dbapi_connection.notifies:
+                    dbapi_connection.notifies.clear()
+                    self._signal()
+        finally:
+            connection.close()
+
+    def _watch_file(self) -> None:
+        last_mtime = self._file_mtime()
+
+        while not self._stop.wait(FILE_POLL_SECONDS):
+            mtime = self._file_mtime()
+            if mtime != last_mtime:
+                last_mtime = mtime
+                self._signal()
+
+    @staticmethod
+    def _file_mtime() -> int:
+        try:
+            return os.stat(WORKER_WAKEUP_FILE).st_mtime_ns
+        except OSError:
+            return 0
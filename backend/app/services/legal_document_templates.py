@@ -12,7 +12,7 @@ from backend.app.models.debtor_profile import DebtorProfile
 from backend.app.services.document_catalog_service import get_document_title_ru
 
 
-def _format_date(value: Any) -> str:
+def format_document_date(value: Any) -> str:
     if value is None:
         return "—"
 
@@ -33,7 +33,7 @@ def _format_date(value: Any) -> str:
         return text
 
 
-def _format_money(value: Any) -> str:
+def format_document_money(value: Any) -> str:
     if value is None or value == "":
         return "0,00"
 
@@ -184,9 +184,9 @@ def _base_context(
         "case": case_data,
         "creditor": creditor,
         "debtor": debtor,
-        "document_date": _format_date(datetime.utcnow()),
-        "due_date": _format_date(case.due_date or case_data.get("due_date")),
-        "principal_amount": _format_money(
+        "document_date": format_document_date(datetime.utcnow()),
+        "due_date": format_document_date(case.due_date or case_data.get("due_date")),
+        "principal_amount": format_document_money(
             case.principal_amount or case_data.get("principal_amount")
         ),
         "contract_type": getattr(case.contract_type, "value", case.contract_type) or "—",
@@ -385,6 +385,9 @@ def _fssp_application(context: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+# Повышать при изменении текстов шаблонов: версия входит в ключ кэша документов.
+LEGAL_DOCUMENT_TEMPLATE_VERSION = 1
+
 _TEMPLATE_BUILDERS = {
     "payment_due_notice": _payment_due_notice,
     "debt_notice": _debt_notice,
@@ -395,6 +398,10 @@ _TEMPLATE_BUILDERS = {
 }
 
 
+def is_supported_legal_document(document_code: str | None) -> bool:
+    return (document_code or "") in _TEMPLATE_BUILDERS
+
+
 def build_legal_document_template(
     *,
     db: Session,
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Iterable, Iterator
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from backend.app.database import SessionLocal
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+RowsFactory = Callable[[Session], Iterable[dict[str, Any]]]
+
+
+def _line(value: dict[str, Any]) -> bytes:
+    return (json.dumps(value, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+def iter_ndjson(header: dict[str, Any] | None, rows: RowsFactory) -> Iterator[bytes]:
+    # Строки читаются в собственной сессии: сессия запроса закрывается
+    # раньше, чем клиент дочитает поток.
+    db = SessionLocal()
+    try:
+        if header is not None:
+            yield _line(header)
+        for row in rows(db):
+            yield _line(row)
+    finally:
+        db.close()
+
+
+def ndjson_response(header: dict[str, Any] | None, rows: RowsFactory) -> StreamingResponse:
+    # Первая строка — заголовок ответа без items, далее по строке на item.
+    return StreamingResponse(iter_ndjson(header, rows), media_type=NDJSON_MEDIA_TYPE)
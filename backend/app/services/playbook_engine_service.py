@@ -4,15 +4,17 @@ from typing import Any
 
 from sqlalchemy.orm import Session
 
-from backend.app.models import Case, PlaybookDefinition, PlaybookStep
+from backend.app.models import Case, CaseWaitingBucket, PlaybookDefinition, PlaybookStep
 from backend.app.services.eligibility_service import (
     build_case_eligibility_context,
-    compute_blockers_for_step,
+    compile_playbook_eligibility,
+    compute_blockers_for_step_batch,
 )
-from backend.app.services.playbook_resolution_service import resolve_playbook_for_case
+from backend.app.services.playbook_resolution_service import resolve_playbooks_for_cases
 from backend.app.services.waiting_bucket_service import (
-    create_or_update_waiting_bucket,
-    resolve_waiting_bucket,
+    load_open_waiting_buckets,
+    resolve_waiting_bucket_rows,
+    upsert_waiting_bucket_row,
 )
 
 
@@ -52,34 +54,50 @@ def _serialize_playbook(playbook: PlaybookDefinition | None) -> dict[str, Any] |
     }
 
 
-def evaluate_case_playbook(
-    db: Session,
-    case: Case,
-    *,
-    tenant_id: int,
-    persist_waiting_buckets: bool = True,
-) -> dict[str, Any]:
-    playbook = resolve_playbook_for_case(db, case)
-    context = build_case_eligibility_context(case)
+def _empty_evaluation(context: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "playbook": None,
+        "steps": [],
+        "current_step": None,
+        "next_actions": [],
+        "waiting_buckets": [],
+        "blocked_steps": [],
+        "context": context,
+    }
 
-    if not playbook:
-        return {
-            "playbook": None,
-            "steps": [],
-            "current_step": None,
-            "next_actions": [],
-            "waiting_buckets": [],
-            "blocked_steps": [],
-            "context": context,
-        }
 
-    steps = (
+def _load_steps_by_playbook(
+    db: Session,
+    playbook_ids: list[int],
+) -> dict[int, list[PlaybookStep]]:
+    if not playbook_ids:
+        return {}
+
+    rows = (
         db.query(PlaybookStep)
-        .filter(PlaybookStep.playbook_id == playbook.id)
+        .filter(PlaybookStep.playbook_id.in_(playbook_ids))
         .order_by(PlaybookStep.sequence_no.asc(), PlaybookStep.id.asc())
         .all()
     )
 
+    result: dict[int, list[PlaybookStep]] = {}
+    for row in rows:
+        result.setdefault(row.playbook_id, []).append(row)
+    return result
+
+
+def _evaluate_steps(
+    db: Session,
+    case: Case,
+    *,
+    tenant_id: int,
+    playbook: PlaybookDefinition,
+    steps: list[PlaybookStep],
+    context: dict[str, Any],
+    blockers_by_step: dict[int, list[dict[str, Any]]],
+    open_buckets: dict[tuple[int, str], list[CaseWaitingBucket]],
+    persist_waiting_buckets: bool,
+) -> dict[str, Any]:
     evaluated_steps: list[dict[str, Any]] = []
     waiting_buckets: list[dict[str, Any]] = []
     blocked_steps: list[dict[str, Any]] = []
@@ -87,14 +105,20 @@ def evaluate_case_playbook(
     current_step: dict[str, Any] | None = None
 
     for step in steps:
-        blockers = compute_blockers_for_step(step, context)
+        blockers = blockers_by_step[step.id]
         raw_eligible = len(blockers) == 0
+        bucket_key = (case.id, step.step_code)
 
         waiting_row = None
         if raw_eligible and step.waiting_rule_code:
-            if persist_waiting_buckets:
-                waiting_row = create_or_update_waiting_bucket(
+            existing = open_buckets.get(bucket_key) or []
+            if not persist_waiting_buckets:
+                # Режим чтения: учитываем уже открытый bucket, ничего не создавая.
+                waiting_row = existing[0] if existing else None
+            else:
+                waiting_row = upsert_waiting_bucket_row(
                     db,
+                    row=existing[0] if existing else None,
                     tenant_id=tenant_id,
                     case_id=case.id,
                     playbook_code=playbook.code,
@@ -107,14 +131,11 @@ def evaluate_case_playbook(
                         "action_code": step.action_code,
                     },
                 )
+                if waiting_row is not None and not existing:
+                    open_buckets[bucket_key] = [waiting_row]
         else:
             if persist_waiting_buckets:
-                resolve_waiting_bucket(
-                    db,
-                    tenant_id=tenant_id,
-                    case_id=case.id,
-                    step_code=step.step_code,
-                )
+                resolve_waiting_bucket_rows(db, open_buckets.pop(bucket_key, []))
 
         waiting = waiting_row is not None
 
@@ -161,4 +182,103 @@ def evaluate_case_playbook(
         "waiting_buckets": waiting_buckets,
         "blocked_steps": blocked_steps,
         "context": context,
-    }
\ No newline at end of file
+    }
+
+
+def _compute_blockers_by_case(
+    cases: list[Case],
+    playbooks_by_case: dict[int, PlaybookDefinition | None],
+    steps_by_playbook: dict[int, list[PlaybookStep]],
+    contexts: dict[int, dict[str, Any]],
+) -> dict[int, dict[int, list[dict[str, Any]]]]:
+    cases_by_playbook: dict[int, list[Case]] = {}
+    playbooks: dict[int, PlaybookDefinition] = {}
+    for case in cases:
+        playbook = playbooks_by_case.get(case.id)
+        if playbook is not None:
+            cases_by_playbook.setdefault(playbook.id, []).append(case)
+            playbooks[playbook.id] = playbook
+
+    result: dict[int, dict[int, list[dict[str, Any]]]] = {case.id: {} for case in cases}
+    for playbook_id, group in cases_by_playbook.items():
+        steps = steps_by_playbook.get(playbook_id, [])
+        compiled = compile_playbook_eligibility(playbooks[playbook_id], steps)
+        group_contexts = [contexts[case.id] for case in group]
+
+        for step in steps:
+            step_blockers = compute_blockers_for_step_batch(step, group_contexts, compiled[step.id])
+            for case, item in zip(group, step_blockers):
+                result[case.id][step.id] = item
+
+    return result
+
+
+def evaluate_playbooks_for_cases(
+    db: Session,
+    cases: list[Case],
+    *,
+    tenant_id: int,
+    persist_waiting_buckets: bool = True,
+) -> dict[int, dict[str, Any]]:
+    """
+    Пакетная оценка playbook: активные playbook, их шаги и открытые
+    waiting buckets загружаются одним запросом на весь набор дел.
+    Результат по каждому делу совпадает с evaluate_case_playbook.
+    """
+
+    if not cases:
+        return {}
+
+    playbooks_by_case = resolve_playbooks_for_cases(db, cases)
+    playbook_ids = sorted({item.id for item in playbooks_by_case.values() if item is not None})
+    steps_by_playbook = _load_steps_by_playbook(db, playbook_ids)
+
+    open_buckets = load_open_waiting_buckets(
+        db,
+        tenant_id=tenant_id,
+        case_ids=[case.id for case in cases if playbooks_by_case.get(case.id) is not None],
+    )
+
+    contexts = {case.id: build_case_eligibility_context(case) for case in cases}
+    blockers = _compute_blockers_by_case(cases, playbooks_by_case, steps_by_playbook, contexts)
+
+    result: dict[int, dict[str, Any]] = {}
+    for case in cases:
+        context = contexts[case.id]
+        playbook = playbooks_by_case.get(case.id)
+
+        if not playbook:
+            result[case.id] = _empty_evaluation(context)
+            continue
+
+        result[case.id] = _evaluate_steps(
+            db,
+            case,
+            tenant_id=tenant_id,
+            playbook=playbook,
+            steps=steps_by_playbook.get(playbook.id, []),
+            context=context,
+            blockers_by_step=blockers[case.id],
+            open_buckets=open_buckets,
+            persist_waiting_buckets=persist_waiting_buckets,
+        )
+
+    if persist_waiting_buckets:
+        db.flush()
+
+    return result
+
+
+def evaluate_case_playbook(
+    db: Session,
+    case: Case,
+    *,
+    tenant_id: int,
+    persist_waiting_buckets: bool = True,
+) -> dict[str, Any]:
+    return evaluate_playbooks_for_cases(
+        db,
+        [case],
+        tenant_id=tenant_id,
+        persist_waiting_buckets=persist_waiting_buckets,
+    )[case.id]
@@ -13,43 +13,61 @@ def resolve_playbook_for_case(db: Session, case: Case) -> PlaybookDefinition | N
     3. fallback по активному playbook без привязки
     """
 
+    return pick_playbook(load_active_playbooks(db), *_case_playbook_key(case))
+
+
+def _case_playbook_key(case: Case) -> tuple[str, str]:
     contract_type = case.contract_type.value if hasattr(case.contract_type, "value") else str(case.contract_type)
     debtor_type = case.debtor_type.value if hasattr(case.debtor_type, "value") else str(case.debtor_type)
+    return contract_type, debtor_type
 
-    exact = (
-        db.query(PlaybookDefinition)
-        .filter(
-            PlaybookDefinition.is_active.is_(True),
-            PlaybookDefinition.contract_type == contract_type,
-            PlaybookDefinition.debtor_type == debtor_type,
-        )
-        .order_by(PlaybookDefinition.version.desc(), PlaybookDefinition.id.desc())
-        .first()
-    )
-    if exact:
-        return exact
 
-    by_contract = (
+def load_active_playbooks(db: Session) -> list[PlaybookDefinition]:
+    return (
         db.query(PlaybookDefinition)
-        .filter(
-            PlaybookDefinition.is_active.is_(True),
-            PlaybookDefinition.contract_type == contract_type,
-            PlaybookDefinition.debtor_type.is_(None),
-        )
+        .filter(PlaybookDefinition.is_active.is_(True))
         .order_by(PlaybookDefinition.version.desc(), PlaybookDefinition.id.desc())
-        .first()
+        .all()
     )
-    if by_contract:
-        return by_contract
 
-    fallback = (
-        db.query(PlaybookDefinition)
-        .filter(
-            PlaybookDefinition.is_active.is_(True),
-            PlaybookDefinition.contract_type.is_(None),
-            PlaybookDefinition.debtor_type.is_(None),
-        )
-        .order_by(PlaybookDefinition.version.desc(), PlaybookDefinition.id.desc())
-        .first()
-    )
-    return fallback
\ No newline at end of file
+
+def pick_playbook(
+    playbooks: list[PlaybookDefinition],
+    contract_type: str,
+    debtor_type: str,
+) -> PlaybookDefinition | None:
+    """
+    Порядок выбора из docstring resolve_playbook_for_case
+    по заранее загруженному списку активных playbook (version desc, id desc).
+    """
+
+    for matches in (
+        lambda item: item.contract_type == contract_type and item.debtor_type == debtor_type,
+        lambda item: item.contract_type == contract_type and item.debtor_type is None,
+        lambda item: item.contract_type is None and item.debtor_type is None,
+    ):
+        for item in playbooks:
+            if matches(item):
+                return item
+    return None
+
+
+def resolve_playbooks_for_cases(
+    db: Session,
+    cases: list[Case],
+    *,
+    playbooks: list[PlaybookDefinition] | None = None,
+) -> dict[int, PlaybookDefinition | None]:
+    if playbooks is None:
+        playbooks = load_active_playbooks(db)
+
+    by_key: dict[tuple[str, str], PlaybookDefinition | None] = {}
+    result: dict[int, PlaybookDefinition | None] = {}
+
+    for case in cases:
+        key = _case_playbook_key(case)
+        if key not in by_key:
+            by_key[key] = pick_playbook(playbooks, *key)
+        result[case.id] = by_key[key]
+
+    return result
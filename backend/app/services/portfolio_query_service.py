@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+import base64
+import json
 from dataclasses import dataclass
-from datetime import UTC, datetime
-from typing import Any
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Any, Iterator
 
-from sqlalchemy import and_, func, or_
+from fastapi import HTTPException
+from sqlalchemy import Select, and_, false, func, or_, select
 from sqlalchemy.orm import Query, Session
 
+from backend.app.config import STREAM_YIELD_PER
 from backend.app.models import Case
 from backend.app.models.automation_run import AutomationRun
+from backend.app.models.automation_run_item import AutomationRunItem
 from backend.app.models.external_action import ExternalAction
 from backend.app.services.tenant_query_service import filter_cases_by_tenant
 
@@ -62,15 +68,85 @@ def _calc_days_overdue(case: Case) -> int | None:
     return max(delta, 0)
 
 
-def _apply_case_filters(
+RUN_PRESENCE_FILTERS: dict[str, str] = {
+    "has_waiting_runs": "waiting",
+    "has_blocked_runs": "blocked",
+    "has_pending_runs": "pending",
+}
+
+
+def _debtor_identifier_expr(key: str) -> Any:
+    return Case.contract_data["debtor"][key].as_string()
+
+
+def _has_text(expr: Any) -> Any:
+    return and_(expr.is_not(None), expr != "")
+
+
+def _runs_with_status(tenant_id: int, status: str) -> Select:
+    return (
+        select(AutomationRun.id)
+        .join(AutomationRunItem, AutomationRunItem.run_id == AutomationRun.id)
+        .where(
+            AutomationRunItem.case_id == Case.id,
+            AutomationRun.tenant_id == tenant_id,
+            AutomationRun.status == status,
+        )
+    )
+
+
+def _external_actions_of_case(tenant_id: int) -> Select:
+    return select(ExternalAction.id).select_from(ExternalAction).where(
+        ExternalAction.case_id == Case.id,
+        ExternalAction.tenant_id == tenant_id,
+    )
+
+
+def _count_of(statement: Select) -> Any:
+    return (
+        statement.with_only_columns(func.count(), maintain_column_froms=True)
+        .correlate(Case)
+        .scalar_subquery()
+    )
+
+
+def _presence_clause(statement: Select, expected: bool) -> Any:
+    clause = statement.exists()
+    return clause if expected else ~clause
+
+
+def _apply_days_overdue_filters(query: Query, filters: dict[str, Any]) -> Query:
+    min_days_overdue = filters.get("min_days_overdue")
+    max_days_overdue = filters.get("max_days_overdue")
+
+    if min_days_overdue is None and max_days_overdue is None:
+        return query
+
+    # days_overdue = max(today - due_date, 0), поэтому границы переводим
+    # в даты и сравниваем due_date напрямую — так работает индекс.
+    today = _utcnow().date()
+    query = query.filter(Case.due_date.is_not(None))
+
+    if min_days_overdue is not None and int(min_days_overdue) > 0:
+        query = query.filter(Case.due_date <= today - timedelta(days=int(min_days_overdue)))
+
+    if max_days_overdue is not None:
+        if int(max_days_overdue) < 0:
+            return query.filter(false())
+        query = query.filter(Case.due_date >= today - timedelta(days=int(max_days_overdue)))
+
+    return query
+
+
+def compile_portfolio_query(
     db: Session,
     *,
     tenant_id: int,
     filters: dict[str, Any],
-) -> list[Case]:
+) -> Query:
     include_archived = bool(filters.get("include_archived", False))
 
-    query: Query = db.query(Case).order_by(Case.id.desc())
+    query: Query = db.query(Case)
     query = filter_cases_by_tenant(
         query,
         tenant_id,
@@ -102,136 +178,195 @@ def _apply_case_filters(
             )
         )
 
-    cases = query.all()
+    query = _apply_days_overdue_filters(query, filters)
 
-    min_days_overdue = filters.get("min_days_overdue")
-    max_days_overdue = filters.get("max_days_overdue")
-    require_debtor_identifiers = bool(filters.get("require_debtor_identifiers", False))
+    if bool(filters.get("require_debtor_identifiers", False)):
+        query = query.filter(
+            or_(
+                _has_text(_debtor_identifier_expr("inn")),
+                _has_text(_debtor_identifier_expr("ogrn")),
+            )
+        )
+
+    for key, run_status in RUN_PRESENCE_FILTERS.items():
+        expected = filters.get(key)
+        if expected is None:
+            continue
+        query = query.filter(
+            _presence_clause(_runs_with_status(tenant_id, run_status), bool(expected))
+        )
 
-    filtered_cases: list[Case] = []
-    for case in cases:
-        days_overdue = _calc_days_overdue(case)
-        inn, ogrn = _extract_debtor_identifiers(case)
+    has_external_actions = filters.get("has_external_actions")
+    if has_external_actions is not None:
+        query = query.filter(
+            _presence_clause(_external_actions_of_case(tenant_id), bool(has_external_actions))
+        )
 
-        if min_days_overdue is not None:
-            if days_overdue is None or days_overdue < int(min_days_overdue):
-                continue
+    return query
 
-        if max_days_overdue is not None:
-            if days_overdue is None or days_overdue > int(max_days_overdue):
-                continue
 
-        if require_debtor_identifiers and not (inn or ogrn):
-            continue
+SORT_MODES: dict[str, tuple[str | None, bool]] = {
+    "id_desc": (None, True),
+    "id_asc": (None, False),
+    "due_date_asc": ("due_date", False),
+    "due_date_desc": ("due_date", True),
+    "principal_amount_asc": ("principal_amount", False),
+    "principal_amount_desc": ("principal_amount", True),
+}
 
-        filtered_cases.append(case)
 
-    return filtered_cases
+def _sort_mode(order_by: str) -> tuple[str | None, bool]:
+    return SORT_MODES.get(order_by, SORT_MODES["id_desc"])
 
 
-def _count_runs_by_status(
-    db: Session,
-    *,
-    tenant_id: int,
-    case_ids: list[int],
-    status: str,
-) -> dict[int, int]:
-    if not case_ids:
-        return {}
+def _order_clauses(order_by: str) -> tuple[Any, ...]:
+    # Tie-breaker по id идёт в том же направлении, что и ключ сортировки:
+    # тогда один составной индекс (tenant_id, key, id) обслуживает обе стороны.
+    field, descending = _sort_mode(order_by)
+    clauses: list[Any] = []
 
-    rows = (
-        db.query(
-            AutomationRun.case_id,
-            func.count(AutomationRun.id),
-        )
-        .filter(
-            AutomationRun.tenant_id == tenant_id,
-            AutomationRun.case_id.in_(case_ids),
-            AutomationRun.status == status,
-        )
-        .group_by(AutomationRun.case_id)
-        .all()
-    )
-    return {int(case_id): int(count) for case_id, count in rows}
+    if field is not None:
+        column = getattr(Case, field)
+        if descending:
+            clauses.append(column.desc().nulls_first() if column.nullable else column.desc())
+        else:
+            clauses.append(column.asc().nulls_last() if column.nullable else column.asc())
 
+    clauses.append(Case.id.desc() if descending else Case.id.asc())
+    return tuple(clauses)
 
-def _count_external_actions(
-    db: Session,
-    *,
-    tenant_id: int,
-    case_ids: list[int],
-) -> dict[int, int]:
-    if not case_ids:
-        return {}
 
-    rows = (
-        db.query(
-            ExternalAction.case_id,
-            func.count(ExternalAction.id),
-        )
-        .filter(
-            ExternalAction.tenant_id == tenant_id,
-            ExternalAction.case_id.in_(case_ids),
-        )
-        .group_by(ExternalAction.case_id)
-        .all()
-    )
-    return {int(case_id): int(count) for case_id, count in rows}
+def _cursor_key_value(field: str | None, row: PortfolioCaseRow) -> str | None:
+    if field == "due_date":
+        return row.due_date
+    if field == "principal_amount":
+        return row.principal_amount
+    return None
 
 
-def _apply_run_presence_filters(
-    rows: list[PortfolioCaseRow],
-    *,
-    filters: dict[str, Any],
-) -> list[PortfolioCaseRow]:
-    has_waiting_runs = filters.get("has_waiting_runs")
-    has_blocked_runs = filters.get("has_blocked_runs")
-    has_pending_runs = filters.get("has_pending_runs")
-    has_external_actions = filters.get("has_external_actions")
+def _parse_cursor_key(field: str | None, raw: Any) -> Any:
+    if raw is None or field is None:
+        return None
+    if field == "due_date":
+        return date.fromisoformat(str(raw))
+    return Decimal(str(raw))
 
-    result: list[PortfolioCaseRow] = []
-    for row in rows:
-        if has_waiting_runs is True and row.waiting_runs_count <= 0:
-            continue
-        if has_waiting_runs is False and row.waiting_runs_count > 0:
-            continue
 
-        if has_blocked_runs is True and row.blocked_runs_count <= 0:
-            continue
-        if has_blocked_runs is False and row.blocked_runs_count > 0:
-            continue
+def encode_portfolio_cursor(order_by: str, row: PortfolioCaseRow) -> str:
+    field, _ = _sort_mode(order_by)
+    payload = {
+        "o": order_by,
+        "k": _cursor_key_value(field, row),
+        "id": row.case_id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
-        if has_pending_runs is True and row.pending_runs_count <= 0:
-            continue
-        if has_pending_runs is False and row.pending_runs_count > 0:
-            continue
 
-        if has_external_actions is True and row.external_actions_count <= 0:
-            continue
-        if has_external_actions is False and row.external_actions_count > 0:
-            continue
+def decode_portfolio_cursor(cursor: str, order_by: str) -> tuple[Any, int]:
+    field, _ = _sort_mode(order_by)
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        cursor_order_by = payload["o"]
+        cursor_id = int(payload["id"])
+        cursor_key = _parse_cursor_key(field, payload.get("k"))
+    except (ValueError, KeyError, TypeError, InvalidOperation):
+        raise HTTPException(status_code=422, detail="Invalid portfolio cursor")
+
+    if cursor_order_by != order_by:
+        raise HTTPException(status_code=422, detail="Cursor was issued for a different order_by")
 
-        result.append(row)
+    return cursor_key, cursor_id
 
-    return result
 
+def _keyset_clause(order_by: str, cursor_key: Any, cursor_id: int) -> Any:
+    field, descending = _sort_mode(order_by)
+    after_id = Case.id < cursor_id if descending else Case.id > cursor_id
 
-def _sort_rows(
-    rows: list[PortfolioCaseRow],
+    if field is None:
+        return after_id
+
+    column = getattr(Case, field)
+
+    # NULL-ключи стоят первыми при убывании и последними при возрастании.
+    if cursor_key is None:
+        if descending:
+            return or_(and_(column.is_(None), after_id), column.is_not(None))
+        return and_(column.is_(None), after_id)
+
+    after_key = column < cursor_key if descending else column > cursor_key
+    clause = or_(after_key, and_(column == cursor_key, after_id))
+    if column.nullable and not descending:
+        clause = or_(clause, column.is_(None))
+    return clause
+
+
+def _with_row_counts(query: Query, *, tenant_id: int) -> Query:
+    return query.add_columns(
+        _count_of(_runs_with_status(tenant_id, "waiting")).label("waiting_runs_count"),
+        _count_of(_runs_with_status(tenant_id, "blocked")).label("blocked_runs_count"),
+        _count_of(_runs_with_status(tenant_id, "pending")).label("pending_runs_count"),
+        _count_of(_external_actions_of_case(tenant_id)).label("external_actions_count"),
+    )
+
+
+def _build_row(
+    case: Case,
+    waiting_runs_count: int | None,
+    blocked_runs_count: int | None,
+    pending_runs_count: int | None,
+    external_actions_count: int | None,
+) -> PortfolioCaseRow:
+    inn, ogrn = _extract_debtor_identifiers(case)
+    return PortfolioCaseRow(
+        case_id=case.id,
+        debtor_name=case.debtor_name,
+        debtor_type=_debtor_type_value(case),
+        contract_type=_contract_type_value(case),
+        principal_amount=str(case.principal_amount),
+        due_date=case.due_date.isoformat() if case.due_date else None,
+        case_status=_case_status_value(case),
+        is_archived=bool(getattr(case, "is_archived", False)),
+        days_overdue=_calc_days_overdue(case),
+        debtor_inn=inn,
+        debtor_ogrn=ogrn,
+        waiting_runs_count=int(waiting_runs_count or 0),
+        blocked_runs_count=int(blocked_runs_count or 0),
+        pending_runs_count=int(pending_runs_count or 0),
+        external_actions_count=int(external_actions_count or 0),
+    )
+
+
+def _portfolio_rows_query(
+    db: Session,
     *,
+    tenant_id: int,
+    filters: dict[str, Any],
     order_by: str,
-) -> list[PortfolioCaseRow]:
-    if order_by == "id_asc":
-        return sorted(rows, key=lambda x: x.case_id)
-    if order_by == "due_date_asc":
-        return sorted(rows, key=lambda x: (x.due_date is None, x.due_date or ""))
-    if order_by == "due_date_desc":
-        return sorted(rows, key=lambda x: (x.due_date is None, x.due_date or ""), reverse=True)
-    if order_by == "principal_amount_asc":
-        return sorted(rows, key=lambda x: float(x.principal_amount or "0"))
-    if order_by == "principal_amount_desc":
-        return sorted(rows, key=lambda x: float(x.principal_amount or "0"), reverse=True)
-    return sorted(rows, key=lambda x: x.case_id, reverse=True)
+    limit: int | None,
+    offset: int,
+    cursor: str | None,
+) -> Query:
+    query = compile_portfolio_query(
+        db,
+        tenant_id=tenant_id,
+        filters=filters,
+    )
+    if cursor:
+        cursor_key, cursor_id = decode_portfolio_cursor(cursor, order_by)
+        query = query.filter(_keyset_clause(order_by, cursor_key, cursor_id))
+        offset = 0
+
+    query = _with_row_counts(query, tenant_id=tenant_id)
+    query = query.order_by(*_order_clauses(order_by))
+
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+
+    return query
 
 
 def build_portfolio_rows(
@@ -240,70 +375,104 @@ def build_portfolio_rows(
     tenant_id: int,
     filters: dict[str, Any],
     order_by: str = "id_desc",
+    limit: int | None = None,
+    offset: int = 0,
+    cursor: str | None = None,
 ) -> list[PortfolioCaseRow]:
-    cases = _apply_case_filters(
+    query = _portfolio_rows_query(
         db,
         tenant_id=tenant_id,
         filters=filters,
+        order_by=order_by,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
     )
-    case_ids = [case.id for case in cases]
+    return [_build_row(*record) for record in query.all()]
 
-    waiting_counts = _count_runs_by_status(
-        db,
-        tenant_id=tenant_id,
-        case_ids=case_ids,
-        status="waiting",
-    )
-    blocked_counts = _count_runs_by_status(
-        db,
-        tenant_id=tenant_id,
-        case_ids=case_ids,
-        status="blocked",
-    )
-    pending_counts = _count_runs_by_status(
-        db,
-        tenant_id=tenant_id,
-        case_ids=case_ids,
-        status="pending",
-    )
-    external_counts = _count_external_actions(
+
+def serialize_portfolio_row(item: PortfolioCaseRow) -> dict[str, Any]:
+    return {
+        "case_id": item.case_id,
+        "debtor_name": item.debtor_name,
+        "debtor_type": item.debtor_type,
+        "contract_type": item.contract_type,
+        "principal_amount": item.principal_amount,
+        "due_date": item.due_date,
+        "case_status": item.case_status,
+        "is_archived": item.is_archived,
+        "days_overdue": item.days_overdue,
+        "debtor_inn": item.debtor_inn,
+        "debtor_ogrn": item.debtor_ogrn,
+        "waiting_runs_count": item.waiting_runs_count,
+        "blocked_runs_count": item.blocked_runs_count,
+        "pending_runs_count": item.pending_runs_count,
+        "external_actions_count": item.external_actions_count,
+    }
+
+
+def prepare_portfolio_stream(
+    db: Session,
+    *,
+    tenant_id: int,
+    filters: dict[str, Any],
+    order_by: str = "id_desc",
+    offset: int = 0,
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> dict[str, Any]:
+    # Курсор разбирается до начала потока, пока ещё можно вернуть 422.
+    if cursor:
+        decode_portfolio_cursor(cursor, order_by)
+
+    return {
+        "filters": filters,
+        "order_by": order_by,
+        "offset": 0 if cursor else offset,
+        "cursor": cursor,
+        "total": (
+            count_portfolio_cases(db, tenant_id=tenant_id, filters=filters)
+            if include_total
+            else None
+        ),
+    }
+
+
+def iter_portfolio_rows(
+    db: Session,
+    *,
+    tenant_id: int,
+    filters: dict[str, Any],
+    order_by: str = "id_desc",
+    offset: int = 0,
+    cursor: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    # Выгрузка без limit: строки идут с серверного курсора порциями yield_per.
+    query = _portfolio_rows_query(
         db,
         tenant_id=tenant_id,
-        case_ids=case_ids,
+        filters=filters,
+        order_by=order_by,
+        limit=None,
+        offset=offset,
+        cursor=cursor,
     )
+    for record in query.yield_per(STREAM_YIELD_PER):
+        yield serialize_portfolio_row(_build_row(*record))
 
-    rows: list[PortfolioCaseRow] = []
-    for case in cases:
-        inn, ogrn = _extract_debtor_identifiers(case)
-        row = PortfolioCaseRow(
-            case_id=case.id,
-            debtor_name=case.debtor_name,
-            debtor_type=_debtor_type_value(case),
-            contract_type=_contract_type_value(case),
-            principal_amount=str(case.principal_amount),
-            due_date=case.due_date.isoformat() if case.due_date else None,
-            case_status=_case_status_value(case),
-            is_archived=bool(getattr(case, "is_archived", False)),
-            days_overdue=_calc_days_overdue(case),
-            debtor_inn=inn,
-            debtor_ogrn=ogrn,
-            waiting_runs_count=waiting_counts.get(case.id, 0),
-            blocked_runs_count=blocked_counts.get(case.id, 0),
-            pending_runs_count=pending_counts.get(case.id, 0),
-            external_actions_count=external_counts.get(case.id, 0),
-        )
-        rows.append(row)
 
-    rows = _apply_run_presence_filters(
-        rows,
+def count_portfolio_cases(
+    db: Session,
+    *,
+    tenant_id: int,
+    filters: dict[str, Any],
+) -> int:
+    query = compile_portfolio_query(
+        db,
+        tenant_id=tenant_id,
         filters=filters,
     )
-    rows = _sort_rows(
-        rows,
-        order_by=order_by,
-    )
-
-    return rows
+    return int(query.with_entities(func.count(Case.id)).scalar() or 0)
 
 
 def query_portfolio(
@@ -314,43 +483,38 @@ def query_portfolio(
     limit: int = 100,
     offset: int = 0,
     order_by: str = "id_desc",
+    cursor: str | None = None,
+    include_total: bool = True,
 ) -> dict[str, Any]:
+    total = None
+    if include_total:
+        total = count_portfolio_cases(
+            db,
+            tenant_id=tenant_id,
+            filters=filters,
+        )
+
     rows = build_portfolio_rows(
         db,
         tenant_id=tenant_id,
         filters=filters,
         order_by=order_by,
+        limit=limit + 1,
+        offset=offset,
+        cursor=cursor,
     )
-
-    total = len(rows)
-    items = rows[offset : offset + limit]
+    items = rows[:limit]
+    next_cursor = encode_portfolio_cursor(order_by, items[-1]) if len(rows) > limit else None
 
     return {
         "filters": filters,
         "order_by": order_by,
         "limit": limit,
-        "offset": offset,
+        "offset": 0 if cursor else offset,
+        "cursor": cursor,
+        "next_cursor": next_cursor,
         "total": total,
-        "items": [
-            {
-                "case_id": item.case_id,
-                "debtor_name": item.debtor_name,
-                "debtor_type": item.debtor_type,
-                "contract_type": item.contract_type,
-                "principal_amount": item.principal_amount,
-                "due_date": item.due_date,
-                "case_status": item.case_status,
-                "is_archived": item.is_archived,
-                "days_overdue": item.days_overdue,
-                "debtor_inn": item.debtor_inn,
-                "debtor_ogrn": item.debtor_ogrn,
-                "waiting_runs_count": item.waiting_runs_count,
-                "blocked_runs_count": item.blocked_runs_count,
-                "pending_runs_count": item.pending_runs_count,
-                "external_actions_count": item.external_actions_count,
-            }
-            for item in items
-        ],
+        "items": [serialize_portfolio_row(item) for item in items],
     }
 
 
@@ -485,10 +649,15 @@ def resolve_case_ids_for_portfolio(
     order_by: str = "id_desc",
     limit: int = 1000,
 ) -> list[int]:
-    rows = build_portfolio_rows(
+    query = compile_portfolio_query(
         db,
         tenant_id=tenant_id,
         filters=filters,
-        order_by=order_by,
     )
-    return [item.case_id for item in rows[:limit]]
\ No newline at end of file
+    rows = (
+        query.with_entities(Case.id)
+        .order_by(*_order_clauses(order_by))
+        .limit(limit)
+        .all()
+    )
+    return [int(case_id) for (case_id,) in rows]
@@ -6,7 +6,7 @@ from typing import Any
 from sqlalchemy.orm import Session
 
 from backend.app.models import Case
-from backend.app.services.playbook_engine_service import evaluate_case_playbook
+from backend.app.services.playbook_engine_service import evaluate_playbooks_for_cases
 
 
 def _status_value(value: Any) -> str:
@@ -144,6 +144,7 @@ def build_portfolio_routing(
     *,
     tenant_id: int,
     cases: list[Case],
+    persist_waiting_buckets: bool = True,
 ) -> dict[str, Any]:
     ready: list[dict[str, Any]] = []
     waiting: list[dict[str, Any]] = []
@@ -157,9 +158,15 @@ def build_portfolio_routing(
         "closed_lane": 0,
     }
 
+    evaluations = evaluate_playbooks_for_cases(
+        db,
+        cases,
+        tenant_id=tenant_id,
+        persist_waiting_buckets=persist_waiting_buckets,
+    )
+
     for case in cases:
-        playbook_eval = evaluate_case_playbook(db, case, tenant_id=tenant_id)
-        row = serialize_portfolio_case_row(case, playbook_eval)
+        row = serialize_portfolio_case_row(case, evaluations[case.id])
 
         lane_summary[row["route_lane"]] = lane_summary.get(row["route_lane"], 0) + 1
 
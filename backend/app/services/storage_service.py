@@ -1,6 +1,20 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable, Iterator
+
+from backend.app.config import (
+    DOCUMENT_BLOB_CHUNK_SIZE,
+    DOCUMENT_BLOB_DIR,
+    DOCUMENT_BLOB_S3_BUCKET,
+    DOCUMENT_BLOB_S3_ENDPOINT_URL,
+    DOCUMENT_BLOB_S3_PREFIX,
+    DOCUMENT_BLOB_STORE,
+)
 
 
 class LocalStorageService:
@@ -8,18 +22,232 @@ class LocalStorageService:
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
-    def save_text(
+    def tenant_dir(self, tenant_id: int) -> Path:
+        return self.base_dir / f"tenant_{tenant_id}"
+
+    def path_for(self, *, tenant_id: int, filename: str) -> Path:
+        return self.tenant_dir(tenant_id) / filename
+
+    def save_bytes(
         self,
         *,
         tenant_id: int,
-        case_id: int,
         filename: str,
-        content: str,
+        content: bytes,
     ) -> str:
-        tenant_dir = self.base_dir / f"tenant_{tenant_id}" / f"case_{case_id}"
+        tenant_dir = self.tenant_dir(tenant_id)
         tenant_dir.mkdir(parents=True, exist_ok=True)
 
-        file_path = tenant_dir / filename
-        file_path.write_text(content, encoding="utf-8")
+        # Пишем во временный файл и подменяем: читатель не увидит недописанный файл.
+        fd, tmp_path = tempfile.mkstemp(dir=tenant_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(content)
+            file_path = tenant_dir / filename
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        return str(file_path)
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    provider: str
+    content_hash: str
+    size: int
+    created: bool
+
+
+def _validate_hash(content_hash: str) -> str:
+    normalized = (content_hash or "").strip().lower()
+    if len(normalized) != 64 or any(char not in "0123456789abcdef" for char in normalized):
+        raise ValueError(f"Invalid blob hash: {content_hash}")
+    return normalized
+
+
+def _iter_chunks(content: bytes, chunk_size: int) -> Iterator[bytes]:
+    view = memoryview(content)
+    for offset in range(0, len(view), chunk_size):
+        yield bytes(view[offset:offset + chunk_size])
+
+
+class BlobStore:
+    provider = "base"
+
+    def __init__(self, chunk_size: int = DOCUMENT_BLOB_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def put_stream(self, chunks: Iterable[bytes]) -> StoredBlob:
+        raise NotImplementedError
+
+    def open_stream(self, content_hash: str) -> Iterator[bytes]:
+        raise NotImplementedError
+
+    def exists(self, content_hash: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, content_hash: str) -> None:
+        raise NotImplementedError
+
+    def put_bytes(self, content: bytes) -> StoredBlob:
+        return self.put_stream(_iter_chunks(content, self.chunk_size))
+
+    def put_text(self, content: str) -> StoredBlob:
+        return self.put_bytes(content.encode("utf-8"))
+
+    def read_bytes(self, content_hash: str) -> bytes:
+        return b"".join(self.open_stream(content_hash))
+
+    def read_text(self, content_hash: str) -> str:
+        return self.read_bytes(content_hash).decode("utf-8")
+
+
+class LocalBlobStore(BlobStore):
+    provider = "local"
+
+    def __init__(self, base_dir: str = DOCUMENT_BLOB_DIR, chunk_size: int = DOCUMENT_BLOB_CHUNK_SIZE):
+        super().__init__(chunk_size=chunk_size)
+        self.base_dir = Path(base_dir)
+        self.tmp_dir = self.base_dir / "tmp"
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, content_hash: str) -> Path:
+        normalized = _validate_hash(content_hash)
+        # Два уровня шардирования, чтобы в одном каталоге не копились миллионы файлов.
+        return self.base_dir / normalized[:2] / normalized[2:4] / normalized
+
+    def put_stream(self, chunks: Iterable[bytes]) -> StoredBlob:
+        digest = hashlib.sha256()
+        size = 0
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir, prefix="blob-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    handle.write(chunk)
+                    size += len(chunk)
+
+            content_hash = digest.hexdigest()
+            target = self.path_for(content_hash)
+            if target.exists():
+                # Такой документ уже лежит в хранилище: второй экземпляр не нужен.
+                os.unlink(tmp_path)
+                return StoredBlob(provider=self.provider, content_hash=content_hash, size=size, created=False)
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        return StoredBlob(provider=self.provider, content_hash=content_hash, size=size, created=True)
+
+    def open_stream(self, content_hash: str) -> Iterator[bytes]:
+        path = self.path_for(content_hash)
+        if not path.exists():
+            raise FileNotFoundError(f"Blob not found: {content_hash}")
+
+        def _read() -> Iterator[bytes]:
+            with path.open("rb") as handle:
+                while chunk := handle.read(self.chunk_size):
+                    yield chunk
+
+        return _read()
+
+    def exists(self, content_hash: str) -> bool:
+        return self.path_for(content_hash).exists()
+
+    def delete(self, content_hash: str) -> None:
+        self.path_for(content_hash).unlink(missing_ok=True)
+
+
+class S3BlobStore(BlobStore):
+    provider = "s3"
+
+    def __init__(
+        self,
+        bucket: str = DOCUMENT_BLOB_S3_BUCKET,
+        *,
+        endpoint_url: str | None = DOCUMENT_BLOB_S3_ENDPOINT_URL,
+        prefix: str = DOCUMENT_BLOB_S3_PREFIX,
+        chunk_size: int = DOCUMENT_BLOB_CHUNK_SIZE,
+    ):
+        super().__init__(chunk_size=chunk_size)
+        try:
+            import boto3
+        except ImportError as exc:
+            raise RuntimeError("S3 blob store requires boto3 to be installed") from exc
+
+        if not bucket:
+            raise RuntimeError("DOCUMENT_BLOB_S3_BUCKET is not configured")
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        # endpoint_url позволяет подключить локальный S3-совместимый сервер (MinIO и т.п.).
+        self.client = boto3.client("s3", endpoint_url=endpoint_url or None)
+
+    def key_for(self, content_hash: str) -> str:
+        normalized = _validate_hash(content_hash)
+        key = f"{normalized[:2]}/{normalized[2:4]}/{normalized}"
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put_stream(self, chunks: Iterable[bytes]) -> StoredBlob:
+        digest = hashlib.sha256()
+        size = 0
+
+        # Хеш известен только после чтения всего потока, поэтому буферизуем во временный файл.
+        with tempfile.SpooledTemporaryFile(max_size=self.chunk_size * 16) as buffer:
+            for chunk in chunks:
+                digest.update(chunk)
+                buffer.write(chunk)
+                size += len(chunk)
+
+            content_hash = digest.hexdigest()
+            if self.exists(content_hash):
+                return StoredBlob(provider=self.provider, content_hash=content_hash, size=size, created=False)
+
+            buffer.seek(0)
+            self.client.upload_fileobj(buffer, self.bucket, self.key_for(content_hash))
+
+        return StoredBlob(provider=self.provider, content_hash=content_hash, size=size, created=True)
+
+    def open_stream(self, content_hash: str) -> Iterator[bytes]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self.key_for(content_hash))
+        except self.client.exceptions.NoSuchKey as exc:
+            raise FileNotFoundError(f"Blob not found: {content_hash}") from exc
+        return response["Body"].iter_chunks(chunk_size=self.chunk_size)
+
+    def exists(self, content_hash: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.key_for(content_hash))
+        except self.client.exceptions.ClientError:
+            return False
+        return True
+
+    def delete(self, content_hash: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self.key_for(content_hash))
+
+
+_BLOB_STORES: dict[str, type[BlobStore]] = {
+    LocalBlobStore.provider: LocalBlobStore,
+    S3BlobStore.provider: S3BlobStore,
+}
+_blob_store_instances: dict[str, BlobStore] = {}
+
+
+def get_blob_store(provider: str | None = None) -> BlobStore:
+    normalized = (provider or DOCUMENT_BLOB_STORE or "").strip().lower()
+    store_cls = _BLOB_STORES.get(normalized)
+    if not store_cls:
+        raise ValueError(f"Unknown blob store: {provider or DOCUMENT_BLOB_STORE}")
 
-        return str(file_path)
\ No newline at end of file
+    store = _blob_store_instances.get(normalized)
+    if store is None:
+        store = _blob_store_instances.setdefault(normalized, store_cls())
+    return store
@@ -3,24 +3,22 @@ from __future__ import annotations
 from fastapi import HTTPException
 from sqlalchemy.orm import Query, Session
 
-from backend.app.models import Case, CaseParticipant, DebtorProfile, Tenant
-from backend.app.services.tenant_service import get_or_create_default_tenant
+from backend.app.models import Case, CaseParticipant, DebtorProfile
+from backend.app.services.tenant_service import get_cached_default_tenant_id, tenant_exists_cached
 
 
 def current_tenant_id(db: Session) -> int:
-    tenant = get_or_create_default_tenant(db)
-    return tenant.id
+    return get_cached_default_tenant_id(db)
 
 
 def resolve_current_tenant_id(db: Session, tenant_id: int | None) -> int:
     if tenant_id is None:
         return current_tenant_id(db)
 
-    tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
-    if not tenant:
+    if not tenant_exists_cached(db, tenant_id):
         raise HTTPException(status_code=404, detail="Tenant not found")
 
-    return tenant.id
+    return tenant_id
 
 
 def filter_cases_by_tenant(
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import threading
+import time
 from datetime import datetime
 from typing import Any
 
 from sqlalchemy.orm import Session
 
-from backend.app.config import DEFAULT_TENANT_NAME, DEFAULT_TENANT_SLUG
+from backend.app.config import DEFAULT_TENANT_NAME, DEFAULT_TENANT_SLUG, TENANT_CACHE_TTL_SECONDS
 from backend.app.models import (
     AutomationRule,
     AutomationRun,
@@ -17,6 +19,8 @@ from backend.app.models import (
     CasePlaybook,
     CaseProjection,
     CaseWaitingBucket,
+    ControlRoomCaseStat,
+    DebtorIdentity,
     DebtorProfile,
     DocumentTemplate,
     EsiaSession,
@@ -41,6 +45,8 @@ TENANT_BOUND_MODELS: list[type[Any]] = [
     Case,
     CaseParticipant,
     DebtorProfile,
+    DebtorIdentity,
+    ControlRoomCaseStat,
     TimelineEvent,
     CaseProjection,
     CaseIntegration,
@@ -61,6 +67,79 @@ TENANT_BOUND_MODELS: list[type[Any]] = [
 ]
 
 
+# Кэш процесса: id существующих тенантов и id тенанта по умолчанию с TTL.
+# Отрицательные результаты не кэшируются — новый тенант виден сразу.
+_tenant_cache_lock = threading.Lock()
+_known_tenant_ids: dict[int, float] = {}
+_default_tenant_cache: dict[str, Any] = {"id": None, "expires_at": 0.0}
+
+
+def _cache_expires_at() -> float:
+    return time.monotonic() + TENANT_CACHE_TTL_SECONDS
+
+
+def _remember_tenant_id(tenant_id: int, *, is_default: bool = False) -> None:
+    if TENANT_CACHE_TTL_SECONDS <= 0:
+        return
+
+    expires_at = _cache_expires_at()
+    with _tenant_cache_lock:
+        _known_tenant_ids[tenant_id] = expires_at
+        if is_default:
+            _default_tenant_cache["id"] = tenant_id
+            _default_tenant_cache["expires_at"] = expires_at
+
+
+def invalidate_tenant_cache(tenant_id: int | None = None) -> None:
+    with _tenant_cache_lock:
+        if tenant_id is None:
+            _known_tenant_ids.clear()
+            _default_tenant_cache["id"] = None
+            _default_tenant_cache["expires_at"] = 0.0
+            return
+
+        _known_tenant_ids.pop(tenant_id, None)
+        if _default_tenant_cache["id"] == tenant_id:
+            _default_tenant_cache["id"] = None
+            _default_tenant_cache["expires_at"] = 0.0
+
+
+def get_cached_default_tenant_id(db: Session) -> int:
+    now = time.monotonic()
+    with _tenant_cache_lock:
+        if _default_tenant_cache["id"] is not None and _default_tenant_cache["expires_at"] > now:
+            return _default_tenant_cache["id"]
+
+    tenant = get_default_tenant(db)
+    if tenant is None:
+        # Штатно тенант создаётся на старте (ensure_default_tenant); сюда попадают
+        # только процессы, которые стартовали без него (скрипты, воркеры на пустой базе).
+        tenant = get_or_create_default_tenant(db)
+
+    _remember_tenant_id(tenant.id, is_default=True)
+    return tenant.id
+
+
+def tenant_exists_cached(db: Session, tenant_id: int) -> bool:
+    now = time.monotonic()
+    with _tenant_cache_lock:
+        expires_at = _known_tenant_ids.get(tenant_id)
+        if expires_at is not None and expires_at > now:
+            return True
+
+    exists = db.query(Tenant.id).filter(Tenant.id == tenant_id).first() is not None
+    if exists:
+        _remember_tenant_id(tenant_id)
+    return exists
+
+
+def ensure_default_tenant(db: Session) -> int:
+    tenant = get_or_create_default_tenant(db)
+    db.commit()
+    _remember_tenant_id(tenant.id, is_default=True)
+    return tenant.id
+
+
 def get_default_tenant(db: Session) -> Tenant | None:
     return db.query(Tenant).filter(Tenant.slug == DEFAULT_TENANT_SLUG).first()
 
@@ -142,6 +221,8 @@ def bootstrap_tenants_for_existing_data(db: Session) -> dict:
         if updated_count:
             backfilled[model.__name__] = updated_count
 
+    invalidate_tenant_cache()
+
     return {
         "ok": True,
         "default_tenant_id": tenant.id,
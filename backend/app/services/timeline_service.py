@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterator
+
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+from backend.app.config import STREAM_YIELD_PER
+from backend.app.events import CaseEventType
+from backend.app.models import TimelineEvent
+
+
+TIMELINE_DEFAULT_LIMIT = 100
+
+
+def serialize_timeline_event(item: TimelineEvent) -> dict[str, Any]:
+    return {
+        "id": item.id,
+        "event_type": item.event_type,
+        "title": item.title,
+        "details": item.details,
+        "created_at": item.created_at.isoformat() if item.created_at else None,
+        "dedup_key": getattr(item, "dedup_key", None),
+    }
+
+
+TIMELINE_EVENT_TYPES = frozenset(item.value for item in CaseEventType)
+
+
+def _validate_timeline_filters(*, cursor: int | None, event_types: list[str] | None) -> None:
+    if cursor is not None and cursor < 1:
+        raise HTTPException(status_code=422, detail="Invalid timeline cursor")
+
+    unknown = sorted({item for item in (event_types or []) if item} - TIMELINE_EVENT_TYPES)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown event types: {', '.join(unknown)}")
+
+
+def _filtered_query(
+    query: Query,
+    *,
+    case_id: int,
+    event_types: list[str] | None,
+    since: datetime | None,
+) -> Query:
+    query = query.filter(TimelineEvent.case_id == case_id)
+
+    event_types = [item for item in (event_types or []) if item]
+    if event_types:
+        query = query.filter(TimelineEvent.event_type.in_(event_types))
+    if since is not None:
+        query = query.filter(TimelineEvent.created_at >= since)
+
+    return query
+
+
+def _timeline_query(
+    db: Session,
+    *,
+    case_id: int,
+    event_types: list[str] | None = None,
+    since: datetime | None = None,
+    cursor: int | None = None,
+) -> Query:
+    query = _filtered_query(
+        db.query(TimelineEvent),
+        case_id=case_id,
+        event_types=event_types,
+        since=since,
+    )
+    # Keyset по id (новые сверху) идёт по индексу (case_id, id) без OFFSET.
+    if cursor is not None:
+        query = query.filter(TimelineEvent.id < cursor)
+    return query.order_by(TimelineEvent.id.desc())
+
+
+def list_case_timeline(
+    db: Session,
+    *,
+    case_id: int,
+    limit: int = TIMELINE_DEFAULT_LIMIT,
+    cursor: int | None = None,
+    event_types: list[str] | None = None,
+    since: datetime | None = None,
+) -> dict[str, Any]:
+    _validate_timeline_filters(cursor=cursor, event_types=event_types)
+
+    rows = (
+        _timeline_query(
+            db,
+            case_id=case_id,
+            event_types=event_types,
+            since=since,
+            cursor=cursor,
+        )
+        .limit(limit + 1)
+        .all()
+    )
+    items = rows[:limit]
+
+    return {
+        "case_id": case_id,
+        "limit": limit,
+        "cursor": cursor,
+        "next_cursor": items[-1].id if len(rows) > limit else None,
+        "items": [serialize_timeline_event(item) for item in items],
+    }
+
+
+def prepare_case_timeline_stream(
+    *,
+    case_id: int,
+    cursor: int | None = None,
+    event_types: list[str] | None = None,
+) -> dict[str, Any]:
+    # Фильтры проверяются до начала потока, пока ещё можно вернуть 422.
+    _validate_timeline_filters(cursor=cursor, event_types=event_types)
+    return {"case_id": case_id, "cursor": cursor}
+
+
+def iter_case_timeline(
+    db: Session,
+    *,
+    case_id: int,
+    cursor: int | None = None,
+    event_types: list[str] | None = None,
+    since: datetime | None = None,
+) -> Iterator[dict[str, Any]]:
+    query = _timeline_query(
+        db,
+        case_id=case_id,
+        event_types=event_types,
+        since=since,
+        cursor=cursor,
+    )
+    for item in query.yield_per(STREAM_YIELD_PER):
+        yield serialize_timeline_event(item)
+
+
+def summarize_case_timeline(
+    db: Session,
+    *,
+    case_id: int,
+    event_types: list[str] | None = None,
+    since: datetime | None = None,
+) -> dict[str, Any]:
+    _validate_timeline_filters(cursor=None, event_types=event_types)
+
+    # Только агрегаты: details (Text) не читается.
+    rows = (
+        _filtered_query(
+            db.query(
+                TimelineEvent.event_type,
+                func.count(TimelineEvent.id),
+                func.max(TimelineEvent.created_at),
+            ),
+            case_id=case_id,
+            event_types=event_types,
+            since=since,
+        )
+        .group_by(TimelineEvent.event_type)
+        .all()
+    )
+
+    by_event_type = {
+        event_type: {
+            "count": int(count),
+            "last_event_at": last_event_at.isoformat() if last_event_at else None,
+        }
+        for event_type, count, last_event_at in sorted(rows, key=lambda row: row[0])
+    }
+
+    return {
+        "case_id": case_id,
+        "total": sum(item["count"] for item in by_event_type.values()),
+        "by_event_type": by_event_type,
+    }
@@ -85,9 +85,40 @@ def get_open_waiting_bucket(
     )
 
 
-def create_or_update_waiting_bucket(
+OPEN_BUCKETS_CHUNK_SIZE = 1000
+
+
+def load_open_waiting_buckets(
+    db: Session,
+    *,
+    tenant_id: int,
+    case_ids: list[int],
+) -> dict[tuple[int, str], list[CaseWaitingBucket]]:
+    result: dict[tuple[int, str], list[CaseWaitingBucket]] = {}
+
+    for start in range(0, len(case_ids), OPEN_BUCKETS_CHUNK_SIZE):
+        chunk = case_ids[start : start + OPEN_BUCKETS_CHUNK_SIZE]
+        rows = (
+            db.query(CaseWaitingBucket)
+            .filter(
+                CaseWaitingBucket.tenant_id == tenant_id,
+                CaseWaitingBucket.case_id.in_(chunk),
+                CaseWaitingBucket.status == "waiting",
+                CaseWaitingBucket.resolved_at.is_(None),
+            )
+            .order_by(CaseWaitingBucket.id.desc())
+            .all()
+        )
+        for row in rows:
+            result.setdefault((row.case_id, row.step_code), []).append(row)
+
+    return result
+
+
+def upsert_waiting_bucket_row(
     db: Session,
     *,
+    row: CaseWaitingBucket | None,
     tenant_id: int,
     case_id: int,
     playbook_code: str | None,
@@ -99,32 +130,16 @@ def create_or_update_waiting_bucket(
     if not eligible_at:
         return None
 
-    row = get_open_waiting_bucket(
-        db,
-        tenant_id=tenant_id,
-        case_id=case_id,
-        step_code=step_code,
-    )
-
+    now = utcnow()
     if not row:
         row = CaseWaitingBucket(
             tenant_id=tenant_id,
             case_id=case_id,
-            playbook_code=playbook_code,
             step_code=step_code,
-            bucket_code="waiting_for_eligibility",
             status="waiting",
-            reason_code=reason_code,
-            reason_text=reason_text,
-            eligible_at=eligible_at,
             resolved_at=None,
-            payload_json=json.dumps(payload or {}, ensure_ascii=False),
-            created_at=utcnow(),
-            updated_at=utcnow(),
+            created_at=now,
         )
-        db.add(row)
-        db.flush()
-        return row
 
     row.playbook_code = playbook_code
     row.bucket_code = "waiting_for_eligibility"
@@ -132,10 +147,51 @@ def create_or_update_waiting_bucket(
     row.reason_text = reason_text
     row.eligible_at = eligible_at
     row.payload_json = json.dumps(payload or {}, ensure_ascii=False)
-    row.updated_at = utcnow()
+    row.updated_at = now
 
     db.add(row)
-    db.flush()
+    return row
+
+
+def resolve_waiting_bucket_rows(db: Session, rows: list[CaseWaitingBucket]) -> int:
+    now = utcnow()
+    for row in rows:
+        row.status = "resolved"
+        row.resolved_at = now
+        row.updated_at = now
+        db.add(row)
+    return len(rows)
+
+
+def create_or_update_waiting_bucket(
+    db: Session,
+    *,
+    tenant_id: int,
+    case_id: int,
+    playbook_code: str | None,
+    step_code: str,
+    waiting_rule_code: str | None,
+    payload: dict[str, Any] | None = None,
+) -> CaseWaitingBucket | None:
+    row = get_open_waiting_bucket(
+        db,
+        tenant_id=tenant_id,
+        case_id=case_id,
+        step_code=step_code,
+    )
+
+    row = upsert_waiting_bucket_row(
+        db,
+        row=row,
+        tenant_id=tenant_id,
+        case_id=case_id,
+        playbook_code=playbook_code,
+        step_code=step_code,
+        waiting_rule_code=waiting_rule_code,
+        payload=payload,
+    )
+    if row is not None:
+        db.flush()
     return row
 
 
@@ -158,15 +214,9 @@ def resolve_waiting_bucket(
         .all()
     )
 
-    now = utcnow()
-    for row in rows:
-        row.status = "resolved"
-        row.resolved_at = now
-        row.updated_at = now
-        db.add(row)
-
+    resolved = resolve_waiting_bucket_rows(db, rows)
     db.flush()
-    return len(rows)
+    return resolved
 
 
 def list_waiting_buckets(
@@ -1,27 +1,40 @@
 from __future__ import annotations
 
-import json
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from fastapi import HTTPException
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
 
-from backend.app.models import JobQueueJob
+from backend.app.config import JOB_RETRY_BASE_SECONDS, JOB_RETRY_MAX_SECONDS
+from backend.app.models import JobQueueAttempt, JobQueueJob, WorkerLease
+from backend.app.services.job_handler_registry import get_job_handler
+from backend.app.services.job_queue_service import load_job_payload
+from backend.app.services.job_wakeup_service import notify_job_enqueued
 
 
-def claim_next_job(db: Session):
+CLAIM_CANDIDATES = 5
 
-    job = (
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _claimable_query(db: Session, now: datetime):
+    return (
         db.query(JobQueueJob)
-        .filter(JobQueueJob.status == "pending")
+        .filter(
+            JobQueueJob.status == "pending",
+            or_(JobQueueJob.scheduled_at.is_(None), JobQueueJob.scheduled_at <= now),
+        )
         .order_by(JobQueueJob.priority.asc(), JobQueueJob.id.asc())
-        .first()
     )
 
-    if not job:
-        return None
 
+def _mark_running(db: Session, job: JobQueueJob, worker_id: str, now: datetime) -> JobQueueJob:
     job.status = "running"
-    job.started_at = datetime.utcnow()
+    job.worker_id = worker_id
+    job.started_at = now
 
     db.add(job)
     db.flush()
@@ -29,9 +42,259 @@ def claim_next_job(db: Session):
     return job
 
 
-def finish_job(db: Session, job: JobQueueJob):
+def claim_next_job(db: Session, *, worker_id: str) -> JobQueueJob | None:
+    now = datetime.utcnow()
+
+    if _is_postgres(db):
+        # Строки, уже захваченные другими воркерами, просто пропускаются.
+        job = _claimable_query(db, now).with_for_update(skip_locked=True).first()
+        if not job:
+            return None
+        return _mark_running(db, job, worker_id, now)
+
+    # SQLite не умеет SKIP LOCKED: захват через условный UPDATE,
+    # выигрывает тот, у кого UPDATE затронул строку.
+    candidate_ids = [
+        row.id
+        for row in _claimable_query(db, now).with_entities(JobQueueJob.id).limit(CLAIM_CANDIDATES)
+    ]
+
+    for job_id in candidate_ids:
+        claimed = (
+            db.query(JobQueueJob)
+            .filter(JobQueueJob.id == job_id, JobQueueJob.status == "pending")
+            .update(
+                {
+                    JobQueueJob.status: "running",
+                    JobQueueJob.worker_id: worker_id,
+                    JobQueueJob.started_at: now,
+                },
+                synchronize_session=False,
+            )
+        )
+        if claimed:
+            job = db.get(JobQueueJob, job_id)
+            db.refresh(job)
+            return job
+
+    return None
+
+
+def next_scheduled_at(db: Session) -> datetime | None:
+    return (
+        db.query(func.min(JobQueueJob.scheduled_at))
+        .filter(
+            JobQueueJob.status == "pending",
+            JobQueueJob.scheduled_at > datetime.utcnow(),
+        )
+        .scalar()
+    )
+
+
+def _update_owned_job(db: Session, job: JobQueueJob, worker_id: str, values: dict) -> bool:
+    # Задачу, которую уже вернули в очередь и отдали другому воркеру, прежний владелец не трогает.
+    updated = (
+        db.query(JobQueueJob)
+        .filter(
+            JobQueueJob.id == job.id,
+            JobQueueJob.status == "running",
+            JobQueueJob.worker_id == worker_id,
+        )
+        .update(values, synchronize_session=False)
+    )
+    db.expire(job)
+    return bool(updated)
+
+
+def finish_job(db: Session, job: JobQueueJob, *, worker_id: str) -> bool:
+    return _update_owned_job(
+        db,
+        job,
+        worker_id,
+        {
+            JobQueueJob.status: "finished",
+            JobQueueJob.worker_id: None,
+            JobQueueJob.finished_at: datetime.utcnow(),
+        },
+    )
+
+
+def retry_delay_seconds(retry_count: int) -> int:
+    return min(JOB_RETRY_BASE_SECONDS * (2 ** max(retry_count - 1, 0)), JOB_RETRY_MAX_SECONDS)
+
+
+def fail_job(db: Session, job: JobQueueJob, *, worker_id: str, retryable: bool = True) -> bool:
+
+    now = datetime.utcnow()
+    retry_count = int(job.retry_count or 0) + 1
+    values = {
+        JobQueueJob.retry_count: retry_count,
+        JobQueueJob.worker_id: None,
+    }
+
+    if retryable and retry_count <= int(job.max_retries or 0):
+        # Экспоненциальная задержка: 10s, 20s, 40s ... до JOB_RETRY_MAX_SECONDS.
+        values[JobQueueJob.status] = "pending"
+        values[JobQueueJob.started_at] = None
+        values[JobQueueJob.scheduled_at] = now + timedelta(seconds=retry_delay_seconds(retry_count))
+    else:
+        values[JobQueueJob.status] = "failed"
+        values[JobQueueJob.finished_at] = now
+
+    return _update_owned_job(db, job, worker_id, values)
+
+
+def _mark_attempt_lost(attempt: JobQueueAttempt) -> None:
+    attempt.status = "lost"
+    attempt.error_message = "Job was reclaimed from this worker"
+    attempt.finished_at = datetime.utcnow()
+
+
+def _is_retryable(exc: Exception) -> bool:
+    # Ошибки валидации и 4xx повтор не исправит.
+    if isinstance(exc, HTTPException):
+        return exc.status_code >= 500
+    return not isinstance(exc, (KeyError, ValueError, TypeError))
+
+
+def execute_claimed_job(db: Session, job: JobQueueJob, *, worker_id: str) -> JobQueueAttempt:
+    attempt = JobQueueAttempt(
+        job_id=job.id,
+        worker_id=worker_id,
+        status="running",
+        started_at=datetime.utcnow(),
+    )
+    db.add(attempt)
+    db.commit()
+
+    try:
+        handler = get_job_handler(job.job_type)
+        handler(db, tenant_id=job.tenant_id, payload=load_job_payload(job))
+
+        if finish_job(db, job, worker_id=worker_id):
+            attempt.status = "succeeded"
+            attempt.finished_at = datetime.utcnow()
+        else:
+            # Аренда потеряна: откатывается только незафиксированный хвост. Что обработчик
+            # успел закоммитить сам, остаётся — новый владелец повторит задачу поверх этого.
+            db.rollback()
+            _mark_attempt_lost(attempt)
+        db.add(attempt)
+        db.commit()
+    except Exception as exc:
+        # Откатываем незафиксированные изменения обработчика, попытку и задачу фиксируем отдельно.
+        db.rollback()
+
+        if fail_job(db, job, worker_id=worker_id, retryable=_is_retryable(exc)):
+            attempt.status = "failed"
+            attempt.error_message = f"{type(exc).__name__}: {getattr(exc, 'detail', None) or exc}"[:2000]
+            attempt.finished_at = datetime.utcnow()
+        else:
+            _mark_attempt_lost(attempt)
+        db.add(attempt)
+        db.commit()
+
+    return attempt
+
+
+def register_worker(db: Session, *, worker_id: str, lease_seconds: int) -> WorkerLease:
+    now = datetime.utcnow()
+
+    lease = db.query(WorkerLease).filter(WorkerLease.worker_id == worker_id).first()
+    if not lease:
+        lease = WorkerLease(worker_id=worker_id)
+
+    lease.last_heartbeat = now
+    lease.lease_until = now + timedelta(seconds=lease_seconds)
+
+    db.add(lease)
+    db.flush()
+
+    return lease
+
+
+def heartbeat_workers(db: Session, *, worker_ids: list[str], lease_seconds: int) -> int:
+    if not worker_ids:
+        return 0
+
+    now = datetime.utcnow()
+    updated = (
+        db.query(WorkerLease)
+        .filter(WorkerLease.worker_id.in_(worker_ids))
+        .update(
+            {
+                WorkerLease.last_heartbeat: now,
+                WorkerLease.lease_until: now + timedelta(seconds=lease_seconds),
+            },
+            synchronize_session=False,
+        )
+    )
+    return int(updated or 0)
+
+
+def restore_worker_leases(db: Session, *, worker_ids: list[str], lease_seconds: int) -> list[str]:
+    # Аренду мог удалить reclaim_expired_jobs другого хоста после паузы процесса.
+    live = {
+        row.worker_id
+        for row in db.query(WorkerLease.worker_id).filter(WorkerLease.worker_id.in_(worker_ids))
+    }
+    missing = [worker_id for worker_id in worker_ids if worker_id not in live]
+    for worker_id in missing:
+        register_worker(db, worker_id=worker_id, lease_seconds=lease_seconds)
+    return missing
+
+
+def release_worker(db: Session, *, worker_id: str) -> None:
+    db.query(WorkerLease).filter(WorkerLease.worker_id == worker_id).delete(synchronize_session=False)
+
+
+def reclaim_expired_jobs(db: Session) -> int:
+    now = datetime.utcnow()
+    live_workers = select(WorkerLease.worker_id).where(WorkerLease.lease_until >= now)
+
+    # Задачи воркеров без живой аренды возвращаются в очередь.
+    orphaned_ids = [
+        row.id
+        for row in db.query(JobQueueJob.id).filter(
+            JobQueueJob.status == "running",
+            or_(
+                JobQueueJob.worker_id.is_(None),
+                JobQueueJob.worker_id.not_in(live_workers),
+            ),
+        )
+    ]
+    db.query(WorkerLease).filter(WorkerLease.lease_until < now).delete(synchronize_session=False)
+
+    if not orphaned_ids:
+        return 0
+
+    (
+        db.query(JobQueueAttempt)
+        .filter(JobQueueAttempt.job_id.in_(orphaned_ids), JobQueueAttempt.status == "running")
+        .update(
+            {
+                JobQueueAttempt.status: "lost",
+                JobQueueAttempt.error_message: "Worker lease expired",
+                JobQueueAttempt.finished_at: now,
+            },
+            synchronize_session=False,
+        )
+    )
+
+    reclaimed = (
+        db.query(JobQueueJob)
+        .filter(JobQueueJob.id.in_(orphaned_ids), JobQueueJob.status == "running")
+        .update(
+            {
+                JobQueueJob.status: "pending",
+                JobQueueJob.worker_id: None,
+                JobQueueJob.started_at: None,
+            },
+            synchronize_session=False,
+        )
+    )
 
-    job.status = "finished"
-    job.finished_at = datetime.utcnow()
+    if reclaimed:
+        notify_job_enqueued(db)
 
-    db.add(job)
\ No newline at end of file
+    return int(reclaimed or 0)
@@ -0,0 +1,56 @@
+import argparse
+import time
+
+from backend.app.services.document_render_service import render_document, warmup_document_renderers
+
+
+SAMPLE_TEMPLATE = {
+    "code": "pretension",
+    "title": "Досудебная претензия",
+    "file_stub": "dosudebnaya_pretenziya",
+    "paragraphs": [
+        "Кому: ООО «Ромашка»",
+        "Адрес: 650000, г. Кемерово, ул. Весенняя, д. 1",
+        "",
+        "От: ООО «Кредитор»",
+        "ИНН/ОГРН: 4205301694 / 1154205001234",
+        "",
+        "ПРЕТЕНЗИЯ",
+        "",
+        "По договору поставки образовалась задолженность в размере 125 000,00 руб. "
+        "Срок исполнения обязательства истёк 01.02.2026. " * 3,
+        "Просим погасить задолженность в течение 10 календарных дней с даты получения претензии. "
+        "В противном случае кредитор обратится в арбитражный суд с иском о взыскании долга, "
+        "неустойки и судебных расходов.",
+        "",
+        "Дата: 18.10.2026",
+        "Генеральный директор Иванов И. И.",
+        "Действует на основании устава",
+    ],
+}
+
+
+def run_benchmark(export_format: str, count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        render_document(export_format, SAMPLE_TEMPLATE)
+    elapsed = time.perf_counter() - started
+    return count / elapsed if elapsed else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render throughput for document exports")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--format", choices=["pdf", "docx", "all"], default="all")
+    args = parser.parse_args()
+
+    warmup_document_renderers()
+
+    formats = ["pdf", "docx"] if args.format == "all" else [args.format]
+    for export_format in formats:
+        rate = run_benchmark(export_format, args.count)
+        print(f"{export_format}: {rate:.1f} docs/s ({args.count} documents)")
+
+
+if __name__ == "__main__":
+    main()
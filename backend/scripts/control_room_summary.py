@@ -0,0 +1,79 @@
+import argparse
+
+from backend.app.database import SessionLocal
+from backend.app.models import Tenant
+from backend.app.services.control_room_service import refresh_stale_priorities
+from backend.app.services.control_room_summary_service import (
+    build_missing_control_room_summaries,
+    reconcile_control_room_summary,
+    roll_over_overdue,
+)
+
+
+def run_build():
+    db = SessionLocal()
+    try:
+        result = build_missing_control_room_summaries(db)
+        db.commit()
+        print("Built summaries for tenants:", result["built_tenant_ids"])
+    finally:
+        db.close()
+
+
+def run_roll_over():
+    db = SessionLocal()
+    try:
+        result = roll_over_overdue(db)
+        db.commit()
+        print("Rolled over", result["rolled_over"], "summary rows as of", result["as_of"])
+    finally:
+        db.close()
+
+
+def run_refresh_priorities():
+    db = SessionLocal()
+    try:
+        for tenant in db.query(Tenant).order_by(Tenant.id.asc()).all():
+            refreshed = refresh_stale_priorities(db, tenant_id=tenant.id, limit=None)
+            db.commit()
+            print("Tenant", tenant.id, "refreshed priorities:", refreshed)
+    finally:
+        db.close()
+
+
+def run_reconcile(repair: bool):
+    db = SessionLocal()
+    failed = 0
+    try:
+        for tenant in db.query(Tenant).order_by(Tenant.id.asc()).all():
+            result = reconcile_control_room_summary(db, tenant_id=tenant.id, repair=repair)
+            if result["ok"]:
+                print("Tenant", tenant.id, "ok")
+                continue
+
+            failed += 1
+            print("Tenant", tenant.id, "mismatches:", len(result["mismatches"]))
+            for item in result["mismatches"]:
+                print("  ", item)
+
+        db.commit()
+    finally:
+        db.close()
+
+    return 1 if failed and not repair else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Control room summary maintenance")
+    parser.add_argument("command", choices=["build", "roll-over", "refresh-priorities", "reconcile"])
+    parser.add_argument("--repair", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        run_build()
+    elif args.command == "roll-over":
+        run_roll_over()
+    elif args.command == "refresh-priorities":
+        run_refresh_priorities()
+    else:
+        raise SystemExit(run_reconcile(args.repair))
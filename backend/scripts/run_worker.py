@@ -1,33 +1,194 @@
+import argparse
+import multiprocessing
+import os
+import socket
+import threading
 import time
+from datetime import datetime
 
-from backend.app.database import SessionLocal
-from backend.app.services.worker_execution_service import claim_next_job, finish_job
+from backend.app.config import (
+    WORKER_HEARTBEAT_SECONDS,
+    WORKER_IDLE_MAX_SECONDS,
+    WORKER_IDLE_MIN_SECONDS,
+    WORKER_LEASE_SECONDS,
+    WORKER_PROCESSES,
+    WORKER_THREADS,
+)
+from backend.app.database import SessionLocal, dispose_engines
+from backend.app.services.control_room_summary_service import schedule_stale_priority_refreshes
+from backend.app.services.document_bulk_export_service import shutdown_render_pool
+from backend.app.services.job_wakeup_service import JobWakeupHub
+from backend.app.services.worker_execution_service import (
+    claim_next_job,
+    execute_claimed_job,
+    heartbeat_workers,
+    next_scheduled_at,
+    reclaim_expired_jobs,
+    register_worker,
+    release_worker,
+    restore_worker_leases,
+)
 
 
-def run_worker():
+def _make_worker_id(index: int) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
 
-    print("Worker started")
 
-    while True:
+def _worker_loop(worker_id: str, stop: threading.Event, hub: JobWakeupHub):
+
+    print("Worker started", worker_id)
+
+    idle_seconds = WORKER_IDLE_MIN_SECONDS
+
+    while not stop.is_set():
+
+        # Поколение берём до захвата, чтобы не пропустить NOTIFY между запросом и ожиданием.
+        generation = hub.generation
+        job = None
+        wake_at = None
 
         db = SessionLocal()
 
-        job = claim_next_job(db)
+        try:
+            job = claim_next_job(db, worker_id=worker_id)
+            # Фиксируем захват сразу, чтобы не держать блокировку на время выполнения.
+            db.commit()
+
+            if job:
+                print("Executing job", job.id, job.job_type, "on", worker_id)
+
+                attempt = execute_claimed_job(db, job, worker_id=worker_id)
+
+                print("Job", job.id, attempt.status, attempt.error_message or "")
+            else:
+                wake_at = next_scheduled_at(db)
+        except Exception as exc:
+            db.rollback()
+            job = None
+            print("Worker error", worker_id, repr(exc))
+        finally:
+            db.close()
 
         if job:
-            print("Executing job", job.id, job.job_type)
+            # Очередь не пуста — сразу берём следующую задачу.
+            idle_seconds = WORKER_IDLE_MIN_SECONDS
+            continue
 
-            # execution stub
-            time.sleep(1)
+        timeout = idle_seconds
+        if wake_at:
+            timeout = min(timeout, max((wake_at - datetime.utcnow()).total_seconds(), 0.0))
+
+        if hub.wait(generation, timeout) != generation:
+            idle_seconds = WORKER_IDLE_MIN_SECONDS
+        else:
+            idle_seconds = min(idle_seconds * 2, WORKER_IDLE_MAX_SECONDS)
+
+
+def _heartbeat_loop(worker_ids: list[str], stop: threading.Event):
 
-            finish_job(db, job)
+    while not stop.wait(WORKER_HEARTBEAT_SECONDS):
 
+        db = SessionLocal()
+
+        try:
+            updated = heartbeat_workers(db, worker_ids=worker_ids, lease_seconds=WORKER_LEASE_SECONDS)
+            if updated < len(worker_ids):
+                restored = restore_worker_leases(
+                    db,
+                    worker_ids=worker_ids,
+                    lease_seconds=WORKER_LEASE_SECONDS,
+                )
+                print("Re-registered workers with lost leases:", restored)
+            reclaimed = reclaim_expired_jobs(db)
+            # Записи дел только помечают приоритеты устаревшими, задачи пересчёта ставит воркер.
+            scheduled = schedule_stale_priority_refreshes(db)
             db.commit()
 
+            if reclaimed:
+                print("Reclaimed jobs from expired leases:", reclaimed)
+            if scheduled["tenant_ids"]:
+                print("Scheduled priority refresh for tenants:", scheduled["tenant_ids"])
+        except Exception as exc:
+            db.rollback()
+            print("Heartbeat error", repr(exc))
+        finally:
+            db.close()
+
+
+def run_worker_threads(threads: int = WORKER_THREADS):
+
+    dispose_engines()
+    stop = threading.Event()
+    worker_ids = [_make_worker_id(index) for index in range(max(threads, 1))]
+
+    db = SessionLocal()
+    try:
+        for worker_id in worker_ids:
+            register_worker(db, worker_id=worker_id, lease_seconds=WORKER_LEASE_SECONDS)
+        reclaim_expired_jobs(db)
+        db.commit()
+    finally:
         db.close()
 
-        time.sleep(1)
+    hub = JobWakeupHub().start()
+
+    pool = [
+        threading.Thread(target=_worker_loop, args=(worker_id, stop, hub), name=worker_id)
+        for worker_id in worker_ids
+    ]
+    pool.append(threading.Thread(target=_heartbeat_loop, args=(worker_ids, stop), daemon=True))
+
+    for thread in pool:
+        thread.start()
+
+    try:
+        while any(thread.is_alive() for thread in pool if not thread.daemon):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("Worker stopping")
+    finally:
+        stop.set()
+        hub.stop()
+        for thread in pool:
+            if not thread.daemon:
+                thread.join()
+        shutdown_render_pool()
+
+        db = SessionLocal()
+        try:
+            for worker_id in worker_ids:
+                release_worker(db, worker_id=worker_id)
+            db.commit()
+        finally:
+            db.close()
+
+
+def run_worker(threads: int = WORKER_THREADS, processes: int = WORKER_PROCESSES):
+
+    if processes <= 1:
+        run_worker_threads(threads)
+        return
+
+    children = [
+        multiprocessing.Process(target=run_worker_threads, args=(threads,))
+        for _ in range(processes)
+    ]
+
+    for child in children:
+        child.start()
+
+    try:
+        for child in children:
+            child.join()
+    except KeyboardInterrupt:
+        for child in children:
+            child.join()
 
 
 if __name__ == "__main__":
-    run_worker()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Debtrix job queue worker")
+    parser.add_argument("--threads", type=int, default=WORKER_THREADS)
+    parser.add_argument("--processes", type=int, default=WORKER_PROCESSES)
+    args = parser.parse_args()
+
+    run_worker(threads=args.threads, processes=args.processes)
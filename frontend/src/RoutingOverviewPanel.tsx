@@ -84,9 +84,7 @@ export default function RoutingOverviewPanel({ routing, onOpenBucket }: Props) {
         {renderBucketCard(
           "ready",
           Number(summary?.ready || 0),
-          `${
-            Array.isArray(buckets?.ready) ? buckets.ready.length : 0
-          } кейсов можно брать в работу сейчас`,
+          `${Number(summary?.ready || 0)} кейсов можно брать в работу сейчас`,
           "is-ready"
         )}
 